@@ -1,11 +1,24 @@
 import streamlit as st
-import pandas as pd
-import random
-import io
+import html
+import json
+import os
+import time
+from torneio.export import MATCH_COLUMNS, RANKING_COLUMNS, csv_bytes, match_rows, ranking_rows, tournament_to_dict, xlsx_bytes
+from torneio.importer import SCORE_SHEET_COLUMNS, file_rows, read_round_results, score_sheet_rows, text_rows
+from torneio.pairing import MAX_OPTIMAL_TEAMS, PAIRING_MODES
+from torneio.tiebreaks import TIEBREAKS
+from torneio.manager import TournamentManager
+from torneio.metrics import metrics, timed
+from torneio.storage import CorruptTournamentError, TournamentStore
+from torneio.tournament import PLAYOFF_SIZES, Tournament, TournamentError
 
 # --- CONFIGURAÇÃO DA PÁGINA ---
 st.set_page_config(page_title="Gestor de Torneio Suíço", layout="wide")
 
+# Medições deste rerun (painel ?admin=1); sem custo com as métricas desligadas.
+RERUN_START = time.perf_counter()
+metrics.start_trace()
+
 # --- TEXTO DO REGULAMENTO (PARA A ABA DE REGRAS) ---
 REGULAMENTO_TXT = """
 ### 📜 REGULAMENTO OFICIAL – TORNEIO SUÍÇO (TRIPLE ELIMINATION)
@@ -26,6 +39,7 @@ REGULAMENTO_TXT = """
 3. Não ter recebido Bye
 4. Saldo de Gols
 5. Gols Pró
+6. Desempates extras, se escolhidos na inscrição: Buchholz (soma das vitórias dos adversários), Buchholz mediano (sem o melhor e o pior adversário) e Sonneborn-Berger (soma das vitórias dos adversários vencidos)
 
 **4. Partidas**
 * **Empate:** Não permitido. Em caso de empate no tempo normal, disputa-se pênaltis.
@@ -33,512 +47,489 @@ REGULAMENTO_TXT = """
 * **Saldo:** Conta apenas o placar do tempo normal.
 
 **5. Fase Final (Mata-Mata)**
-* Os 8 melhores classificados avançam.
+* Avançam os melhores classificados, até o número de vagas escolhido na inscrição (8 por padrão).
+* Até 8 vagas, valem as chaves fixas (repescagem e quartas conforme o número de classificados); acima disso, chave completa com folgas para os primeiros colocados.
 * Disputa de Campeão, Vice e 3º Lugar.
 """
 
-# --- ESTRUTURA DE DADOS (MODELO) ---
-if 'teams' not in st.session_state:
-    st.session_state.teams = [] 
-if 'rounds' not in st.session_state:
-    st.session_state.rounds = [] 
-if 'phase' not in st.session_state:
-    st.session_state.phase = 'registration' 
-if 'playoff_schedule' not in st.session_state:
-    st.session_state.playoff_schedule = [] 
-if 'champion' not in st.session_state:
-    st.session_state.champion = None
+
+# --- PERSISTÊNCIA ---
+DB_PATH = os.environ.get('TORNEIO_DB', 'torneio.db')
+
+@st.cache_resource
+def get_store():
+    return TournamentStore(DB_PATH)
+
+@st.cache_resource
+def get_manager():
+    # Um gerenciador por processo: todas as sessões veem os mesmos torneios (divisões).
+    return TournamentManager(get_store())
+
+@st.cache_resource
+def start_metrics_server():
+    # Prometheus raspa este processo em TORNEIO_METRICS_PORT (uma vez por processo).
+    port = os.environ.get('TORNEIO_METRICS_PORT')
+    if port:
+        metrics.enabled = True
+        return metrics.serve(int(port))
+    return None
+
+manager = get_manager()
+start_metrics_server()
+
+# --- ESTADO DA SESSÃO ---
+# Sessão nova: abre o torneio da URL (?torneio=...) ou o último em andamento.
+if 'tournament_id' not in st.session_state:
+    st.session_state.tournament_id = st.query_params.get('torneio') or get_store().latest_active()
+try:
+    tournament = manager.get(st.session_state.tournament_id) if st.session_state.tournament_id else None
+except CorruptTournamentError as e:
+    # Não derruba o app: abre um torneio novo e o gravado fica no banco para análise.
+    st.error(f"{e} Um torneio novo foi aberto.")
+    tournament = None
+if tournament is None:
+    tournament = manager.create()
+    st.session_state.tournament_id = tournament.id
+if 'seen_revision' not in st.session_state:
+    st.session_state.seen_revision = tournament.revision
 if 'swiss_asking_penalties' not in st.session_state:
     st.session_state.swiss_asking_penalties = False 
 if 'playoff_asking_penalties' not in st.session_state:
     st.session_state.playoff_asking_penalties = False 
 
+st.query_params['torneio'] = tournament.id
+while tournament.notices:
+    st.toast(tournament.notices.pop(0))
+
 # --- FUNÇÕES AUXILIARES ---
 
-def get_sorted_rankings(teams, for_pairing=False):
-    if for_pairing:
-        teams = teams.copy()
-        random.shuffle(teams)
-    
-    return sorted(teams, key=lambda x: (
-        x['wins'], 
-        -x['losses'], 
-        not x['received_bye'], 
-        x['goal_diff'], 
-        x['goals_for']
-    ), reverse=True)
-
-def update_team_stats(team_id, goals_scored, goals_conceded, is_winner, is_bye=False):
-    found = False
-    for team in st.session_state.teams:
-        if team['id'] == team_id:
-            team['goals_for'] += goals_scored
-            team['goal_diff'] += (goals_scored - goals_conceded)
-            
-            if is_winner:
-                team['wins'] += 1
-            else:
-                team['losses'] += 1
-            
-            if is_bye:
-                team['received_bye'] = True
-            
-            if st.session_state.phase == 'swiss':
-                if team['wins'] >= 3:
-                    team['status'] = 'Classificado'
-                elif team['losses'] >= 3:
-                    team['status'] = 'Eliminado'
-            found = True
-            break
-    if not found:
-        st.error(f"Erro Crítico: ID {team_id} não encontrado.")
-
-def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
-
-def generate_export_data():
-    if st.session_state.teams:
-        sorted_teams = get_sorted_rankings(st.session_state.teams, for_pairing=False)
-        rank_data = []
-        for t in sorted_teams:
-            rank_data.append({
-                'Time': t['name'],
-                'Vitorias': t['wins'],
-                'Derrotas': t['losses'],
-                'Saldo': t['goal_diff'],
-                'Gols Pro': t['goals_for'],
-                'Status': t['status'],
-                'Recebeu Bye': 'Sim' if t['received_bye'] else 'Não'
-            })
-        df_rank = pd.DataFrame(rank_data)
-    else:
-        df_rank = pd.DataFrame()
+PHASE_LABELS = {'registration': 'Inscrição', 'swiss': 'Fase Suíça', 'playoff_gameplay': 'Mata-Mata', 'champion': 'Encerrado'}
 
-    match_history = []
-    
-    # Fase Suíça
-    for i, r in enumerate(st.session_state.rounds):
-        if r.get('completed'): 
-            if r['bye']:
-                match_history.append({
-                    'Fase': 'Suíça', 'Rodada': i+1, 
-                    'Mandante': r['bye']['name'], 'Placar M': 1, 'Placar V': 0, 'Visitante': 'BYE (Folga)',
-                    'Vencedor': r['bye']['name'], 'Notas': 'Vitória automática por Bye'
-                })
-            
-            for m in r['matches']:
-                h_name = next((t['name'] for t in st.session_state.teams if t['id'] == m['home']), "Time A")
-                a_name = next((t['name'] for t in st.session_state.teams if t['id'] == m['away']), "Time B")
-                
-                winner_name = "Empate"
-                if 'winner_id' in m:
-                    winner_name = h_name if m['winner_id'] == m['home'] else a_name
-                
-                note = ""
-                if m['home_score'] == m['away_score'] and 'h_pen' in m:
-                     note = f"Pênaltis: {m['h_pen']} x {m['a_pen']}"
-
-                match_history.append({
-                    'Fase': 'Suíça', 'Rodada': i+1,
-                    'Mandante': h_name, 'Placar M': m['home_score'], 
-                    'Placar V': m['away_score'], 'Visitante': a_name,
-                    'Vencedor': winner_name, 'Notas': note
-                })
-
-    # Fase Mata-Mata
-    for r in st.session_state.playoff_schedule:
-        if r['completed']:
-            for m in r['matches']:
-                h_name = m['home']['name']
-                a_name = m['away']['name']
-                winner_name = h_name if m.get('winner_id') == m['home']['id'] else a_name
-                
-                note = ""
-                if m.get('is_penalties'):
-                    note = f"Pênaltis: {m['h_pen']} x {m['a_pen']}"
-                
-                label_fase = r['name']
-                if label_fase == "Finais":
-                    if m['id'] == 'FINAL': label_fase = "Grande Final"
-                    if m['id'] == '3RD': label_fase = "Disputa 3º Lugar"
-
-                match_history.append({
-                    'Fase': 'Mata-Mata', 'Rodada': label_fase,
-                    'Mandante': h_name, 'Placar M': m['h_goals'],
-                    'Placar V': m['a_goals'], 'Visitante': a_name,
-                    'Vencedor': winner_name, 'Notas': note
-                })
-                
-    df_matches = pd.DataFrame(match_history)
-    
-    return df_rank, df_matches
+def apply_action(action, *args):
+    # Grava pelo gerenciador: lock do torneio + conferência da revisão que esta sessão viu.
+    with metrics.timer(f"form:{action.__name__}"):
+        out = manager.apply(tournament.id, action, *args, revision=st.session_state.seen_revision)
+    st.session_state.seen_revision = tournament.revision
+    return out
+
+def reset_penalty_prompts():
+    st.session_state.swiss_asking_penalties = False
+    st.session_state.playoff_asking_penalties = False
+
+def switch_tournament(tournament_id):
+    try:
+        target = manager.get(tournament_id)
+    except CorruptTournamentError as e:
+        st.error(str(e))
+        return
+    st.session_state.tournament_id = tournament_id
+    st.session_state.seen_revision = target.revision
+    reset_penalty_prompts()
+
+@timed()
+def generate_export_data(t):
+    registry = t.teams
+    csv_rank = csv_bytes(ranking_rows(registry), RANKING_COLUMNS, none_if_empty=True)
+    csv_matches = csv_bytes(match_rows(registry, t.rounds, t.playoff_schedule), MATCH_COLUMNS, none_if_empty=True)
+    return csv_rank, csv_matches
+
+def tournament_json(t):
+    state = tournament_to_dict(t.teams, t.rounds, t.playoff_schedule, t.phase, t.champion, t.vice, t.third,
+                               t.playoff_size, t.bracket, t.tiebreaks, t.name, t.pairing_mode)
+    return json.dumps(state, ensure_ascii=False).encode('utf-8')
+
+def build_export_files(t):
+    # Calculado uma vez por revisão pelo gerenciador e compartilhado entre as sessões.
+    csv_rank, csv_matches = generate_export_data(t)
+    return csv_rank, csv_matches, tournament_json(t)
+
+@timed()
+def build_xlsx(t):
+    # Só quando pedido: openpyxl é importado aqui, não na subida do app.
+    return xlsx_bytes([
+        ('Classificacao', ranking_rows(t.teams), RANKING_COLUMNS),
+        ('Historico', match_rows(t.teams, t.rounds, t.playoff_schedule), MATCH_COLUMNS),
+    ])
+
+@timed()
+def odds_table(t, n_sims):
+    # NumPy só é carregado por quem abre as probabilidades.
+    from torneio.simulation import rating_strengths, simulate
+
+    odds = simulate(t, rating_strengths(t.teams), n_sims=n_sims)
+    rows = [
+        {'Time': t.teams.name_of(tid), 'Classificado': o.classified, 'Mata-Mata': o.playoffs, 'Campeão': o.champion}
+        for tid, o in odds.items()
+    ]
+    rows.sort(key=lambda r: (r['Campeão'], r['Classificado']), reverse=True)
+    return rows
+
+def render_odds_tab():
+    st.caption("Chances estimadas simulando o restante do torneio, com a força de cada time dada pelo rating importado "
+               "(sem rating, todos iguais). Estimativa: a simulação segue os grupos de campanha, evita revanches "
+               "e usa os desempates do torneio, mas simplifica a busca do emparceiramento; pode errar até ~2 "
+               "pontos percentuais por time.")
+    n_sims = st.select_slider("Simulações", [1000, 10000, 100000], value=10000)
+    if st.button("🎲 Simular"):
+        with st.spinner("Simulando..."):
+            rows = manager.view(tournament.id, ('odds', n_sims), lambda t: odds_table(t, n_sims))
+        percent = st.column_config.NumberColumn(format="percent")
+        st.dataframe(rows, hide_index=True, column_config={c: percent for c in ('Classificado', 'Mata-Mata', 'Campeão')})
+
+def create_division_callback():
+    name = st.session_state.new_division_name.strip()
+    if not name:
+        st.warning("Digite o nome da divisão.")
+        return
+    switch_tournament(manager.create(name).id)
+    st.session_state.new_division_name = ""
+
+def render_division_picker():
+    with st.sidebar:
+        st.header("🗂️ Divisões")
+        divisions = manager.list()
+        ids = [tid for tid, _, _ in divisions]
+        labels = {tid: f"{name or 'Sem nome'} · {PHASE_LABELS.get(phase, phase)}" for tid, name, phase in divisions}
+        choice = st.selectbox("Torneio", ids, index=ids.index(tournament.id) if tournament.id in ids else 0, format_func=labels.get)
+        if choice and choice != tournament.id:
+            switch_tournament(choice)
+            st.rerun()
+        with st.expander("➕ Nova divisão"):
+            st.text_input("Nome (categoria, sede...)", key="new_division_name")
+            st.button("Criar divisão", on_click=create_division_callback)
+        st.markdown("---")
 
+def undo_callback():
+    try:
+        result = apply_action(Tournament.undo_last_round)
+    except TournamentError as e:
+        st.error(str(e))
+        return
+    if result:
+        reset_penalty_prompts()
+
+# --- HISTÓRICO DE JOGOS ---
+# Cada rodada concluída vira um resumo pronto (um bloco de markdown), montado
+# uma vez por revisão e compartilhado; a barra lateral só desenha a rodada
+# escolhida, em vez de um expander (sempre renderizado) por rodada.
+
+def score_line(prefix, h_name, a_name, h_goals, a_goals, is_penalties, h_pen, a_pen):
+    score_str = f"**{h_goals} x {a_goals}**"
+    if is_penalties:
+        score_str = f"({h_pen}) {score_str} ({a_pen})"
+    return f"{prefix}{h_name} {score_str} {a_name}"
+
+@timed()
+def build_history(t):
+    # (rótulo, bye, texto) por rodada concluída, suíça e mata-mata.
+    registry = t.teams
+    swiss = []
+    for i, r in enumerate(t.rounds):
+        if r.completed:
+            lines = [
+                score_line("", registry.name_of(m.home, "Time A"), registry.name_of(m.away, "Time B"),
+                           m.home_score, m.away_score, m.is_penalties, m.h_pen, m.a_pen)
+                for m in r.matches
+            ]
+            swiss.append((f"Rodada {i+1}", registry.name_of(r.bye) if r.bye else None, "  \n".join(lines)))
+    playoffs = []
+    for r in t.playoff_schedule:
+        if r.completed:
+            lines = []
+            for m in r.matches:
+                prefix = ""
+                if r.name == "Finais":
+                    if m.id == 'FINAL': prefix = "🏆 **Final:** "
+                    if m.id == '3RD': prefix = "🥉 **3º Lugar:** "
+                lines.append(score_line(prefix, registry.name_of(m.home), registry.name_of(m.away),
+                                        m.h_goals, m.a_goals, m.is_penalties, m.h_pen, m.a_pen))
+            playoffs.append((r.name, None, "  \n".join(lines)))
+    return swiss, playoffs
+
+def render_history_section(title, summaries, empty_message):
+    st.markdown(f"##### {title}")
+    if not summaries:
+        st.caption(empty_message)
+        return
+    choice = st.selectbox(
+        title, [None] + list(range(len(summaries))), label_visibility="collapsed",
+        format_func=lambda i: "Ver rodada..." if i is None else summaries[i][0],
+    )
+    if choice is not None:
+        _, bye, text = summaries[choice]
+        if bye:
+            st.info(f"**Bye:** {bye}")
+        st.markdown(text)
+
+# --- CLASSIFICAÇÃO DA BARRA LATERAL ---
+# A tabela é montada em HTML uma vez por revisão (manager.view) e servida pronta
+# a todas as sessões; com muitos times, em páginas de SIDEBAR_PAGE_SIZE linhas.
+
+SIDEBAR_PAGE_SIZE = 100
+STATUS_ICONS = {'Classificado': "🟢", 'Eliminado': "🔴"}
+
+STANDINGS_TABLE_HEAD = """
+<style>
+    .compact-table { width: 100%; font-size: 12px; border-collapse: collapse; }
+    .compact-table th, .compact-table td { padding: 4px; text-align: center; border-bottom: 1px solid #444; }
+    .compact-table th { background-color: #262730; color: white; }
+    .text-left { text-align: left !important; }
+</style>
+<table class="compact-table">
+    <thead>
+        <tr>
+            <th title="Status">St</th>
+            <th class="text-left">Time</th>
+            <th>V-D</th>
+            <th>Bye</th>
+            <th title="Gols Pró">GP</th>
+            <th title="Gols Contra">GC</th>
+            <th title="Saldo de Gols">SG</th>
+        </tr>
+    </thead>
+    <tbody>
+"""
+STANDINGS_TABLE_TAIL = "</tbody></table>"
+
+def standings_row(t, is_current_bye):
+    name_display = html.escape(t.name)
+    if is_current_bye:
+        name_display = f"<b>{name_display} (F)</b>"
+    bye_disp = 'Sim' if (t.received_bye or is_current_bye) else '-'
+    goals_against = t.goals_for - t.goal_diff
+    return (f"<tr><td>{STATUS_ICONS.get(t.status, '⚪')}</td><td class='text-left'>{name_display}</td>"
+            f"<td>{t.wins}-{t.losses}</td><td>{bye_disp}</td><td>{t.goals_for}</td><td>{goals_against}</td><td>{t.goal_diff}</td></tr>")
+
+@timed()
+def build_standings_pages(t):
+    current_bye_id = None
+    if t.phase == 'swiss' and t.rounds:
+        curr = t.rounds[-1]
+        if curr.bye and not curr.completed:
+            current_bye_id = curr.bye
+    rows = [standings_row(team, team.id == current_bye_id) for team in t.teams.standings.ranked()]
+    return tuple(
+        STANDINGS_TABLE_HEAD + ''.join(rows[i:i + SIDEBAR_PAGE_SIZE]) + STANDINGS_TABLE_TAIL
+        for i in range(0, len(rows), SIDEBAR_PAGE_SIZE)
+    )
+
+@timed()
 def render_sidebar_stats():
     with st.sidebar:
         st.header("📊 Classificação Geral")
-        if st.session_state.teams:
-            sorted_teams = get_sorted_rankings(st.session_state.teams, for_pairing=False)
-            
-            current_bye_id = None
-            if st.session_state.phase == 'swiss' and st.session_state.rounds:
-                curr = st.session_state.rounds[-1]
-                if curr.get('bye') and not curr.get('completed'):
-                    current_bye_id = curr['bye']['id']
-
-            st.markdown("""
-            <style>
-                .compact-table { width: 100%; font-size: 12px; border-collapse: collapse; }
-                .compact-table th, .compact-table td { padding: 4px; text-align: center; border-bottom: 1px solid #444; }
-                .compact-table th { background-color: #262730; color: white; }
-                .text-left { text-align: left !important; }
-            </style>
-            """, unsafe_allow_html=True)
-
-            html_rows = ""
-            for t in sorted_teams:
-                if t['status'] == 'Classificado': status_icon = "🟢"
-                elif t['status'] == 'Eliminado': status_icon = "🔴"
-                else: status_icon = "⚪"
-
-                name_display = t['name']
-                is_current_bye = (current_bye_id and t['id'] == current_bye_id)
-                if is_current_bye:
-                    name_display = f"<b>{t['name']} (F)</b>"
-
-                bye_disp = 'Sim' if (t['received_bye'] or is_current_bye) else '-'
-                goals_against = t['goals_for'] - t['goal_diff']
-                rec = f"{t['wins']}-{t['losses']}"
-
-                html_rows += f"<tr><td>{status_icon}</td><td class='text-left'>{name_display}</td><td>{rec}</td><td>{bye_disp}</td><td>{t['goals_for']}</td><td>{goals_against}</td><td>{t['goal_diff']}</td></tr>"
-
-            table_html = f"""
-            <table class="compact-table">
-                <thead>
-                    <tr>
-                        <th title="Status">St</th>
-                        <th class="text-left">Time</th>
-                        <th>V-D</th>
-                        <th>Bye</th>
-                        <th title="Gols Pró">GP</th>
-                        <th title="Gols Contra">GC</th>
-                        <th title="Saldo de Gols">SG</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {html_rows}
-                </tbody>
-            </table>
-            """
-            
-            st.markdown(table_html, unsafe_allow_html=True)
+        if tournament.teams:
+            pages = manager.view(tournament.id, 'sidebar_standings', build_standings_pages)
+            page = 0
+            if len(pages) > 1:
+                total = len(tournament.teams)
+                page = st.selectbox(
+                    "Posições", range(len(pages)),
+                    format_func=lambda i: f"{i * SIDEBAR_PAGE_SIZE + 1}–{min((i + 1) * SIDEBAR_PAGE_SIZE, total)} de {total}",
+                )
+            st.markdown(pages[page], unsafe_allow_html=True)
             st.caption("GP: Pró | GC: Contra | SG: Saldo | (F): Folga na rodada")
             st.markdown("**Legenda:** 🟢 Classificado | 🔴 Eliminado | ⚪ Ativo")
         
         st.markdown("---")
         
         st.header("💾 Exportar Dados")
-        if st.session_state.teams:
-            df_r, df_m = generate_export_data()
+        if tournament.teams:
+            csv_rank, csv_matches, saved = manager.view(tournament.id, 'exports', build_export_files)
             
-            csv_rank = convert_df_to_csv(df_r)
             st.download_button("📥 Baixar Classificação (CSV)", csv_rank, 'classificacao_torneio.csv', 'text/csv')
             
-            if not df_m.empty:
-                csv_matches = convert_df_to_csv(df_m)
+            if csv_matches is not None:
                 st.download_button("📥 Baixar Histórico de Jogos (CSV)", csv_matches, 'historico_partidas.csv', 'text/csv')
-
-        st.markdown("---")
-        
-        st.header("📜 Histórico de Jogos")
-        
-        if st.session_state.rounds:
-            st.markdown("##### Fase Suíça")
-            found_completed = False
-            for i, r in enumerate(st.session_state.rounds):
-                if r.get('completed'):
-                    found_completed = True
-                    with st.expander(f"Rodada {i+1}", expanded=False):
-                        if r['bye']:
-                            st.info(f"**Bye:** {r['bye']['name']}")
-                        for m in r['matches']:
-                            h_name = next((t['name'] for t in st.session_state.teams if t['id'] == m['home']), "Time A")
-                            a_name = next((t['name'] for t in st.session_state.teams if t['id'] == m['away']), "Time B")
-                            
-                            score_str = f"**{m['home_score']} x {m['away_score']}**"
-                            if m['home_score'] == m['away_score'] and 'h_pen' in m:
-                                score_str = f"({m['h_pen']}) {score_str} ({m['a_pen']})"
-                            
-                            st.write(f"{h_name} {score_str} {a_name}")
-            if not found_completed:
-                st.caption("Nenhuma rodada finalizada ainda.")
-
-        if st.session_state.playoff_schedule:
-            st.markdown("##### Mata-Mata")
-            found_completed = False
-            for r in st.session_state.playoff_schedule:
-                if r['completed']:
-                    found_completed = True
-                    with st.expander(f"{r['name']}", expanded=False):
-                        for m in r['matches']:
-                            h_name = m['home']['name']
-                            a_name = m['away']['name']
-                            
-                            score_str = f"**{m['h_goals']} x {m['a_goals']}**"
-                            if m.get('is_penalties'):
-                                score_str = f"({m['h_pen']}) {score_str} ({m['a_pen']})"
-                            
-                            prefix = ""
-                            if r['name'] == "Finais":
-                                if m['id'] == 'FINAL': prefix = "🏆 **Final:** "
-                                if m['id'] == '3RD': prefix = "🥉 **3º Lugar:** "
-                            
-                            st.write(f"{prefix}{h_name} {score_str} {a_name}")
-            if not found_completed:
-                st.caption("Fase final em andamento.")
-
-# --- LÓGICA DO SUIÇO ---
-
-def generate_swiss_round():
-    st.session_state.swiss_asking_penalties = False 
-    
-    active_teams = [t for t in st.session_state.teams if t['status'] == 'Ativo' and t['losses'] < 3]
-    bye_team = None
-    
-    if len(active_teams) % 2 != 0:
-        eligible_for_bye = [t for t in active_teams if not t['received_bye']]
-        candidates = []
-        
-        if not st.session_state.rounds:
-            candidates = eligible_for_bye
-        else:
-            last_round = st.session_state.rounds[-1]
-            loser_ids = []
-            
-            for m in last_round['matches']:
-                winner_id = m.get('winner_id')
-                if winner_id:
-                    loser = m['away'] if winner_id == m['home'] else m['home']
-                    loser_ids.append(loser)
-            
-            loser_candidates = [t for t in eligible_for_bye if t['id'] in loser_ids]
-            candidates = loser_candidates if loser_candidates else eligible_for_bye
-        
-        if candidates:
-            bye_team = random.choice(candidates)
-            active_teams.remove(bye_team)
-    
-    ranked_pool = get_sorted_rankings(active_teams, for_pairing=True)
-    matches = []
-    
-    while len(ranked_pool) >= 2:
-        home = ranked_pool.pop(0)
-        opponent = None
-        for i, candidate in enumerate(ranked_pool):
-            if candidate['id'] not in home['history']:
-                opponent = ranked_pool.pop(i)
-                break
-        
-        if not opponent:
-            opponent = ranked_pool.pop(0)
             
-        matches.append({
-            'home': home['id'], 'away': opponent['id'], 
-            'home_score': 0, 'away_score': 0
-        })
-        
-        home['history'].append(opponent['id'])
-        opponent['history'].append(home['id'])
+            st.download_button("📥 Salvar Torneio (JSON)", saved, 'torneio.json', 'application/json')
 
-    st.session_state.rounds.append({'matches': matches, 'bye': bye_team, 'completed': False})
+            if st.checkbox("Planilha Excel (XLSX)", key="want_xlsx"):
+                try:
+                    xlsx = manager.view(tournament.id, 'xlsx', build_xlsx)
+                except ImportError:
+                    st.warning("A exportação XLSX requer o pacote openpyxl (pip install openpyxl).")
+                else:
+                    st.download_button("📥 Baixar Planilha (XLSX)", xlsx, 'torneio.xlsx',
+                                       'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+            st.caption("Exportação sem o app: `python -m torneio.export torneio.json --formato csv.gz`")
 
-# --- LÓGICA DO MATA-MATA ---
+        if tournament.events and tournament.events.last_round_key():
+            st.button("↩️ Desfazer Última Rodada", on_click=undo_callback,
+                      help="Reverte os resultados da última rodada confirmada.")
 
-def init_playoffs():
-    qualified = [t for t in st.session_state.teams if t['status'] == 'Classificado']
-    seeds = get_sorted_rankings(qualified, for_pairing=False) 
-    
-    if len(seeds) > 8:
-        st.toast(f"⚠️ Atenção: {len(seeds)} times classificados. Apenas os 8 melhores avançam.")
-        seeds = seeds[:8]
-    
-    num_q = len(seeds)
-    current_matches = []
-    waiting_teams = [] 
-    round_name = ""
-
-    if num_q == 3:
-        round_name = "Semifinal Única"
-        waiting_teams = [seeds[0]]
-        current_matches = [{'id': 'S1', 'home': seeds[1], 'away': seeds[2], 'label': 'Semifinal'}]
-    elif num_q == 4:
-        round_name = "Semifinais"
-        current_matches = [
-            {'id': 'S1', 'home': seeds[0], 'away': seeds[3], 'label': 'Semi 1'},
-            {'id': 'S2', 'home': seeds[1], 'away': seeds[2], 'label': 'Semi 2'}
-        ]
-    elif num_q == 5:
-        round_name = "Wildcard (Repescagem)"
-        waiting_teams = [seeds[0], seeds[1], seeds[2]] 
-        current_matches = [{'id': 'WC', 'home': seeds[3], 'away': seeds[4], 'label': 'Repescagem'}]
-    elif num_q == 6:
-        round_name = "Quartas de Final"
-        waiting_teams = [seeds[0], seeds[1]]
-        current_matches = [
-            {'id': 'QFA', 'home': seeds[3], 'away': seeds[4], 'label': 'Quartas A'},
-            {'id': 'QFB', 'home': seeds[2], 'away': seeds[5], 'label': 'Quartas B'}
-        ]
-    elif num_q == 7:
-        round_name = "Quartas de Final"
-        waiting_teams = [seeds[0]]
-        current_matches = [
-            {'id': 'QFA', 'home': seeds[3], 'away': seeds[4], 'label': 'Quartas A'},
-            {'id': 'QFB', 'home': seeds[2], 'away': seeds[5], 'label': 'Quartas B'},
-            {'id': 'QFC', 'home': seeds[1], 'away': seeds[6], 'label': 'Quartas C'}
-        ]
-    elif num_q >= 8:
-        seeds = seeds[:8]
-        round_name = "Quartas de Final"
-        current_matches = [
-            {'id': 'Q1', 'home': seeds[0], 'away': seeds[7], 'label': 'Quartas 1'},
-            {'id': 'Q2', 'home': seeds[1], 'away': seeds[6], 'label': 'Quartas 2'},
-            {'id': 'Q3', 'home': seeds[2], 'away': seeds[5], 'label': 'Quartas 3'},
-            {'id': 'Q4', 'home': seeds[3], 'away': seeds[4], 'label': 'Quartas 4'}
-        ]
-    
-    if num_q < 3:
-         st.error(f"Erro Crítico: Apenas {num_q} classificados. O sistema precisa de no mínimo 3.")
-         return
-
-    for m in current_matches:
-        m['h_goals'] = 0
-        m['a_goals'] = 0
-        m['h_pen'] = 0
-        m['a_pen'] = 0
-
-    round_data = {
-        'name': round_name,
-        'matches': current_matches,
-        'waiting': waiting_teams,
-        'completed': False
-    }
-    
-    st.session_state.playoff_schedule = [round_data]
-    st.session_state.phase = 'playoff_gameplay'
-    st.session_state.playoff_asking_penalties = False
+        st.markdown("---")
+        
+        st.header("📜 Histórico de Jogos")
+        if tournament.rounds or tournament.playoff_schedule:
+            swiss, playoffs = manager.view(tournament.id, 'history', build_history)
+            if tournament.rounds:
+                render_history_section("Fase Suíça", swiss, "Nenhuma rodada finalizada ainda.")
+            if tournament.playoff_schedule:
+                render_history_section("Mata-Mata", playoffs, "Fase final em andamento.")
 
-def advance_playoff_round(results, waiting_teams, losers=None):
-    st.session_state.playoff_asking_penalties = False 
-    
-    last_round = st.session_state.playoff_schedule[-1]
-    last_round_name = last_round['name']
+# --- PAINEL DE DESEMPENHO (?admin=1) ---
 
-    pool = waiting_teams + results
-    count = len(pool)
-    
-    next_matches = []
-    next_round_name = ""
-    
-    if last_round_name == "Finais":
-        champion = None
-        vice = None
-        third = None
-        for m in last_round['matches']:
-            winner_id = m.get('winner_id')
-            winner_obj = m['home'] if winner_id == m['home']['id'] else m['away']
-            loser_obj = m['away'] if winner_id == m['home']['id'] else m['home']
-
-            if m['id'] == 'FINAL':
-                champion = winner_obj
-                vice = loser_obj
-            elif m['id'] == '3RD':
-                third = winner_obj
-                
-        if champion:
-            st.session_state.champion = champion
-            st.session_state.vice = vice 
-            st.session_state.third = third 
-            st.session_state.phase = 'champion'
+def render_admin_panel(trace, rerun_seconds):
+    with st.sidebar:
+        st.markdown("---")
+        st.header("⏱️ Desempenho")
+        enabled = st.checkbox("Coletar métricas", value=metrics.enabled,
+                              help="Vale para o processo inteiro (todas as sessões).")
+        if enabled != metrics.enabled:
+            metrics.enabled = enabled
+            st.rerun()
+        if not enabled:
+            st.caption("Ligue para medir sorteio, classificação, exportação, barra lateral e formulários.")
             return
 
-    if last_round_name == "Semifinais" and losers and len(losers) == 2:
-        next_round_name = "Finais"
-        pool = get_sorted_rankings(pool, for_pairing=False)
-        next_matches.append({'id': 'FINAL', 'home': pool[0], 'away': pool[1], 'label': '🏆 Grande Final'})
-        losers = get_sorted_rankings(losers, for_pairing=False)
-        next_matches.append({'id': '3RD', 'home': losers[0], 'away': losers[1], 'label': '🥉 Disputa de 3º Lugar'})
-
-    elif count == 2:
-        next_round_name = "Grande Final"
-        next_matches = [{'id': 'F', 'home': pool[0], 'away': pool[1], 'label': 'Final'}]
-    elif count == 4:
-        next_round_name = "Semifinais"
-        pool = get_sorted_rankings(pool, for_pairing=False)
-        next_matches = [
-            {'id': 'S1', 'home': pool[0], 'away': pool[3], 'label': 'Semi 1'},
-            {'id': 'S2', 'home': pool[1], 'away': pool[2], 'label': 'Semi 2'}
-        ]
-    else:
-        next_round_name = "Rodada Eliminatória"
-        pool = get_sorted_rankings(pool, for_pairing=False)
-        while len(pool) >= 2:
-            home = pool.pop(0)
-            away = pool.pop(-1)
-            next_matches.append({'id': 'GEN', 'home': home, 'away': away, 'label': 'Jogo'})
-            
-    if not next_matches and count == 1:
-        st.session_state.champion = pool[0]
-        st.session_state.phase = 'champion'
-        return
-
-    for m in next_matches:
-        m['h_goals'] = 0
-        m['a_goals'] = 0
-        m['h_pen'] = 0
-        m['a_pen'] = 0
-
-    new_round_data = {
-        'name': next_round_name,
-        'matches': next_matches,
-        'waiting': [],
-        'completed': False
-    }
-    st.session_state.playoff_schedule.append(new_round_data)
+        per_op = {}
+        for name, seconds in trace:
+            calls, total = per_op.get(name, (0, 0.0))
+            per_op[name] = (calls + 1, total + seconds)
+        st.markdown(f"**Este rerun:** {rerun_seconds * 1000:.1f} ms")
+        st.dataframe([
+            {'Operação': name, 'Chamadas': calls, 'ms': round(total * 1000, 2)}
+            for name, (calls, total) in sorted(per_op.items(), key=lambda kv: -kv[1][1])
+        ], hide_index=True)
+
+        timings, counters = metrics.snapshot()
+        st.markdown("**Processo (acumulado)**")
+        st.dataframe([
+            {'Operação': name, 'Chamadas': calls, 'Média ms': round(total / calls * 1000, 2), 'Máx ms': round(peak * 1000, 2)}
+            for name, (calls, total, peak) in sorted(timings.items())
+        ], hide_index=True)
+        if counters:
+            st.caption(" | ".join(f"{name}: {value}" for name, value in sorted(counters.items())))
+        st.download_button("📥 Métricas (Prometheus)", metrics.prometheus(), 'metrics.txt', 'text/plain')
 
 # --- APP PRINCIPAL ---
 
 def add_team_callback():
     new_team = st.session_state.team_input
-    if new_team and new_team not in [t['name'] for t in st.session_state.teams]:
-        existing_ids = [t['id'] for t in st.session_state.teams]
-        new_id = (max(existing_ids) + 1) if existing_ids else 1
-        t_obj = {'id': new_id, 'name': new_team, 'wins': 0, 'losses': 0, 'goals_for': 0, 'goal_diff': 0, 'received_bye': False, 'history': [], 'status': 'Ativo'}
-        st.session_state.teams.append(t_obj)
-        st.session_state.team_input = "" 
-    elif not new_team:
+    if not new_team:
         st.warning("Digite um nome.")
+        return
+    try:
+        apply_action(Tournament.add_team, new_team)
+    except TournamentError as e:
+        st.error(str(e))
     else:
-        st.error("Time já existe.")
+        st.session_state.team_input = "" 
 
 def remove_team_callback(team_name_to_remove):
-    st.session_state.teams = [t for t in st.session_state.teams if t['name'] != team_name_to_remove]
+    try:
+        apply_action(Tournament.remove_team, team_name_to_remove)
+    except TournamentError as e:
+        st.error(str(e))
+        return
     st.toast(f"Time '{team_name_to_remove}' removido!")
 
+def show_import_report(report):
+    st.success(f"{len(report.added)} times importados!")
+    if report.duplicates or report.invalid:
+        st.warning(f"{len(report.duplicates)} duplicados e {len(report.invalid)} linhas inválidas ignorados.")
+        problems = [(e.line, f"já inscrito — {e.name}") for e in report.duplicates] + report.invalid
+        st.caption("  \n".join(f"Linha {line}: {reason}" for line, reason in sorted(problems)[:50]))
+
 def bulk_import_callback():
     text = st.session_state.bulk_input
     if text:
-        names = [n.strip() for n in text.split('\n') if n.strip()]
-        count = 0
-        for name in names:
-            if name not in [t['name'] for t in st.session_state.teams]:
-                existing_ids = [t['id'] for t in st.session_state.teams]
-                new_id = (max(existing_ids) + 1) if existing_ids else 1
-                t_obj = {'id': new_id, 'name': name, 'wins': 0, 'losses': 0, 'goals_for': 0, 'goal_diff': 0, 'received_bye': False, 'history': [], 'status': 'Ativo'}
-                st.session_state.teams.append(t_obj)
-                count += 1
-        st.success(f"{count} times importados!")
+        try:
+            report = apply_action(Tournament.import_teams, text_rows(text), False)
+        except TournamentError as e:
+            # O texto fica no campo para tentar de novo.
+            st.error(str(e))
+            return
+        show_import_report(report)
         st.session_state.bulk_input = "" # Limpa
 
-if st.session_state.phase == 'registration':
+def file_import_callback():
+    upload = st.session_state.bulk_file
+    if upload is None:
+        st.warning("Escolha um arquivo.")
+        return
+    try:
+        report = apply_action(Tournament.import_teams, file_rows(upload, upload.name))
+    except ImportError:
+        st.error("Para importar XLSX instale o openpyxl (`pip install openpyxl`) ou salve como CSV.")
+        return
+    except UnicodeDecodeError:
+        st.error("O CSV precisa estar em UTF-8.")
+        return
+    except TournamentError as e:
+        st.error(str(e))
+        return
+    show_import_report(report)
+
+# --- SÚMULAS (PLACARES POR PLANILHA) ---
+# Chaves dos campos de placar dos formulários: (gols m, gols v, pên. m, pên. v).
+SCORE_FORM_KEYS = {
+    'swiss': ("h_{r}_{i}", "a_{r}_{i}", "swiss_pen_h_{i}", "swiss_pen_a_{i}"),
+    'playoff': ("pg_h_{r}_{i}", "pg_a_{r}_{i}", "pen_h_{r}_{i}", "pen_a_{r}_{i}"),
+}
+
+def open_round(t):
+    """(tipo, número da rodada como nos formulários, jogos, ação que confirma a rodada)."""
+    if t.phase == 'swiss':
+        return 'swiss', len(t.rounds), t.rounds[-1].matches, Tournament.submit_swiss_results
+    return 'playoff', len(t.playoff_schedule), t.playoff_schedule[-1].matches, Tournament.submit_playoff_results
+
+def build_score_sheet(t):
+    _, _, matches, _ = open_round(t)
+    return csv_bytes(score_sheet_rows(t.teams, matches), SCORE_SHEET_COLUMNS, none_if_empty=True)
+
+def score_sheet_callback():
+    upload = st.session_state.score_file
+    if upload is None:
+        st.warning("Escolha um arquivo.")
+        return
+    kind, round_id, matches, submit = open_round(tournament)
+    try:
+        report = read_round_results(file_rows(upload, upload.name), tournament.teams, matches)
+    except ImportError:
+        st.error("Para ler XLSX instale o openpyxl (`pip install openpyxl`) ou salve como CSV.")
+        return
+    except UnicodeDecodeError:
+        st.error("O CSV precisa estar em UTF-8.")
+        return
+
+    if report.complete:
+        # Rodada inteira num lote só, com a mesma validação do formulário.
+        try:
+            apply_action(submit, report.scores)
+        except TournamentError as e:
+            st.error(str(e))
+            return
+        reset_penalty_prompts()
+        st.success(f"Rodada confirmada pela súmula: {report.summary()}.")
+        return
+
+    # Incompleta: nada é gravado; os placares válidos vão para o formulário para conferência.
+    keys = SCORE_FORM_KEYS[kind]
+    for i, score in enumerate(report.scores):
+        if score is not None:
+            for key, value in zip(keys, score):
+                st.session_state[key.format(r=round_id, i=i)] = value
+    if not report.missing and any(score[0] == score[1] for score in report.scores):
+        st.session_state[f"{kind}_asking_penalties"] = True
+    st.warning(f"Súmula não aplicada: {report.summary()}. Os placares válidos foram preenchidos abaixo.")
+    problems = sorted(report.unmatched + report.invalid)
+    missing = [f"Sem placar: {tournament.teams.name_of(matches[i].home)} x {tournament.teams.name_of(matches[i].away)}"
+               for i in report.missing]
+    st.caption("  \n".join([f"Linha {line}: {reason}" for line, reason in problems[:50]] + missing[:50]))
+
+def render_score_upload():
+    _, round_id, _, _ = open_round(tournament)
+    with st.expander("📄 Enviar Súmula (CSV/XLSX)"):
+        template = manager.view(tournament.id, 'score_sheet', build_score_sheet)
+        st.download_button("📥 Modelo da Rodada (CSV)", template, f"sumula_rodada_{round_id}.csv", 'text/csv')
+        st.file_uploader("Súmula preenchida: colunas Mandante, Gols M, Gols V, Visitante e, nos empates, Pen M e Pen V "
+                         "(times pelo nome ou id):", type=['csv', 'xlsx'], key="score_file")
+        st.button("Aplicar Súmula", on_click=score_sheet_callback)
+
+render_division_picker()
+
+if tournament.phase == 'registration':
     st.title("🏆 Inscrição de Times")
     
     c1, c2 = st.columns([3,1])
@@ -548,12 +539,15 @@ if st.session_state.phase == 'registration':
     with st.expander("📝 Importar em Lote"):
         st.text_area("Cole a lista de nomes (um por linha):", key="bulk_input")
         st.button("Importar Lista", on_click=bulk_import_callback)
+        st.file_uploader("Ou envie uma planilha (CSV/XLSX) com a coluna 'nome' e, opcionalmente, 'rating', 'clube' e 'grupo':",
+                         type=['csv', 'xlsx'], key="bulk_file")
+        st.button("Importar Planilha", on_click=file_import_callback)
 
-    if st.session_state.teams:
+    if tournament.teams:
         st.markdown("---")
-        st.subheader(f"Times Inscritos ({len(st.session_state.teams)})")
+        st.subheader(f"Times Inscritos ({len(tournament.teams)})")
         with st.expander("🗑️ Remover Times"):
-            tn = [t['name'] for t in st.session_state.teams]
+            tn = tournament.teams.names()
             c_d1, c_d2 = st.columns([3,1])
             with c_d1: t_rem = st.selectbox("Selecione para excluir:", tn, key="del_ts")
             with c_d2: 
@@ -562,32 +556,44 @@ if st.session_state.phase == 'registration':
                     st.rerun()
 
     st.markdown("---")
+    st.radio("Emparceiramento", list(PAIRING_MODES), format_func=PAIRING_MODES.get, key="pairing_mode_input", horizontal=True,
+             help=f"O modo ótimo aceita até {MAX_OPTIMAL_TEAMS} times; acima disso use o rápido.")
+    if st.session_state.pairing_mode_input == 'optimal' and len(tournament.teams) > MAX_OPTIMAL_TEAMS:
+        st.warning(f"Com {len(tournament.teams)} times só o modo rápido está disponível (ótimo: até {MAX_OPTIMAL_TEAMS}).")
+    st.radio("Vagas no mata-mata", PLAYOFF_SIZES, key="playoff_size_input", horizontal=True)
+    st.multiselect("Desempates extras (depois de gols pró, na ordem escolhida)", list(TIEBREAKS), format_func=TIEBREAKS.get,
+                   key="tiebreaks_input")
     if st.button("Iniciar Torneio", type="primary"):
-        qtd = len(st.session_state.teams)
-        if 6 <= qtd <= 16:
-            st.session_state.phase = 'swiss'
-            generate_swiss_round()
-            st.rerun()
+        try:
+            apply_action(Tournament.start, st.session_state.pairing_mode_input, st.session_state.playoff_size_input,
+                         st.session_state.tiebreaks_input)
+        except TournamentError as e:
+            st.error(str(e))
         else:
-            st.error(f"É necessário entre 6 e 16 times. Atual: {qtd}")
+            reset_penalty_prompts()
+            st.rerun()
 
-elif st.session_state.phase == 'swiss':
-    round_idx = len(st.session_state.rounds)
+elif tournament.phase == 'swiss':
+    round_idx = len(tournament.rounds)
     st.title(f"⚔️ Fase Suíça - Rodada {round_idx}")
     
-    current_round = st.session_state.rounds[-1]
-    matches = current_round['matches']
-    bye_team = current_round['bye']
+    current_round = tournament.rounds[-1]
+    matches = current_round.matches
+    bye_team = tournament.teams.get(current_round.bye) if current_round.bye else None
     
     if bye_team:
-        st.success(f"🎉 **BYE:** O time **{bye_team['name']}** folga nesta rodada e ganha +1 Vitória.")
+        st.success(f"🎉 **BYE:** O time **{bye_team.name}** folga nesta rodada e ganha +1 Vitória.")
 
-    tab_jogos, tab_regras = st.tabs(["⚽ Jogos da Rodada", "📜 Regulamento"])
+    tab_jogos, tab_regras, tab_odds = st.tabs(["⚽ Jogos da Rodada", "📜 Regulamento", "🎲 Probabilidades"])
 
     with tab_regras:
         st.markdown(REGULAMENTO_TXT)
 
+    with tab_odds:
+        render_odds_tab()
+
     with tab_jogos:
+        render_score_upload()
         with st.form(key=f"swiss_round_form_{round_idx}"):
             st.subheader("Resultados")
             
@@ -597,8 +603,8 @@ elif st.session_state.phase == 'swiss':
 
             for i, match in enumerate(matches):
                 c1, c2, c3, c4 = st.columns([2, 1, 1, 2])
-                home_name = next(t['name'] for t in st.session_state.teams if t['id'] == match['home'])
-                away_name = next(t['name'] for t in st.session_state.teams if t['id'] == match['away'])
+                home_name = tournament.teams.name_of(match.home)
+                away_name = tournament.teams.name_of(match.away)
                 
                 with c1: st.markdown(f"<h3 style='text-align: right'>{home_name}</h3>", unsafe_allow_html=True)
                 with c2: s1 = st.number_input("Gols", min_value=0, value=None, key=f"h_{round_idx}_{i}", disabled=disabled_score)
@@ -615,7 +621,7 @@ elif st.session_state.phase == 'swiss':
                     with cp2: pen_a = st.number_input(f"Pênaltis {away_name}", min_value=0, value=None, key=f"swiss_pen_a_{i}")
                     any_draw = True
                 
-                matches_data_input.append({'match_idx': i, 'home_id': match['home'], 'away_id': match['away'], 'h_g': s1, 'a_g': s2, 'h_p': pen_h, 'a_p': pen_a})
+                matches_data_input.append({'match_idx': i, 'home_id': match.home, 'away_id': match.away, 'h_g': s1, 'a_g': s2, 'h_p': pen_h, 'a_p': pen_a})
                 
             btn_label = "Confirmar Classificação" if st.session_state.swiss_asking_penalties else "Conferir Resultados"
             submitted = st.form_submit_button(btn_label)
@@ -627,99 +633,65 @@ elif st.session_state.phase == 'swiss':
                 
                 if missing_input:
                     st.error("Preencha todos os placares.")
+                elif not st.session_state.swiss_asking_penalties and any(item['h_g'] == item['a_g'] for item in matches_data_input):
+                    st.session_state.swiss_asking_penalties = True
+                    st.rerun()
                 else:
-                    has_new_draw = False
-                    if not st.session_state.swiss_asking_penalties:
-                        for item in matches_data_input:
-                            if item['h_g'] == item['a_g']: has_new_draw = True
-                        
-                        if has_new_draw:
-                            st.session_state.swiss_asking_penalties = True
-                            st.rerun()
-                        else:
-                            if bye_team: update_team_stats(bye_team['id'], 1, 0, True, True)
-                            for item in matches_data_input:
-                                w_home = item['h_g'] > item['a_g']
-                                w_id = item['home_id'] if w_home else item['away_id']
-                                current_round['matches'][item['match_idx']]['winner_id'] = w_id
-                                current_round['matches'][item['match_idx']]['home_score'] = item['h_g']
-                                current_round['matches'][item['match_idx']]['away_score'] = item['a_g']
-                                update_team_stats(item['home_id'], item['h_g'], item['a_g'], w_home)
-                                update_team_stats(item['away_id'], item['a_g'], item['h_g'], not w_home)
-                            
-                            current_round['completed'] = True
-                            if len([t for t in st.session_state.teams if t['status'] == 'Ativo']) <= 1: init_playoffs()
-                            else: generate_swiss_round()
-                            st.rerun()
+                    scores = [(item['h_g'], item['a_g'], item['h_p'], item['a_p']) for item in matches_data_input]
+                    try:
+                        apply_action(Tournament.submit_swiss_results, scores)
+                    except TournamentError as e:
+                        st.error(str(e))
                     else:
-                        valid = True
-                        for item in matches_data_input:
-                            if item['h_g'] == item['a_g']:
-                                if item['h_p'] is None or item['a_p'] is None: 
-                                    st.error("Preencha os pênaltis."); valid = False; break
-                                if item['h_p'] == item['a_p']: 
-                                    st.error("Pênaltis não podem empatar."); valid = False; break
-                        
-                        if valid:
-                            if bye_team: update_team_stats(bye_team['id'], 1, 0, True, True)
-                            for item in matches_data_input:
-                                hg, ag, hp, ap = item['h_g'], item['a_g'], item['h_p'], item['a_p']
-                                w_home = hg > ag if hg != ag else hp > ap
-                                w_id = item['home_id'] if w_home else item['away_id']
-                                current_round['matches'][item['match_idx']]['winner_id'] = w_id
-                                current_round['matches'][item['match_idx']]['home_score'] = hg
-                                current_round['matches'][item['match_idx']]['away_score'] = ag
-                                current_round['matches'][item['match_idx']]['h_pen'] = hp
-                                current_round['matches'][item['match_idx']]['a_pen'] = ap
-                                update_team_stats(item['home_id'], hg, ag, w_home)
-                                update_team_stats(item['away_id'], ag, hg, not w_home)
-
-                            current_round['completed'] = True
-                            if len([t for t in st.session_state.teams if t['status'] == 'Ativo']) <= 1: init_playoffs()
-                            else: generate_swiss_round()
-                            st.rerun()
-
-elif st.session_state.phase == 'playoff_gameplay':
-    st.title("🔥 Fase Final (Mata-Mata)")
+                        reset_penalty_prompts()
+                        st.rerun()
 
-    for idx, r_data in enumerate(st.session_state.playoff_schedule):
-        if r_data['completed']:
-            with st.expander(f"✅ {r_data['name']} (Concluído)", expanded=False):
-                for m in r_data['matches']:
-                    winner_name = "**" + (m['home']['name'] if m['winner_id'] == m['home']['id'] else m['away']['name']) + "**"
-                    pen_txt = f" (Pên: {m['h_pen']} x {m['a_pen']})" if m.get('is_penalties') else ""
-                    st.write(f"{m['label']}: {m['home']['name']} {m['h_goals']} x {m['a_goals']} {m['away']['name']}{pen_txt} -> Vencedor: {winner_name}")
+elif tournament.phase == 'playoff_gameplay':
+    st.title("🔥 Fase Final (Mata-Mata)")
 
-    current_round = st.session_state.playoff_schedule[-1]
-    round_id = len(st.session_state.playoff_schedule)
+    for idx, r_data in enumerate(tournament.playoff_schedule):
+        if r_data.completed:
+            with st.expander(f"✅ {r_data.name} (Concluído)", expanded=False):
+                for m in r_data.matches:
+                    h_name = tournament.teams.name_of(m.home)
+                    a_name = tournament.teams.name_of(m.away)
+                    winner_name = "**" + (h_name if m.winner_id == m.home else a_name) + "**"
+                    pen_txt = f" (Pên: {m.h_pen} x {m.a_pen})" if m.is_penalties else ""
+                    st.write(f"{m.label}: {h_name} {m.h_goals} x {m.a_goals} {a_name}{pen_txt} -> Vencedor: {winner_name}")
+
+    current_round = tournament.playoff_schedule[-1]
+    round_id = len(tournament.playoff_schedule)
     
-    st.markdown(f"### ⚡ Em andamento: {current_round['name']}")
-    if current_round['waiting']:
-        names_waiting = ", ".join([t['name'] for t in current_round['waiting']])
+    st.markdown(f"### ⚡ Em andamento: {current_round.name}")
+    if current_round.waiting:
+        names_waiting = ", ".join([tournament.teams.name_of(t) for t in current_round.waiting])
         st.info(f"🛑 Times aguardando (Byes): **{names_waiting}**")
     
-    tab_jogos, tab_regras = st.tabs(["⚽ Jogos da Rodada", "📜 Regulamento"])
+    tab_jogos, tab_regras, tab_odds = st.tabs(["⚽ Jogos da Rodada", "📜 Regulamento", "🎲 Probabilidades"])
     
     with tab_regras: st.markdown(REGULAMENTO_TXT)
 
+    with tab_odds: render_odds_tab()
+
     with tab_jogos:
+        render_score_upload()
         with st.form(key=f"playoff_form_{round_id}"):
             matches_data_input = []
             any_draw = False
 
-            for i, match in enumerate(current_round['matches']):
-                home = match['home']
-                away = match['away']
-                st.markdown(f"**{match['label']}**")
+            for i, match in enumerate(current_round.matches):
+                home = tournament.teams.get(match.home)
+                away = tournament.teams.get(match.away)
+                st.markdown(f"**{match.label}**")
                 
                 col1, col2, col3, col4, col5 = st.columns([3, 1, 0.5, 1, 3])
                 disabled_score = st.session_state.playoff_asking_penalties
                 
-                with col1: st.markdown(f"<h3 style='text-align: right'>{home['name']}</h3>", unsafe_allow_html=True)
+                with col1: st.markdown(f"<h3 style='text-align: right'>{home.name}</h3>", unsafe_allow_html=True)
                 with col2: val_h = st.number_input("Gols", min_value=0, value=None, key=f"pg_h_{round_id}_{i}", disabled=disabled_score)
                 with col3: st.markdown("<h3 style='text-align: center'>X</h3>", unsafe_allow_html=True)
                 with col4: val_a = st.number_input("Gols", min_value=0, value=None, key=f"pg_a_{round_id}_{i}", disabled=disabled_score)
-                with col5: st.markdown(f"<h3>{away['name']}</h3>", unsafe_allow_html=True)
+                with col5: st.markdown(f"<h3>{away.name}</h3>", unsafe_allow_html=True)
                 
                 pen_h = 0
                 pen_a = 0
@@ -727,8 +699,8 @@ elif st.session_state.phase == 'playoff_gameplay':
                 if st.session_state.playoff_asking_penalties and val_h is not None and val_a is not None and val_h == val_a:
                     st.warning("⚠️ Empate! Insira os pênaltis:")
                     cp1, cp2 = st.columns(2)
-                    with cp1: pen_h = st.number_input(f"Pênaltis {home['name']}", min_value=0, value=None, key=f"pen_h_{round_id}_{i}")
-                    with cp2: pen_a = st.number_input(f"Pênaltis {away['name']}", min_value=0, value=None, key=f"pen_a_{round_id}_{i}")
+                    with cp1: pen_h = st.number_input(f"Pênaltis {home.name}", min_value=0, value=None, key=f"pen_h_{round_id}_{i}")
+                    with cp2: pen_a = st.number_input(f"Pênaltis {away.name}", min_value=0, value=None, key=f"pen_a_{round_id}_{i}")
                     any_draw = True
                 
                 matches_data_input.append({'match': match, 'h_g': val_h, 'a_g': val_a, 'h_p': pen_h, 'a_p': pen_a})
@@ -743,104 +715,59 @@ elif st.session_state.phase == 'playoff_gameplay':
                 
                 if missing_input:
                     st.error("Preencha todos os placares.")
+                elif not st.session_state.playoff_asking_penalties and any(item['h_g'] == item['a_g'] for item in matches_data_input):
+                    st.session_state.playoff_asking_penalties = True
+                    st.rerun()
                 else:
-                    has_new_draw = False
-                    winners = []
-                    losers = []
-                    
-                    if not st.session_state.playoff_asking_penalties:
-                        for item in matches_data_input:
-                            if item['h_g'] == item['a_g']: has_new_draw = True
-                        
-                        if has_new_draw:
-                            st.session_state.playoff_asking_penalties = True
-                            st.rerun()
-                        else:
-                            for item in matches_data_input:
-                                m = item['match']
-                                m['h_goals'] = item['h_g']
-                                m['a_goals'] = item['a_g']
-                                m['is_penalties'] = False
-                                m['h_pen'] = 0
-                                m['a_pen'] = 0
-                                
-                                w = m['home'] if item['h_g'] > item['a_g'] else m['away']
-                                l = m['away'] if item['h_g'] > item['a_g'] else m['home']
-                                m['winner_id'] = w['id']
-                                winners.append(w)
-                                losers.append(l)
-                                
-                                update_team_stats(m['home']['id'], item['h_g'], item['a_g'], w['id'] == m['home']['id'])
-                                update_team_stats(m['away']['id'], item['a_g'], item['h_g'], w['id'] == m['away']['id'])
-                            
-                            current_round['completed'] = True
-                            advance_playoff_round(winners, current_round['waiting'], losers=losers)
-                            st.rerun()
+                    scores = [(item['h_g'], item['a_g'], item['h_p'], item['a_p']) for item in matches_data_input]
+                    try:
+                        apply_action(Tournament.submit_playoff_results, scores)
+                    except TournamentError as e:
+                        st.error(str(e))
                     else:
-                        valid = True
-                        winners = []
-                        losers = []
-                        for item in matches_data_input:
-                            if item['h_g'] == item['a_g']:
-                                if item['h_p'] is None or item['a_p'] is None: st.error("Preencha pênaltis."); valid = False; break
-                                if item['h_p'] == item['a_p']: st.error("Pênaltis sem empate."); valid = False; break
-                        
-                        if valid:
-                            for item in matches_data_input:
-                                m = item['match']
-                                m['h_goals'] = item['h_g']
-                                m['a_goals'] = item['a_g']
-                                m['h_pen'] = item['h_p']
-                                m['a_pen'] = item['a_p']
-                                
-                                if item['h_g'] != item['a_g']:
-                                    m['is_penalties'] = False
-                                    w_home = item['h_g'] > item['a_g']
-                                else:
-                                    m['is_penalties'] = True
-                                    w_home = item['h_p'] > item['a_p']
-                                
-                                w = m['home'] if w_home else m['away']
-                                l = m['away'] if w_home else m['home']
-                                m['winner_id'] = w['id']
-                                winners.append(w)
-                                losers.append(l)
-                                
-                                update_team_stats(m['home']['id'], item['h_g'], item['a_g'], w['id'] == m['home']['id'])
-                                update_team_stats(m['away']['id'], item['a_g'], item['h_g'], w['id'] == m['away']['id'])
-                            
-                            current_round['completed'] = True
-                            advance_playoff_round(winners, current_round['waiting'], losers=losers)
-                            st.rerun()
-
-elif st.session_state.phase == 'champion':
+                        reset_penalty_prompts()
+                        st.rerun()
+
+elif tournament.phase == 'champion':
     st.balloons()
-    champ = st.session_state.champion
-    vice = st.session_state.get('vice')
-    third = st.session_state.get('third')
+    champ = tournament.teams.get(tournament.champion)
+    vice = tournament.teams.get(tournament.vice)
+    third = tournament.teams.get(tournament.third)
     
     st.markdown(f"""<div style="text-align: center; padding: 30px;"><h1>🏆 TORNEIO ENCERRADO! 🏆</h1></div>""", unsafe_allow_html=True)
     
     c1, c2, c3 = st.columns(3)
     with c2:
-        st.markdown(f"""<div style="text-align: center; background-color: #FFD700; padding: 20px; border-radius: 10px; color: black;"><h2>🥇 CAMPEÃO</h2><h1 style="margin:0;">{champ['name']}</h1></div>""", unsafe_allow_html=True)
+        st.markdown(f"""<div style="text-align: center; background-color: #FFD700; padding: 20px; border-radius: 10px; color: black;"><h2>🥇 CAMPEÃO</h2><h1 style="margin:0;">{champ.name}</h1></div>""", unsafe_allow_html=True)
     with c1:
-        if vice: st.markdown(f"""<div style="text-align: center; background-color: #C0C0C0; padding: 20px; border-radius: 10px; color: black; margin-top: 20px;"><h3>🥈 Vice-Campeão</h3><h2 style="margin:0;">{vice['name']}</h2></div>""", unsafe_allow_html=True)
+        if vice: st.markdown(f"""<div style="text-align: center; background-color: #C0C0C0; padding: 20px; border-radius: 10px; color: black; margin-top: 20px;"><h3>🥈 Vice-Campeão</h3><h2 style="margin:0;">{vice.name}</h2></div>""", unsafe_allow_html=True)
     with c3:
-        if third: st.markdown(f"""<div style="text-align: center; background-color: #CD7F32; padding: 20px; border-radius: 10px; color: black; margin-top: 20px;"><h3>🥉 3º Lugar</h3><h2 style="margin:0;">{third['name']}</h2></div>""", unsafe_allow_html=True)
+        if third: st.markdown(f"""<div style="text-align: center; background-color: #CD7F32; padding: 20px; border-radius: 10px; color: black; margin-top: 20px;"><h3>🥉 3º Lugar</h3><h2 style="margin:0;">{third.name}</h2></div>""", unsafe_allow_html=True)
 
     st.markdown("---")
     st.markdown("### 📊 Estatísticas do Campeão")
-    goals_against = champ['goals_for'] - champ['goal_diff']
+    goals_against = champ.goals_for - champ.goal_diff
     m1, m2, m3, m4 = st.columns(4)
-    with m1: m1.metric("Vitórias", champ['wins'])
-    with m2: m2.metric("Gols Pró", champ['goals_for'])
+    with m1: m1.metric("Vitórias", champ.wins)
+    with m2: m2.metric("Gols Pró", champ.goals_for)
     with m3: m3.metric("Gols Sofridos", goals_against)
-    with m4: m4.metric("Saldo", champ['goal_diff'])
+    with m4: m4.metric("Saldo", champ.goal_diff)
     
     st.markdown("---")
     if st.button("Reiniciar Torneio Completo"):
+        # Nova edição da mesma divisão; a encerrada continua no banco.
+        restarted = manager.create(tournament.name)
+        # A edição encerrada sai da memória; quem ainda a abrir recarrega do banco.
+        manager.evict(tournament.id)
         for key in list(st.session_state.keys()): del st.session_state[key]
+        st.session_state.tournament_id = restarted.id
         st.rerun()
 
 render_sidebar_stats()
+# Revisão efetivamente exibida: ações da próxima interação são conferidas contra ela.
+st.session_state.seen_revision = tournament.revision
+
+# Fim do rerun: fecha as medições desta thread; o painel só aparece com ?admin=1.
+trace = metrics.end_trace()
+if st.query_params.get('admin') == '1':
+    render_admin_panel(trace, time.perf_counter() - RERUN_START)
@@ -0,0 +1,177 @@
+# --- BENCHMARK: API HTTP ---
+# Requisições por segundo da API JSON com clientes concorrentes fazendo
+# polling da classificação (com e sem ETag), lendo a rodada e enviando
+# resultados. Sem --servidor, chama o app ASGI direto no processo (custo do app);
+# com --servidor, fala HTTP/1.1 keep-alive com um servidor de verdade, ex.:
+#
+#   TORNEIO_DB=carga.db uvicorn --factory torneio.api:create_app --port 8000
+#   python benchmarks/bench_api.py --servidor http://127.0.0.1:8000 --torneio <id>
+#
+#   python benchmarks/bench_api.py --times 512 --clientes 50 --segundos 3
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from torneio.api import create_app
+from torneio.manager import TournamentManager
+from torneio.storage import TournamentStore
+from torneio.tournament import Tournament
+
+
+class InProcessClient:
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method, path, body=b'', headers=()):
+        scope = {'type': 'http', 'method': method, 'path': path, 'headers': list(headers)}
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        response = {}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = dict(message['headers'])
+            else:
+                response['body'] = message.get('body', b'')
+
+        await self.app(scope, receive, send)
+        return response['status'], response['headers'], response['body']
+
+
+class HTTPClient:
+    """Cliente HTTP/1.1 mínimo com conexão persistente (um por tarefa)."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b'', headers=()):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(body)}"]
+        lines += [f"{k.decode()}: {v.decode()}" for k, v in headers]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            key, _, value = line.decode().partition(':')
+            response_headers[key.strip().lower().encode()] = value.strip().encode()
+        data = await self.reader.readexactly(int(response_headers.get(b'content-length', b'0')))
+        return status, response_headers, data
+
+
+async def run_scenario(make_client, seconds, clients, step):
+    deadline = time.perf_counter() + seconds
+    counts = []
+
+    async def worker():
+        client = make_client()
+        state = {}
+        done = 0
+        while time.perf_counter() < deadline:
+            sent = await step(client, state)
+            if sent is None:
+                done += 1
+            elif sent == 0:
+                break
+            else:
+                done += sent
+        counts.append(done)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def setup(teams):
+    tmp = tempfile.mkdtemp()
+    manager = TournamentManager(TournamentStore(os.path.join(tmp, 'api.db')))
+    tournament = manager.create("Carga API")
+    manager.apply(tournament.id, Tournament.add_teams, [f"Time {i}" for i in range(teams)])
+    manager.apply(tournament.id, Tournament.start)
+    return create_app(manager), tournament.id
+
+
+async def main_async(args):
+    if args.servidor:
+        tournament_id = args.torneio
+        make_client = lambda: HTTPClient(args.servidor)  # noqa: E731
+    else:
+        app, tournament_id = setup(args.times)
+        make_client = lambda: InProcessClient(app)  # noqa: E731
+    base = f"/torneios/{tournament_id}"
+
+    async def standings_etag(client, state):
+        headers = [(b'if-none-match', state['etag'])] if 'etag' in state else []
+        _, headers_out, _ = await client.request('GET', base + '/classificacao', headers=headers)
+        state['etag'] = headers_out.get(b'etag', b'')
+
+    async def standings_full(client, state):
+        await client.request('GET', base + '/classificacao')
+
+    async def current_round(client, state):
+        await client.request('GET', base + '/rodada')
+
+    rng = random.Random(0)
+
+    async def submit(client, state):
+        # Lê a rodada e envia placares; conta só os POSTs (um 409 de conflito
+        # também é resposta atendida). Para quando o torneio chega ao fim.
+        _, _, body = await client.request('GET', base + '/rodada')
+        data = json.loads(body)
+        if data['fase'] not in ('swiss', 'playoff_gameplay'):
+            return 0
+        scores = []
+        for _ in data['jogos']:
+            h, a = rng.randint(0, 3), rng.randint(0, 3)
+            scores.append({'mandante': h, 'visitante': a, 'penaltis_mandante': 5 if h == a else None,
+                           'penaltis_visitante': 4 if h == a else None})
+        payload = json.dumps({'revisao': data['revisao'], 'placares': scores}).encode()
+        await client.request('POST', base + '/resultados', payload, [(b'content-type', b'application/json')])
+        return 1
+
+    scenarios = [
+        ('classificação com If-None-Match (304)', standings_etag, args.clientes),
+        ('classificação sem ETag (200)', standings_full, args.clientes),
+        ('rodada atual', current_round, args.clientes),
+        ('envio de resultados (POST)', submit, 2),
+    ]
+    print(f"{'HTTP ' + args.servidor if args.servidor else 'ASGI no processo'}: {args.clientes} clientes, {args.segundos:.0f} s por cenário")
+    for label, step, clients in scenarios:
+        rate = await run_scenario(make_client, args.segundos, clients, step)
+        print(f"  {label:<40} {rate:10,.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--times', type=int, default=512)
+    parser.add_argument('--clientes', type=int, default=50)
+    parser.add_argument('--segundos', type=float, default=3)
+    parser.add_argument('--servidor', help="servidor já rodando (ex.: http://127.0.0.1:8000)")
+    parser.add_argument('--torneio', help="id do torneio no servidor (com --servidor)")
+    args = parser.parse_args()
+    if args.servidor and not args.torneio:
+        parser.error("--servidor exige --torneio")
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+# --- BENCHMARK: IMPORTAÇÃO EM LOTE ---
+# Inscrição de uma planilha grande (com duplicados e linhas inválidas
+# espalhados) pelo mesmo caminho do app: leitura linha a linha, registro,
+# relatório e gravação no SQLite. Para comparação, o algoritmo antigo do
+# callback (lista de nomes e max(ids) refeitos a cada linha) numa amostra menor.
+# Por fim, a súmula de uma rodada inteira (--jogos) lida, casada com os jogos
+# e confirmada num lote só.
+#
+#   python benchmarks/bench_import.py --linhas 50000 --jogos 2500
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tournament import random_scores
+from torneio.importer import SCORE_SHEET_COLUMNS, file_rows, read_round_results, text_rows
+from torneio.manager import TournamentManager
+from torneio.storage import TournamentStore
+from torneio.tournament import Tournament
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = [('nome', 'rating', 'clube', 'grupo')]
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.01 and i:
+            name = f"Time {rng.randrange(i)}"  # duplicado
+        elif roll < 0.015:
+            name = ""  # inválido
+        else:
+            name = f"Time {i}"
+        rating = 'abc' if rng.random() < 0.002 else f"{rng.gauss(1500, 200):.0f}"
+        rows.append((name, rating, f"Clube {i % 500}", f"Grupo {chr(65 + i % 8)}"))
+    return rows
+
+
+def csv_file(rows):
+    return io.BytesIO("\n".join(";".join(r) for r in rows).encode('utf-8'))
+
+
+def xlsx_file(rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for r in rows:
+        sheet.append(list(r))
+    out = io.BytesIO()
+    workbook.save(out)
+    out.seek(0)
+    return out
+
+
+def legacy_import(names):
+    """O callback antigo: O(N) por linha."""
+    teams = []
+    for name in names:
+        existing_names = [t['name'] for t in teams]
+        if name and name not in existing_names:
+            existing_ids = [t['id'] for t in teams]
+            teams.append({'id': max(existing_ids) + 1 if existing_ids else 1, 'name': name})
+    return teams
+
+
+def timed_import(manager, label, make_stream, filename, detect_header=True):
+    tournament = manager.create(label)
+    stream = make_stream()
+    start = time.perf_counter()
+    rows = text_rows(stream) if filename is None else file_rows(stream, filename)
+    report = manager.apply(tournament.id, Tournament.import_teams, rows, detect_header)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {elapsed * 1000:9.0f} ms   {report.summary()}")
+
+
+def score_sheet(tournament, scores):
+    """Súmula preenchida da rodada aberta, com um terço das linhas com mandante/visitante invertidos."""
+    rows = [SCORE_SHEET_COLUMNS]
+    name_of = tournament.teams.name_of
+    for i, (m, (hg, ag, hp, ap)) in enumerate(zip(tournament.rounds[-1].matches, scores), 1):
+        hp, ap = ('', '') if hp is None else (hp, ap)
+        if i % 3:
+            rows.append((i, name_of(m.home), hg, ag, name_of(m.away), hp, ap))
+        else:
+            rows.append((i, name_of(m.away), ag, hg, name_of(m.home), ap, hp))
+    return [tuple(str(c) for c in r) for r in rows]
+
+
+def timed_score_sheet(n_matches, label, make_stream, filename):
+    rng = random.Random(0)
+    tournament = Tournament(rng=random.Random(0))
+    tournament.add_teams([f"Time {i}" for i in range(2 * n_matches)])
+    tournament.start()
+    current = tournament.rounds[-1]
+    data = make_stream(score_sheet(tournament, random_scores(current.matches, rng)))
+    start = time.perf_counter()
+    report = read_round_results(file_rows(data, filename), tournament.teams, current.matches)
+    read = time.perf_counter() - start
+    tournament.submit_swiss_results(report.scores)
+    elapsed = time.perf_counter() - start
+    print(f"  súmula {label:<17} {elapsed * 1000:9.0f} ms   (leitura {read * 1000:.0f} ms)   {report.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--linhas', type=int, default=50000)
+    parser.add_argument('--linhas-legado', type=int, default=5000)
+    parser.add_argument('--jogos', type=int, default=2500, help="jogos na rodada da súmula")
+    args = parser.parse_args()
+
+    rows = make_rows(args.linhas)
+    text = "\n".join(r[0] for r in rows[1:])
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = TournamentManager(TournamentStore(os.path.join(tmp, 'import.db')))
+        print(f"{args.linhas} linhas (importação + gravação no SQLite)")
+        timed_import(manager, "texto colado", lambda: text, None, False)
+        timed_import(manager, "CSV", lambda: csv_file(rows), 'inscricoes.csv')
+        try:
+            data = xlsx_file(rows)
+        except ImportError:
+            print("  XLSX                     (openpyxl não instalado)")
+        else:
+            timed_import(manager, "XLSX", lambda: data, 'inscricoes.xlsx')
+        manager.store.close()
+
+    names = [r[0] for r in rows[1:args.linhas_legado + 1]]
+    start = time.perf_counter()
+    legacy_import(names)
+    elapsed = time.perf_counter() - start
+    print(f"  algoritmo antigo, {len(names)} linhas: {elapsed * 1000:.0f} ms "
+          f"(quadrático: ~{elapsed * (args.linhas / len(names)) ** 2:.0f} s para {args.linhas})")
+
+    print(f"súmula de uma rodada com {args.jogos} jogos (leitura + confirmação + próximo sorteio)")
+    timed_score_sheet(args.jogos, "CSV", csv_file, 'sumula.csv')
+    try:
+        timed_score_sheet(args.jogos, "XLSX", xlsx_file, 'sumula.xlsx')
+    except ImportError:
+        print("  súmula XLSX                (openpyxl não instalado)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# --- BENCHMARK: CLASSIFICAÇÃO AO VIVO ---
+# Centenas de telões conectados ao SSE de um torneio; a cada rodada enviada
+# pela API mede o tempo até a ÚLTIMA conexão receber o diff, o tamanho do
+# diff contra o da tabela inteira (e quanto dele é a ordem: pares de quem mudou
+# de lugar ou a ordem inteira) e quantas vezes a classificação foi montada
+# (deve ser uma por rodada, não uma por espectador).
+#
+#   python benchmarks/bench_live.py --times 256 --espectadores 500
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from torneio import live
+from torneio.api import create_app
+from torneio.manager import TournamentManager
+from torneio.replay import hypothetical_scores
+from torneio.storage import TournamentStore
+from torneio.tournament import Tournament
+
+
+def parse_events(buffer):
+    """Separa eventos SSE completos; devolve (eventos, resto do buffer)."""
+    events = []
+    while b'\n\n' in buffer:
+        raw, buffer = buffer.split(b'\n\n', 1)
+        fields = dict(line.split(': ', 1) for line in raw.decode().split('\n') if not line.startswith(':'))
+        if fields:
+            events.append((fields['event'], fields['data']))
+    return events, buffer
+
+
+async def viewer(app, path, arrivals, ready, done):
+    disconnect = asyncio.Event()
+    buffer = b''
+
+    async def receive():
+        await disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal buffer
+        if message['type'] != 'http.response.body':
+            return
+        events, buffer = parse_events(buffer + message['body'])
+        for event, data in events:
+            if event == 'snapshot':
+                ready.release()
+            else:
+                arrivals.append((json.loads(data), time.perf_counter(), len(data)))
+
+    task = asyncio.ensure_future(app({'type': 'http', 'method': 'GET', 'path': path, 'headers': []}, receive, send))
+    await done.wait()
+    disconnect.set()
+    await task
+
+
+async def main_async(args):
+    tmp = tempfile.mkdtemp()
+    manager = TournamentManager(TournamentStore(os.path.join(tmp, 'live.db')))
+    tournament = manager.create("Telão")
+    manager.apply(tournament.id, Tournament.add_teams, [f"Time {i}" for i in range(args.times)])
+    manager.apply(tournament.id, Tournament.start)
+    app = create_app(manager)
+
+    builds = 0
+    original = live.standings_snapshot
+
+    def counted(t):
+        nonlocal builds
+        builds += 1
+        return original(t)
+    live.standings_snapshot = counted
+
+    arrivals, ready, done = [], asyncio.Semaphore(0), asyncio.Event()
+    path = f"/torneios/{tournament.id}/ao-vivo"
+    viewers = [asyncio.ensure_future(viewer(app, path, arrivals, ready, done)) for _ in range(args.espectadores)]
+    for _ in range(args.espectadores):
+        await ready.acquire()
+    full_size = len(json.dumps(live.snapshot_data(original(manager.get(tournament.id))), separators=(',', ':')))
+
+    rng = random.Random(0)
+    fanout, sizes, order_parts = [], [], []
+    while tournament.phase in ('swiss', 'playoff_gameplay'):
+        schedule = tournament.rounds if tournament.phase == 'swiss' else tournament.playoff_schedule
+        action = Tournament.submit_swiss_results if tournament.phase == 'swiss' else Tournament.submit_playoff_results
+        scores = hypothetical_scores(schedule[-1].matches, {}, rng)
+        arrivals.clear()
+        start = time.perf_counter()
+        await asyncio.to_thread(manager.apply, tournament.id, action, scores)
+        app.live.notify(tournament.id)
+        while len(arrivals) < args.espectadores:
+            await asyncio.sleep(0.001)
+        fanout.append((max(t for _, t, _ in arrivals) - start) * 1000)
+        sizes.append(arrivals[0][2])
+        diff = arrivals[0][0]
+        order_parts.append(('posicoes' if 'posicoes' in diff else 'ordem',
+                            len(json.dumps(diff.get('posicoes', diff.get('ordem', [])), separators=(',', ':')))))
+
+    done.set()
+    await asyncio.gather(*viewers)
+    print(f"{args.times} times, {args.espectadores} telões conectados, {len(fanout)} rodadas")
+    print(f"  até o último telão receber: p50 {statistics.median(fanout):7.1f} ms   máx {max(fanout):7.1f} ms")
+    print(f"  diff médio {statistics.mean(sizes) / 1024:6.1f} KiB   tabela inteira {full_size / 1024:6.1f} KiB")
+    pairs = sum(1 for kind, _ in order_parts if kind == 'posicoes')
+    print(f"  ordem no diff: média {statistics.mean(n for _, n in order_parts) / 1024:6.2f} KiB   "
+          f"{pairs} rodadas só com quem mudou de lugar, {len(order_parts) - pairs} com a ordem inteira")
+    print(f"  classificação montada {builds} vezes (snapshot inicial + 1 por rodada)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--times', type=int, default=256)
+    parser.add_argument('--espectadores', type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
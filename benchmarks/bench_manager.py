@@ -0,0 +1,132 @@
+# --- BENCHMARK: VÁRIAS DIVISÕES NO MESMO PROCESSO ---
+# Teste de carga do gerenciador: N torneios abertos ao mesmo tempo, dois
+# operadores por torneio disputando o envio da mesma rodada e espectadores
+# refazendo a tela (classificação + exportações) sem parar. Mede a latência
+# de um "rerun" de espectador e confere, no fim, que nenhum torneio foi
+# corrompido (o banco recarrega e o log de eventos bate com os times).
+#
+#   python benchmarks/bench_manager.py --divisoes 50 --times 64 --espectadores 100
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from torneio.export import RANKING_COLUMNS, csv_bytes, ranking_rows
+from torneio.manager import TournamentManager
+from torneio.replay import hypothetical_scores
+from torneio.storage import TournamentStore
+from torneio.tournament import Tournament, TournamentError
+
+
+def rerun(manager, tournament_id):
+    """O trabalho de dados de um rerun de espectador."""
+    tournament = manager.get(tournament_id)
+    ranking = manager.view(tournament_id, 'ranking', lambda t: tuple(ranking_rows(t.teams)))
+    csv = manager.view(tournament_id, 'ranking_csv', lambda t: csv_bytes(ranking_rows(t.teams), RANKING_COLUMNS))
+    schedule = tournament.rounds if tournament.phase == 'swiss' else tournament.playoff_schedule
+    names = [(tournament.teams.name_of(m.home), tournament.teams.name_of(m.away)) for m in schedule[-1].matches] if schedule else []
+    return len(ranking) + len(csv) + len(names)
+
+
+def operator(manager, tournament_id, seed, counters, lock):
+    rng = random.Random(seed)
+    while True:
+        tournament = manager.get(tournament_id)
+        seen = tournament.revision
+        if tournament.phase == 'swiss':
+            action, schedule = Tournament.submit_swiss_results, tournament.rounds
+        elif tournament.phase == 'playoff_gameplay':
+            action, schedule = Tournament.submit_playoff_results, tournament.playoff_schedule
+        else:
+            return
+        scores = hypothetical_scores(schedule[-1].matches, {}, rng)
+        time.sleep(rng.random() * 0.01)  # tempo de digitar os placares
+        try:
+            manager.apply(tournament_id, action, scores, revision=seen)
+            key = 'ok'
+        except TournamentError:
+            key = 'conflitos'
+        with lock:
+            counters[key] += 1
+
+
+def viewer(manager, ids, stop, latencies, seed):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        start = time.perf_counter()
+        rerun(manager, rng.choice(ids))
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.005)
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--divisoes', type=int, default=50)
+    parser.add_argument('--times', type=int, default=64)
+    parser.add_argument('--espectadores', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TournamentStore(os.path.join(tmp, 'carga.db'))
+        manager = TournamentManager(store)
+        ids = []
+        for e in range(args.divisoes):
+            t = manager.create(f"Divisão {e + 1}")
+            manager.apply(t.id, Tournament.add_teams, [f"D{e} Time {i}" for i in range(args.times)])
+            manager.apply(t.id, Tournament.start)
+            ids.append(t.id)
+
+        idle = []
+        for tid in ids * 5:
+            start = time.perf_counter()
+            rerun(manager, tid)
+            idle.append((time.perf_counter() - start) * 1000)
+
+        counters = {'ok': 0, 'conflitos': 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+        latencies = []
+        viewers = [threading.Thread(target=viewer, args=(manager, ids, stop, latencies, v)) for v in range(args.espectadores)]
+        operators = [threading.Thread(target=operator, args=(manager, tid, k * 1000 + e, counters, lock))
+                     for e, tid in enumerate(ids) for k in range(2)]
+        start = time.perf_counter()
+        for th in viewers + operators:
+            th.start()
+        for th in operators:
+            th.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for th in viewers:
+            th.join()
+
+        # Integridade: recarrega cada torneio do banco (o load confere o log de eventos).
+        fresh = TournamentManager(store)
+        broken = 0
+        for tid in ids:
+            live, saved = manager.get(tid), fresh.get(tid)
+            if (saved.phase, saved.champion, saved.revision) != (live.phase, live.champion, live.revision):
+                broken += 1
+        store.close()
+
+    print(f"{args.divisoes} torneios x {args.times} times, {args.espectadores} espectadores, 2 operadores por torneio")
+    print(f"  torneios jogados até o fim em {elapsed:.1f} s: {counters['ok']} rodadas gravadas, "
+          f"{counters['conflitos']} envios recusados por conflito, {broken} torneios divergentes")
+    print(f"  rerun ocioso      p50 {statistics.median(idle):6.2f} ms   p95 {percentile(idle, 0.95):6.2f} ms")
+    print(f"  rerun sob carga   p50 {statistics.median(latencies):6.2f} ms   p95 {percentile(latencies, 0.95):6.2f} ms"
+          f"   p99 {percentile(latencies, 0.99):6.2f} ms   ({len(latencies)} reruns)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# --- BENCHMARK: EMPARCEIRAMENTO RÁPIDO x ÓTIMO ---
+# Simula a fase suíça completa (resultados aleatórios) com os dois modos e
+# compara tempo por rodada, revanches e flutuações.
+#
+#   python benchmarks/bench_pairing.py --tamanhos 16 64 128 256 --sementes 3
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from torneio import SwissMatch, SwissRound, TeamRegistry
+from torneio.pairing import choose_bye, optimal_pairing, pair_round, pairing_stats
+
+
+def simulate(n, mode, seed):
+    rng = random.Random(seed)
+    registry = TeamRegistry()
+    registry.add_many([f"Time {i}" for i in range(n)])
+    last_round = None
+    times = []
+    totals = {'rematches': 0, 'floats': 0, 'rounds': 0}
+
+    while True:
+        active = [t for t in registry if t.status == 'Ativo']
+        if len(active) <= 1:
+            break
+
+        start = time.perf_counter()
+        if mode == 'optimal':
+            pairs, bye = optimal_pairing(active, last_round, rng)
+        else:
+            bye = choose_bye(active, last_round, rng) if len(active) % 2 else None
+            pool = [t for t in active if t is not bye]
+            pairs = pair_round(pool, rng)
+        times.append(time.perf_counter() - start)
+
+        if bye:
+            active.remove(bye)
+            bye.wins += 1
+            bye.received_bye = True
+        stats = pairing_stats(active, pairs)
+        totals['rematches'] += stats['rematches']
+        totals['floats'] += stats['floats']
+        totals['rounds'] += 1
+
+        matches = []
+        for h, a in pairs:
+            home, away = registry.get(h), registry.get(a)
+            home.history.add(a)
+            away.history.add(h)
+            winner, loser = (home, away) if rng.random() < 0.5 else (away, home)
+            winner.wins += 1
+            loser.losses += 1
+            matches.append(SwissMatch(h, a, winner_id=winner.id))
+        last_round = SwissRound(matches, bye.id if bye else None, True)
+
+        for t in registry:
+            if t.wins >= 3:
+                t.status = 'Classificado'
+            elif t.losses >= 3:
+                t.status = 'Eliminado'
+
+    totals['mean_round_s'] = sum(times) / len(times)
+    totals['max_round_s'] = max(times)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[16, 64, 128, 256])
+    parser.add_argument('--sementes', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'times':>6} {'modo':>8} {'média/rod (ms)':>15} {'pior rod (ms)':>14} {'revanches':>10} {'flutuações':>11}")
+    for n in args.tamanhos:
+        for mode in ('greedy', 'optimal'):
+            runs = [simulate(n, mode, seed) for seed in range(args.sementes)]
+            mean = sum(r['mean_round_s'] for r in runs) / len(runs) * 1000
+            worst = max(r['max_round_s'] for r in runs) * 1000
+            rematches = sum(r['rematches'] for r in runs)
+            floats = sum(r['floats'] for r in runs)
+            print(f"{n:>6} {mode:>8} {mean:>15.2f} {worst:>14.2f} {rematches:>10} {floats:>11}")
+
+
+if __name__ == '__main__':
+    main()
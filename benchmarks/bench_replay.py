@@ -0,0 +1,68 @@
+# --- BENCHMARK: REPLAYS EM PARALELO ---
+# Vazão (replays/s) do runner com 1, 2, 4, ... até N processos, a partir de
+# um torneio com rodadas já jogadas, rejogado desde a rodada 1 (--do-inicio
+# do CLI). Os agregados são conferidos contra 1 processo, e a variedade dos
+# confrontos da rodada 1 mostra que os replays não repetem o torneio salvo.
+#
+#   python benchmarks/bench_replay.py --times 64 --replays 2000 --processos 8
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tournament import random_scores  # noqa: E402
+from torneio.export import tournament_to_dict  # noqa: E402
+from torneio.replay import run_replays  # noqa: E402
+from torneio.tournament import Tournament  # noqa: E402
+
+
+def worker_counts(limit):
+    n = 1
+    while n < limit:
+        yield n
+        n *= 2
+    yield limit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--times', type=int, default=64)
+    parser.add_argument('--replays', type=int, default=2000)
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--jogadas', type=int, default=2, help="rodadas suíças já jogadas no torneio salvo")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    tournament = Tournament(rng=random.Random(0))
+    tournament.add_teams([f"Time {i}" for i in range(args.times)])
+    tournament.start()
+    for _ in range(args.jogadas):
+        if tournament.phase == 'swiss':
+            tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    data = tournament_to_dict(tournament.teams, tournament.rounds, tournament.playoff_schedule, tournament.phase,
+                              playoff_size=tournament.playoff_size, pairing_mode=tournament.pairing_mode)
+    strengths = {t.id: i / args.times for i, t in enumerate(tournament.teams)}
+    first_round = {(min(m.home, m.away), max(m.home, m.away)) for m in tournament.rounds[0].matches}
+
+    print(f"{args.replays} replays de {args.times} times desde a rodada 1, salvo após {args.jogadas} rodadas "
+          f"({os.cpu_count()} núcleos disponíveis)")
+    baseline = None
+    for workers in worker_counts(args.processos):
+        start = time.perf_counter()
+        stats = run_replays(data, args.replays, workers, seed=0, strengths=strengths, from_start=True)
+        elapsed = time.perf_counter() - start
+        rate = stats.replays / elapsed
+        if baseline is None:
+            baseline, reference = rate, stats.champions
+        same = "ok" if stats.champions == reference else "DIVERGENTE"
+        print(f"  {workers:>3} processos  {rate:10,.0f} replays/s   speedup {rate / baseline:5.2f}x   agregados {same}")
+    kept = sum(n for pair, n in stats.pairings.items() if pair in first_round) / (stats.replays * len(first_round))
+    print(f"  confrontos da rodada 1 salva repetidos nos replays: {kept:.1%} (todos os jogos suíços contados)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# --- BENCHMARK: SIMULAÇÃO MONTE CARLO ---
+# Tempo para simular N torneios completos (antes da primeira rodada), com
+# forças crescentes por time.
+#
+#   python benchmarks/bench_simulation.py --times 16 --simulacoes 100000
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from torneio.simulation import simulate
+from torneio.tournament import Tournament
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--times', type=int, default=16)
+    parser.add_argument('--simulacoes', type=int, default=100000)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    tournament = Tournament()
+    tournament.add_teams([f"Time {i}" for i in range(args.times)])
+    strengths = {t.id: i / args.times for i, t in enumerate(tournament.teams)}
+
+    start = time.perf_counter()
+    odds = simulate(tournament, strengths, args.simulacoes, seed=args.semente)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.simulacoes} torneios de {args.times} times: {elapsed:.2f} s ({args.simulacoes / elapsed:,.0f} torneios/s)")
+    best = max(odds.items(), key=lambda kv: kv[1].champion)
+    print(f"favorito: {tournament.teams.name_of(best[0])} ({best[1].champion:.1%} de título)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# --- BENCHMARK: SUBIDA DO APP ---
+# Quanto cada processo novo do Streamlit paga só para importar os módulos do
+# topo de app.py, medido num interpretador limpo por amostra (tempo de
+# importação e pico de memória). "antes" soma o que o app carregava de saída
+# até esta versão: pandas para gerar os CSVs, NumPy (simulação) e http.server
+# (métricas). Módulos não instalados são pulados e listados.
+#
+#   python benchmarks/bench_startup.py --amostras 7
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEGACY_IMPORTS = ['pandas', 'torneio.simulation', 'http.server']
+
+CHILD = """
+import importlib, json, resource, sys, time
+missing = []
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        missing.append(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({'segundos': elapsed, 'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'faltando': missing}))
+"""
+
+
+def app_imports():
+    """Módulos importados no nível de topo de app.py, na ordem do arquivo."""
+    with open(os.path.join(ROOT, 'app.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def measure(modules, samples):
+    runs = []
+    for _ in range(samples):
+        out = subprocess.run([sys.executable, '-c', CHILD, *modules], capture_output=True, text=True, cwd=ROOT, check=True)
+        runs.append(json.loads(out.stdout))
+    return {
+        'mediana_ms': statistics.median(r['segundos'] for r in runs) * 1000,
+        'rss_mb': statistics.median(r['rss_kb'] for r in runs) / 1024,
+        'faltando': runs[0]['faltando'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--amostras', type=int, default=7)
+    parser.add_argument('--sem-streamlit', action='store_true', help="mede só o que o app importa além do Streamlit")
+    args = parser.parse_args()
+
+    modules = app_imports()
+    if args.sem_streamlit:
+        modules = [m for m in modules if m != 'streamlit']
+    scenarios = [
+        ("antes (pandas/numpy no topo)", modules + [m for m in LEGACY_IMPORTS if m not in modules]),
+        ("agora", modules),
+    ]
+    print(f"{args.amostras} amostras por cenário, um interpretador novo por amostra")
+    results = {}
+    for label, mods in scenarios:
+        r = results[label] = measure(mods, args.amostras)
+        skipped = f"   (não instalados: {', '.join(r['faltando'])})" if r['faltando'] else ""
+        print(f"  {label:<30} {r['mediana_ms']:8.1f} ms   pico {r['rss_mb']:6.1f} MB{skipped}")
+    before, now = (results[label] for label, _ in scenarios)
+    print(f"  economia por processo: {before['mediana_ms'] - now['mediana_ms']:.1f} ms, "
+          f"{before['rss_mb'] - now['rss_mb']:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
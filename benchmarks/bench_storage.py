@@ -0,0 +1,107 @@
+# --- BENCHMARK: ARMAZENAMENTO SQLITE ---
+# Latência de gravação (estado + log de resultados) e de leitura para um
+# torneio sintético. O torneio é jogado pelo próprio motor e cada rodada é
+# gravada com a entrada de log dela, como o gerenciador faz: o que é
+# carregado passa pela mesma conferência do log que o app usa. A gravação
+# completa (todas as linhas) é comparada com as incrementais do dia a dia:
+# nada mudou, um time inscrito, uma rodada confirmada.
+#
+#   python benchmarks/bench_storage.py --times 5000 --repeticoes 5
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tournament import random_scores  # noqa: E402
+from torneio.storage import TournamentStore  # noqa: E402
+from torneio.tournament import Tournament  # noqa: E402
+
+
+def build_tournament(store, tournament_id, n, rounds, seed=0):
+    """Joga `rounds` rodadas suíças gravando cada uma com seu log. Retorna o torneio e a última entrada."""
+    rng = random.Random(seed)
+    tournament = Tournament(tournament_id, rng=random.Random(seed))
+    tournament.add_teams([f"Time {i}" for i in range(n)])
+    tournament.start()
+    store.save(tournament_id, tournament.state())
+    result = None
+    for _ in range(rounds):
+        if tournament.phase != 'swiss':
+            break
+        result = tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+        store.save(tournament_id, tournament.state(), result)
+    return tournament, result
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--times', type=int, default=5000)
+    parser.add_argument('--rodadas', type=int, default=3)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+    if args.rodadas < 1:
+        parser.error("é preciso jogar ao menos uma rodada")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TournamentStore(os.path.join(tmp, 'bench.db'))
+        tournament, last = build_tournament(store, 'bench', args.times, args.rodadas)
+        rng = random.Random(1)
+
+        registration = Tournament('bench-inscricao')
+        registration.add_teams([f"Time {i}" for i in range(args.times)])
+        store.save(registration.id, registration.state())
+        added = iter(range(args.times, 2 * args.times))
+
+        def add_team():
+            registration.add_team(f"Time {next(added)}")
+            store.save(registration.id, registration.state())
+
+        submitted = []
+
+        def submit_round():
+            result = tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+            store.save(tournament.id, tournament.state(), result)
+            submitted.append(result)
+
+        def undo_round():
+            # Fora do tempo medido: desfaz a rodada da amostra anterior (e grava o 'undo').
+            if submitted:
+                submitted.pop()
+                store.save(tournament.id, tournament.state(), tournament.undo_last_round())
+
+        results = [
+            # Sem o que este processo gravou por último: reescreve todas as linhas.
+            ('gravação completa', lambda: store.save('bench', tournament.state()), lambda: store._written.pop('bench', None)),
+            ('salvar sem mudanças', lambda: store.save('bench', tournament.state()), None),
+            (f'inscrever 1 time ({args.times} inscritos)', add_team, None),
+            ('confirmar rodada + log', submit_round, undo_round),
+            ('carregar', lambda: store.load('bench'), None),
+            ('torneio ativo mais recente', store.latest_active, None),
+        ]
+        played = tournament.rounds[last[1]]
+        print(f"{args.times} times, {last[1] + 1} rodadas ({len(played.matches)} jogos na última)")
+        for label, fn, setup in results:
+            median, worst = timed(fn, args.repeticoes, setup)
+            print(f"  {label:<32} mediana {median:8.2f} ms   pior {worst:8.2f} ms")
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# --- BENCHMARK: TORNEIO COMPLETO SEM INTERFACE ---
+# Importa o motor, inscreve N times e joga o torneio inteiro com placares
+# aleatórios (suíço + mata-mata), sem Streamlit.
+#
+#   python benchmarks/bench_tournament.py --times 5000 --semente 1
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_start = time.perf_counter()
+from torneio.tournament import Tournament  # noqa: E402
+IMPORT_MS = (time.perf_counter() - _start) * 1000
+
+
+def random_scores(matches, rng):
+    scores = []
+    for _ in matches:
+        hg, ag = rng.randint(0, 4), rng.randint(0, 4)
+        hp = ap = None
+        if hg == ag:
+            hp, ap = rng.sample(range(6), 2)
+        scores.append((hg, ag, hp, ap))
+    return scores
+
+
+def play(n, seed=0, pairing_mode='greedy'):
+    rng = random.Random(seed)
+    tournament = Tournament(rng=random.Random(seed))
+    tournament.add_teams([f"Time {i}" for i in range(n)])
+    tournament.start(pairing_mode)
+    timings = {'suíço': 0.0, 'mata-mata': 0.0}
+    while tournament.phase == 'swiss':
+        start = time.perf_counter()
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+        timings['suíço'] += time.perf_counter() - start
+    while tournament.phase == 'playoff_gameplay':
+        start = time.perf_counter()
+        tournament.submit_playoff_results(random_scores(tournament.playoff_schedule[-1].matches, rng))
+        timings['mata-mata'] += time.perf_counter() - start
+    return tournament, timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--times', type=int, default=5000)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--modo', choices=('greedy', 'optimal'), default='greedy')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tournament, timings = play(args.times, args.semente, args.modo)
+    total = (time.perf_counter() - start) * 1000
+
+    print(f"import do motor: {IMPORT_MS:.1f} ms")
+    print(f"{args.times} times, {len(tournament.rounds)} rodadas suíças, {len(tournament.playoff_schedule)} de mata-mata")
+    for label, seconds in timings.items():
+        print(f"  {label:<10} {seconds * 1000:10.1f} ms")
+    print(f"  {'total':<10} {total:10.1f} ms")
+    print(f"campeão: {tournament.teams.name_of(tournament.champion)}")
+
+
+if __name__ == '__main__':
+    main()
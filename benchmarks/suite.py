@@ -0,0 +1,232 @@
+# --- SUÍTE DE BENCHMARKS DO MOTOR ---
+# Mede os caminhos quentes do motor em torneios sintéticos de vários tamanhos
+# e grava o resultado em JSON; com --baseline, compara com uma execução
+# anterior e marca regressões (código de saída 1), para que cada mudança de
+# desempenho venha com número.
+#
+#   python benchmarks/suite.py --saida base.json
+#   ... mudança ...
+#   python benchmarks/suite.py --baseline base.json --saida nova.json
+#
+# Casos (cada amostra parte do mesmo estado; o estado é restaurado fora do
+# tempo medido, pelo próprio motor: undo da rodada, descarte do sorteio):
+#   emparceiramento    generate_swiss_round na 2ª rodada
+#   resultados         estatísticas de uma rodada inteira (apply_round_results)
+#   rodada             submit_swiss_results completo (placares + próximo sorteio)
+#   classificacao      classificação montada do zero (Standings + ranked)
+#   mata-mata          init_playoffs + todas as rodadas até o campeão
+#   chave-128          o mesmo, com até 128 vagas (chave genérica de torneio.bracket)
+#   exportacao         CSV de classificação e de histórico
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tournament import random_scores  # noqa: E402
+from torneio.export import MATCH_COLUMNS, RANKING_COLUMNS, csv_bytes, match_rows, ranking_rows  # noqa: E402
+from torneio.standings import Standings  # noqa: E402
+from torneio.tournament import Tournament  # noqa: E402
+
+SIZES = (16, 256, 4096, 65536)
+# Acima disso, a diferença relativa é tratada como regressão...
+THRESHOLD = 0.20
+# ...desde que também passe deste piso absoluto (ruído de relógio em casos de microssegundos).
+NOISE_FLOOR_MS = 0.05
+# Casos rápidos repetem até somar este tempo medido (mais amostras, mediana estável).
+MIN_CASE_SECONDS = 0.5
+MAX_SAMPLES = 2000
+
+
+# --- ESTADOS SINTÉTICOS ---
+
+def mid_tournament(n, seed=0, playoff_size=None):
+    """Rodada 1 jogada, rodada 2 sorteada e aberta."""
+    rng = random.Random(seed)
+    tournament = Tournament(rng=random.Random(seed))
+    tournament.add_teams([f"Time {i}" for i in range(n)])
+    tournament.start(playoff_size=playoff_size)
+    tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    return tournament, rng
+
+
+def end_of_swiss(n, seed=0, playoff_size=None):
+    """Fase suíça encerrada, mata-mata montado e ainda sem resultados."""
+    tournament, rng = mid_tournament(n, seed, playoff_size)
+    while tournament.phase == 'swiss':
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    return tournament, rng
+
+
+def drop_open_round(tournament):
+    """Descarta a rodada suíça sorteada e ainda sem resultados (e os confrontos dela no histórico)."""
+    discarded = tournament.rounds.pop()
+    for m in discarded.matches:
+        tournament.teams.get(m.home).history.discard(m.away)
+        tournament.teams.get(m.away).history.discard(m.home)
+
+
+# --- CASOS ---
+# Cada caso: prepare(tamanho) -> estado; run(estado); reset(estado) fora do tempo.
+
+def case_pairing(n):
+    tournament, _ = mid_tournament(n)
+    drop_open_round(tournament)
+    return tournament, Tournament.generate_swiss_round, drop_open_round
+
+
+def case_results(n):
+    tournament, rng = mid_tournament(n)
+    current = tournament.rounds[-1]
+    scores = random_scores(current.matches, rng)
+    key = ('swiss', len(tournament.rounds) - 1)
+
+    def run(t):
+        t.apply_round_results(current, scores, key, bye=current.bye)
+
+    return tournament, run, lambda t: t.events.undo_round(t.teams)
+
+
+def case_round(n):
+    tournament, rng = mid_tournament(n)
+    scores = random_scores(tournament.rounds[-1].matches, rng)
+    return tournament, lambda t: t.submit_swiss_results(scores), Tournament.undo_last_round
+
+
+def case_ranking(n):
+    tournament, _ = mid_tournament(n)
+    return tournament, lambda t: Standings(t.teams).ranked(), None
+
+
+def case_playoffs(n, playoff_size=None):
+    tournament, rng = end_of_swiss(n, playoff_size=playoff_size)
+    scores = {}
+
+    def run(t):
+        t.init_playoffs()
+        while t.phase == 'playoff_gameplay':
+            idx = len(t.playoff_schedule) - 1
+            if idx not in scores:
+                scores[idx] = random_scores(t.playoff_schedule[-1].matches, rng)
+            t.submit_playoff_results(scores[idx])
+
+    def reset(t):
+        while t.events.last_round_key()[0] == 'playoff':
+            t.undo_last_round()
+
+    return tournament, run, reset
+
+
+def case_export(n):
+    tournament, _ = end_of_swiss(n)
+
+    def run(t):
+        csv_bytes(ranking_rows(t.teams), RANKING_COLUMNS)
+        csv_bytes(match_rows(t.teams, t.rounds, t.playoff_schedule), MATCH_COLUMNS)
+
+    return tournament, run, None
+
+
+CASES = {
+    'emparceiramento': case_pairing,
+    'resultados': case_results,
+    'rodada': case_round,
+    'classificacao': case_ranking,
+    'mata-mata': case_playoffs,
+    'chave-128': lambda n: case_playoffs(n, 128),
+    'exportacao': case_export,
+}
+
+
+# --- EXECUÇÃO ---
+
+def measure(case, n, repeat):
+    state, run, reset = CASES[case](n)
+    samples = []
+    while len(samples) < repeat or (sum(samples) < MIN_CASE_SECONDS * 1000 and len(samples) < MAX_SAMPLES):
+        start = time.perf_counter()
+        run(state)
+        samples.append((time.perf_counter() - start) * 1000)
+        if reset is not None:
+            reset(state)
+    return {
+        'caso': case, 'times': n, 'amostras': len(samples),
+        'min_ms': round(min(samples), 4), 'mediana_ms': round(statistics.median(samples), 4),
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(), 'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(), 'commit': commit,
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Anota base_mediana_ms/variacao em cada resultado; devolve os que pioraram além do limite."""
+    base = {(r['caso'], r['times']): r for r in baseline['resultados']}
+    regressions = []
+    for r in results:
+        old = base.get((r['caso'], r['times']))
+        if old is None:
+            continue
+        r['base_mediana_ms'] = old['mediana_ms']
+        change = (r['mediana_ms'] - old['mediana_ms']) / old['mediana_ms'] if old['mediana_ms'] else 0.0
+        r['variacao'] = round(change, 4)
+        if change > threshold and r['mediana_ms'] - old['mediana_ms'] > NOISE_FLOOR_MS:
+            regressions.append(r)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--casos', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--repeticoes', type=int, default=7, help="mínimo de amostras por caso")
+    parser.add_argument('--saida', help="arquivo JSON com os resultados")
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--limite', type=float, default=THRESHOLD, help="piora relativa tolerada (padrão 0.20)")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.tamanhos:
+        for case in args.casos:
+            # Os maiores tamanhos levam segundos por amostra: menos repetições.
+            repeat = args.repeticoes if n <= 4096 else max(3, args.repeticoes // 2)
+            results.append(measure(case, n, repeat))
+            r = results[-1]
+            print(f"  {case:<16} {n:>6} times   mediana {r['mediana_ms']:10.3f} ms   mín {r['min_ms']:10.3f} ms", flush=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.limite)
+        print(f"\ncomparado com {args.baseline} (limite +{args.limite:.0%}):")
+        for r in results:
+            if 'variacao' in r:
+                flag = "  << REGRESSÃO" if r in regressions else ""
+                print(f"  {r['caso']:<16} {r['times']:>6} times   {r['base_mediana_ms']:10.3f} -> {r['mediana_ms']:10.3f} ms"
+                      f"   {r['variacao']:+7.1%}{flag}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'ambiente': environment(), 'limite': args.limite, 'resultados': results,
+                       'regressoes': [(r['caso'], r['times']) for r in regressions]}, f, ensure_ascii=False, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
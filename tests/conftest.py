@@ -0,0 +1,49 @@
+# --- TESTES ---
+# Rodam sem Streamlit a partir da raiz do repositório:
+#   python -m pytest -q
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from torneio.tournament import Tournament  # noqa: E402
+
+
+def random_scores(matches, rng):
+    """Placares aleatórios válidos (empate sempre com pênaltis decididos)."""
+    scores = []
+    for _ in matches:
+        hg, ag = rng.randint(0, 4), rng.randint(0, 4)
+        hp = ap = None
+        if hg == ag:
+            hp, ap = rng.sample(range(6), 2)
+        scores.append((hg, ag, hp, ap))
+    return scores
+
+
+def team_stats(tournament):
+    return {t.id: (t.wins, t.losses, t.goals_for, t.goal_diff, t.received_bye, t.status) for t in tournament.teams}
+
+
+def ranking(tournament):
+    return [t.id for t in tournament.teams.standings.ranked()]
+
+
+@pytest.fixture
+def rng():
+    return random.Random(7)
+
+
+@pytest.fixture
+def make_tournament():
+    """Torneio com n times já iniciado (fase suíça, primeira rodada sorteada)."""
+    def make(n=16, seed=0, **start):
+        tournament = Tournament(rng=random.Random(seed))
+        tournament.add_teams([f"Time {i}" for i in range(n)])
+        tournament.start(**start)
+        return tournament
+    return make
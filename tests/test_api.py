@@ -0,0 +1,74 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from conftest import random_scores
+from torneio.api import create_app
+from torneio.manager import TournamentManager
+from torneio.storage import TournamentStore
+from torneio.tournament import Tournament
+
+
+def request(app, method, path, body=None):
+    """Chama o app ASGI direto; retorna (status, json)."""
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': []}
+    raw = json.dumps(body).encode() if body is not None else b''
+    response = {}
+
+    async def receive():
+        return {'type': 'http.request', 'body': raw, 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] = message.get('body', b'')
+
+    asyncio.run(app(scope, receive, send))
+    return response['status'], json.loads(response['body'] or b'null')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'torneio.db')
+
+
+def scores_body(tournament, rng):
+    placares = [{'mandante': hg, 'visitante': ag, 'penaltis_mandante': hp, 'penaltis_visitante': ap}
+                for hg, ag, hp, ap in random_scores(tournament.rounds[-1].matches, rng)]
+    return {'revisao': tournament.revision, 'placares': placares}
+
+
+def test_submit_returns_new_revision(db_path, rng):
+    manager = TournamentManager(TournamentStore(db_path))
+    tid = manager.create().id
+    manager.apply(tid, Tournament.add_teams, [f"Time {i}" for i in range(8)])
+    manager.apply(tid, Tournament.start)
+    app = create_app(manager)
+    before = manager.get(tid).revision
+    status, data = request(app, 'POST', f'/torneios/{tid}/resultados', scores_body(manager.get(tid), rng))
+    assert status == 200 and data['revisao'] > before
+    status, data = request(app, 'GET', f'/torneios/{tid}/rodada')
+    assert status == 200 and data['rodada'] == 2
+
+
+def test_corrupt_tournament_is_a_json_500(db_path, rng):
+    manager = TournamentManager(TournamentStore(db_path))
+    tid = manager.create().id
+    manager.apply(tid, Tournament.add_teams, [f"Time {i}" for i in range(8)])
+    manager.apply(tid, Tournament.start)
+    tournament = manager.get(tid)
+    manager.apply(tid, Tournament.submit_swiss_results, random_scores(tournament.rounds[-1].matches, rng))
+    body = scores_body(manager.get(tid), rng)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE teams SET wins = wins + 1 WHERE tournament_id = ?", (tid,))
+
+    # Um processo novo não consegue reconstruir o torneio a partir do log.
+    app = create_app(TournamentManager(TournamentStore(db_path)))
+    for method, path, payload in (('GET', 'classificacao', None), ('GET', 'rodada', None),
+                                  ('POST', 'resultados', body)):
+        status, data = request(app, method, f'/torneios/{tid}/{path}', payload)
+        assert status == 500, path
+        assert 'corrompido' in data['erro']
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+pytest.importorskip('streamlit')
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def sidebar_headers(app):
+    return [h.value for h in app.sidebar.header]
+
+
+def test_admin_panel_only_with_query_param(tmp_path, monkeypatch):
+    monkeypatch.setenv('TORNEIO_DB', str(tmp_path / 'app.db'))
+    app = AppTest.from_file(APP, default_timeout=30)
+    app.run()
+    assert not app.exception
+    assert "⏱️ Desempenho" not in sidebar_headers(app)
+
+    app.query_params['admin'] = '1'
+    app.run()
+    assert not app.exception
+    assert "⏱️ Desempenho" in sidebar_headers(app)
@@ -0,0 +1,68 @@
+import pytest
+
+from conftest import random_scores
+from torneio.bracket import BYE, Bracket, seed_order
+
+
+def first_round(bracket, seeds):
+    """Jogos da primeira rodada como pares de sementes (1 = melhor)."""
+    rank = {tid: i for i, tid in enumerate(seeds, 1)}
+    return sorted((rank[home], rank[away]) for _, home, away in bracket.open_matches(bracket.first_level))
+
+
+def test_seed_order_keeps_favourites_apart():
+    assert seed_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+    order = seed_order(16)
+    # Primeiro jogo soma tamanho + 1; 1 e 2 só se cruzam na final, 1-4 só nas semis.
+    assert all(a + b == 17 for a, b in zip(order[::2], order[1::2]))
+    assert {1, 2} & set(order[:8]) == {1} and {1, 2, 3, 4} & set(order[:4]) == {1}
+
+
+@pytest.mark.parametrize('n, size, matches', [
+    (5, 8, [(4, 5)]),
+    (6, 8, [(3, 6), (4, 5)]),
+    (12, 16, [(5, 12), (6, 11), (7, 10), (8, 9)]),
+])
+def test_byes_go_to_top_seeds(n, size, matches):
+    seeds = [100 + i for i in range(n)]
+    bracket = Bracket.seeded(seeds)
+    assert bracket.size == size and len(bracket.slots) == 2 * size
+    assert sorted(bracket.byes()) == seeds[:size - n]
+    assert first_round(bracket, seeds) == matches
+    # Quem folga já ocupa o nó do jogo da primeira rodada; os outros jogos seguem abertos.
+    level = bracket.first_level
+    for node in range(level, 2 * level):
+        home, away = bracket.slots[2 * node], bracket.slots[2 * node + 1]
+        assert bracket.slots[node] == (home if away == BYE else None)
+        assert home != BYE
+    assert bracket.champion is None
+    assert Bracket.from_list(bracket.to_list()).slots == bracket.slots
+
+
+def test_bracket_plays_to_a_champion():
+    seeds = list(range(1, 13))
+    bracket = Bracket.seeded(seeds)
+    level = bracket.first_level
+    while level:
+        for node, home, away in bracket.open_matches(level):
+            bracket.advance(node, min(home, away))
+        level //= 2
+    # Favorito sempre vence: a semente 1 é campeã e a 2 chega à final.
+    assert bracket.champion == 1 and {bracket.slots[2], bracket.slots[3]} == {1, 2}
+
+
+def test_undo_restores_bracket_heap(make_tournament, rng):
+    # 24 times: 12 classificados numa chave de 16, com 4 folgas.
+    tournament = make_tournament(24, playoff_size=16)
+    while tournament.phase == 'swiss':
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    assert len(tournament.bracket.byes()) == 4
+    heaps = []
+    while tournament.phase == 'playoff_gameplay':
+        heaps.append(tournament.bracket.to_list())
+        tournament.submit_playoff_results(random_scores(tournament.playoff_schedule[-1].matches, rng))
+    assert tournament.champion == tournament.bracket.champion
+    while heaps:
+        tournament.undo_last_round()
+        assert tournament.bracket.to_list() == heaps.pop()
+    assert tournament.phase == 'playoff_gameplay' and len(tournament.playoff_schedule) == 1
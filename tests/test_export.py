@@ -0,0 +1,18 @@
+from conftest import random_scores
+from torneio.export import MATCH_COLUMNS, RANKING_COLUMNS, csv_bytes, match_rows, ranking_rows
+
+
+def history(t):
+    return match_rows(t.teams, t.rounds, t.playoff_schedule)
+
+
+def test_csv_bytes_none_if_empty(make_tournament, rng):
+    tournament = make_tournament(8)
+    assert csv_bytes(history(tournament), MATCH_COLUMNS, none_if_empty=True) is None
+    assert csv_bytes(history(tournament), MATCH_COLUMNS) == (','.join(MATCH_COLUMNS) + '\n').encode()
+
+    tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    lines = csv_bytes(history(tournament), MATCH_COLUMNS, none_if_empty=True).decode().splitlines()
+    assert len(lines) == 1 + len(tournament.rounds[0].matches)
+    ranking = csv_bytes(ranking_rows(tournament.teams), RANKING_COLUMNS, none_if_empty=True).decode()
+    assert ranking.splitlines()[1].split(',')[0] == tournament.teams.standings.ranked()[0].name
@@ -0,0 +1,113 @@
+import io
+
+import pytest
+
+from torneio.export import csv_bytes, xlsx_bytes
+from torneio.importer import (SCORE_SHEET_COLUMNS, file_rows, import_teams, read_round_results, score_sheet_rows,
+                              text_rows)
+from torneio.registry import TeamRegistry
+
+
+def import_csv(text, registry=None):
+    registry = registry if registry is not None else TeamRegistry()
+    return registry, import_teams(registry, file_rows(io.BytesIO(text.encode('utf-8')), 'times.csv'))
+
+
+# --- INSCRIÇÃO ---
+
+def test_text_import_skips_blank_lines_and_reports_duplicates():
+    registry = TeamRegistry()
+    report = import_teams(registry, text_rows("A\n\nB\nA\n  C  \n"), detect_header=False)
+    assert [t.name for t in report.added] == ["A", "B", "C"]
+    assert [(e.line, e.name) for e in report.duplicates] == [(4, "A")]
+    assert sorted(registry.names()) == ["A", "B", "C"]
+
+
+def test_csv_with_header_in_any_order_and_semicolons():
+    registry, report = import_csv("Grupo;Força;Time\n1;1.500,5;Alfa\n2;;Beta\n")
+    assert report.invalid == []
+    alfa, beta = registry.by_name("Alfa"), registry.by_name("Beta")
+    assert (alfa.rating, alfa.group) == (1500.5, "1")
+    assert (beta.rating, beta.group) == (None, "2")
+
+
+def test_csv_without_header_uses_positional_columns():
+    registry, report = import_csv("Alfa,1400,Clube X\nBeta,1300\n")
+    assert len(report.added) == 2
+    assert registry.by_name("Alfa").club == "Clube X"
+
+
+def test_invalid_rows_are_reported_with_line_numbers():
+    _, report = import_csv("nome,rating\nAlfa,abc\n,1200\n" + "x" * 101 + ",1\nBeta,1\n")
+    assert [line for line, _ in report.invalid] == [2, 3, 4]
+    assert [t.name for t in report.added] == ["Beta"]
+
+
+def test_existing_team_counts_as_duplicate():
+    registry = TeamRegistry()
+    registry.add("Alfa")
+    _, report = import_csv("nome\nAlfa\nBeta\n", registry)
+    assert [e.name for e in report.duplicates] == ["Alfa"]
+    assert len(registry) == 2
+
+
+def test_xlsx_import():
+    pytest.importorskip('openpyxl')
+    data = xlsx_bytes([("Times", [{'Nome': 'Alfa', 'Rating': 1500}, {'Nome': 'Beta', 'Rating': None}], ['Nome', 'Rating'])])
+    registry = TeamRegistry()
+    report = import_teams(registry, file_rows(io.BytesIO(data), 'times.xlsx'))
+    assert [t.name for t in report.added] == ["Alfa", "Beta"]
+    assert registry.by_name("Alfa").rating == 1500
+
+
+# --- SÚMULAS ---
+
+@pytest.fixture
+def open_round(make_tournament):
+    tournament = make_tournament(8)
+    return tournament, tournament.rounds[-1].matches
+
+
+def sheet(tournament, matches, scores):
+    """Súmula a partir do modelo da rodada, com os placares preenchidos."""
+    rows = list(score_sheet_rows(tournament.teams, matches))
+    for row, (hg, ag, hp, ap) in zip(rows, scores):
+        row.update({'Gols M': hg, 'Gols V': ag, 'Pen M': '' if hp is None else hp, 'Pen V': '' if ap is None else ap})
+    return io.BytesIO(csv_bytes(rows, SCORE_SHEET_COLUMNS))
+
+
+def test_complete_score_sheet(open_round):
+    tournament, matches = open_round
+    scores = [(2, 1, None, None), (0, 0, 4, 3), (1, 3, None, None), (2, 2, 5, 6)]
+    report = read_round_results(file_rows(sheet(tournament, matches, scores), 's.csv'), tournament.teams, matches)
+    assert report.complete
+    assert report.scores == scores
+    tournament.submit_swiss_results(report.scores)
+    assert tournament.rounds[0].completed
+
+
+def test_swapped_home_and_away_are_flipped(open_round):
+    tournament, matches = open_round
+    m = matches[0]
+    text = f"mandante,gols m,gols v,visitante\n{tournament.teams.name_of(m.away)},3,1,{tournament.teams.name_of(m.home)}\n"
+    report = read_round_results(file_rows(io.BytesIO(text.encode()), 's.csv'), tournament.teams, matches)
+    assert report.scores[0] == (1, 3, None, None)
+    assert report.missing == [1, 2, 3]
+    assert not report.complete
+
+
+def test_score_sheet_problems_are_reported(open_round):
+    tournament, matches = open_round
+    name = tournament.teams.name_of
+    a, b = matches[0], matches[1]
+    text = "\n".join([
+        "mandante,gols m,gols v,visitante,pen m,pen v",
+        f"{name(a.home)},1,1,{name(a.away)},,",          # empate sem pênaltis
+        f"{name(b.home)},x,1,{name(b.away)},,",          # placar inválido
+        f"{name(a.home)},1,0,{name(b.away)},,",          # não se enfrentam
+        f"Time Fantasma,1,0,{name(b.away)},,",           # fora da rodada
+    ]) + "\n"
+    report = read_round_results(file_rows(io.BytesIO(text.encode()), 's.csv'), tournament.teams, matches)
+    assert [line for line, _ in report.invalid] == [2, 3]
+    assert [line for line, _ in report.unmatched] == [4, 5]
+    assert report.scores == [None] * 4
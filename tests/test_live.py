@@ -0,0 +1,50 @@
+from conftest import random_scores
+from torneio.live import diff_data, standings_snapshot
+
+
+def patched(order, diff):
+    """Mesma correção que o painel faz no navegador."""
+    rows = set(order) - set(diff.get('removidos', ())) | set(diff['times'])
+    order = diff.get('ordem', order)
+    if 'posicoes' in diff:
+        moved = {tid for tid, _ in diff['posicoes']}
+        new = {i: tid for i, tid in enumerate(order) if tid not in moved and tid in rows}
+        new.update((i, tid) for tid, i in diff['posicoes'])
+        assert sorted(new) == list(range(len(new)))
+        order = [new[i] for i in range(len(new))]
+    return order
+
+
+def test_diffs_rebuild_the_order(make_tournament, rng):
+    tournament = make_tournament(24, playoff_size=8)
+    old = standings_snapshot(tournament)
+    order, kinds = old[2], set()
+    while tournament.phase != 'champion':
+        if tournament.phase == 'swiss':
+            tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+        else:
+            tournament.submit_playoff_results(random_scores(tournament.playoff_schedule[-1].matches, rng))
+        new = standings_snapshot(tournament)
+        diff = diff_data(old, new)
+        kinds.update(k for k in ('ordem', 'posicoes') if k in diff)
+        order = patched(order, diff)
+        assert order == new[2]
+        old = new
+    assert kinds == {'ordem', 'posicoes'}
+
+
+def test_only_moved_teams_are_sent(make_tournament):
+    tournament = make_tournament(8)
+    revision, phase, order, rows = standings_snapshot(tournament)
+    swapped = order[:2] + [order[3], order[2]] + order[4:]
+    diff = diff_data((revision, phase, order, rows), (revision + 1, phase, swapped, rows))
+    assert diff['posicoes'] == [[order[3], 2], [order[2], 3]]
+    assert 'ordem' not in diff and diff['times'] == {}
+
+    removed = {tid: row for tid, row in rows.items() if tid != order[0]}
+    diff = diff_data((revision, phase, order, rows), (revision + 1, phase, order[1:], removed))
+    assert diff['removidos'] == [order[0]] and 'ordem' in diff
+    assert patched(order, diff) == order[1:]
+    removed = {tid: row for tid, row in rows.items() if tid != order[-1]}
+    diff = diff_data((revision, phase, order, rows), (revision + 1, phase, order[:-1], removed))
+    assert diff['posicoes'] == [] and patched(order, diff) == order[:-1]
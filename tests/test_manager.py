@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from torneio.manager import TournamentManager
+from torneio.storage import TournamentStore
+from torneio.tournament import Tournament
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TournamentStore(str(tmp_path / 'torneio.db'))
+    yield store
+    store.close()
+
+
+def test_least_recently_used_tournaments_leave_memory(store):
+    manager = TournamentManager(store, max_loaded=3)
+    ids = [manager.create(f"Divisão {i}").id for i in range(3)]
+    manager.get(ids[0])
+    newest = manager.create("Divisão 3").id
+    # A divisão 1 era a usada há mais tempo.
+    assert list(manager._tournaments) == [ids[2], ids[0], newest]
+
+    manager.apply(ids[1], Tournament.add_team, "Time A")
+    assert len(manager) == 3
+    assert ids[2] not in manager._tournaments
+    assert manager.get(ids[1]).teams.names() == ["Time A"]
+
+
+def test_busy_tournament_is_not_evicted(store):
+    manager = TournamentManager(store, max_loaded=1)
+    busy = manager.create().id
+    holding, release = threading.Event(), threading.Event()
+
+    def operator():
+        with manager.lock(busy):
+            holding.set()
+            release.wait()
+
+    thread = threading.Thread(target=operator)
+    thread.start()
+    holding.wait()
+    other = manager.create().id
+    assert set(manager._tournaments) == {busy, other}
+    release.set()
+    thread.join()
+    manager.get(busy)
+    assert list(manager._tournaments) == [busy]
+
+
+def test_only_current_revision_views_are_kept(store):
+    manager = TournamentManager(store)
+    tid = manager.create().id
+    builds = []
+
+    def build(t):
+        builds.append(t.revision)
+        return len(t.teams)
+
+    assert manager.view(tid, 'a', build) == 0
+    assert manager.view(tid, ('odds', 100), build) == 0
+    assert manager.view(tid, 'a', build) == 0
+    manager.apply(tid, Tournament.add_team, "Time A")
+    assert manager.view(tid, 'a', build) == 1
+    revision, views = manager._views[tid]
+    assert revision == manager.get(tid).revision
+    assert list(views) == ['a']
+    assert len(builds) == 3
+    assert manager.peek(tid, 'a') == 1
+    assert manager.peek(tid, ('odds', 100)) is None
+
+
+def test_evict_reloads_from_store(store):
+    manager = TournamentManager(store)
+    tid = manager.create("Sub-15").id
+    manager.apply(tid, Tournament.add_teams, ["A", "B"])
+    manager.view(tid, 'a', lambda t: 1)
+    manager.evict(tid)
+    assert len(manager) == 0 and tid not in manager._views
+    reloaded = manager.get(tid)
+    assert (reloaded.name, sorted(reloaded.teams.names())) == ("Sub-15", ["A", "B"])
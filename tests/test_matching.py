@@ -0,0 +1,57 @@
+import itertools
+import random
+
+import pytest
+
+from torneio.matching import max_weight_matching
+
+
+def brute_force(n, edges, maxcardinality):
+    """Melhor (cardinalidade, peso) por força bruta sobre todos os subconjuntos de arestas."""
+    best = (0, 0) if maxcardinality else 0
+    for k in range(n // 2 + 1):
+        for chosen in itertools.combinations(edges, k):
+            vertices = [v for i, j, _ in chosen for v in (i, j)]
+            if len(vertices) != len(set(vertices)):
+                continue
+            weight = sum(w for _, _, w in chosen)
+            value = (k, weight) if maxcardinality else weight
+            best = max(best, value)
+    return best
+
+
+def matched_value(mate, edges, maxcardinality):
+    weights = {(min(i, j), max(i, j)): w for i, j, w in edges}
+    pairs = [(i, j) for i, j in enumerate(mate) if j != -1 and i < j]
+    weight = sum(weights[pair] for pair in pairs)
+    return (len(pairs), weight) if maxcardinality else weight
+
+
+def test_empty_graph():
+    assert max_weight_matching([]) == []
+
+
+def test_single_edge():
+    assert max_weight_matching([(0, 1, 5)]) == [1, 0]
+
+
+def test_mate_is_symmetric_and_uses_existing_edges():
+    edges = [(0, 1, 3), (1, 2, 4), (2, 3, 3), (3, 0, 1)]
+    mate = max_weight_matching(edges)
+    existing = {(min(i, j), max(i, j)) for i, j, _ in edges}
+    for i, j in enumerate(mate):
+        if j != -1:
+            assert mate[j] == i
+            assert (min(i, j), max(i, j)) in existing
+
+
+@pytest.mark.parametrize('maxcardinality', [False, True])
+@pytest.mark.parametrize('seed', range(30))
+def test_matches_brute_force(seed, maxcardinality):
+    rng = random.Random(seed)
+    n = rng.randint(2, 8)
+    edges = [(i, j, rng.randint(1, 20)) for i in range(n) for j in range(i + 1, n) if rng.random() < 0.6]
+    if not edges:
+        return
+    mate = max_weight_matching(edges, maxcardinality=maxcardinality)
+    assert matched_value(mate, edges, maxcardinality) == brute_force(n, edges, maxcardinality)
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from torneio import pairing
+from torneio.models import SwissMatch, SwissRound
+from torneio.pairing import choose_bye, greedy_pairing, optimal_pairing, pair_round, pairing_stats
+from torneio.registry import TeamRegistry
+
+
+def registry_of(n):
+    registry = TeamRegistry()
+    registry.add_many([f"Time {i}" for i in range(n)])
+    return registry
+
+
+def play_random(registry, pairs, rng):
+    """Aplica resultados aleatórios só no que o emparceiramento olha (campanha e histórico)."""
+    matches = []
+    for h, a in pairs:
+        home, away = registry.get(h), registry.get(a)
+        home.history.add(a)
+        away.history.add(h)
+        winner, loser = (home, away) if rng.random() < 0.5 else (away, home)
+        winner.wins += 1
+        loser.losses += 1
+        matches.append(SwissMatch(h, a, winner_id=winner.id))
+    return SwissRound(matches, None, True)
+
+
+def assert_perfect(teams, pairs, bye=None):
+    seen = [team_id for pair in pairs for team_id in pair]
+    assert len(seen) == len(set(seen))
+    expected = {t.id for t in teams} - ({bye.id} if bye else set())
+    assert set(seen) == expected
+
+
+@pytest.mark.parametrize('mode', ['greedy', 'optimal'])
+@pytest.mark.parametrize('n', [6, 7, 16, 33])
+def test_every_team_plays_once_per_round(mode, n):
+    rng = random.Random(n)
+    registry = registry_of(n)
+    last_round = None
+    for _ in range(3):
+        teams = list(registry)
+        if mode == 'optimal':
+            pairs, bye = optimal_pairing(teams, last_round, rng)
+        else:
+            pairs, bye = greedy_pairing(teams, last_round, rng)
+        assert (bye is not None) == (n % 2 == 1)
+        assert_perfect(teams, pairs, bye)
+        last_round = play_random(registry, pairs, rng)
+
+
+@pytest.mark.parametrize('mode', ['greedy', 'optimal'])
+def test_no_rematches_while_avoidable(mode):
+    rng = random.Random(3)
+    registry = registry_of(32)
+    last_round = None
+    for _ in range(4):
+        teams = list(registry)
+        if mode == 'optimal':
+            pairs, _ = optimal_pairing(teams, last_round, rng)
+        else:
+            pairs = pair_round(teams, rng)
+        assert pairing_stats(teams, pairs)['rematches'] == 0
+        last_round = play_random(registry, pairs, rng)
+
+
+def test_pairs_within_score_group_when_possible():
+    rng = random.Random(1)
+    registry = registry_of(16)
+    play_random(registry, pair_round(list(registry), rng), rng)
+    pairs = pair_round(list(registry), rng)
+    assert pairing_stats(list(registry), pairs)['floats'] == 0
+
+
+def test_bye_goes_to_a_last_round_loser_without_bye():
+    rng = random.Random(5)
+    registry = registry_of(7)
+    teams = list(registry)
+    pairs, bye = greedy_pairing(teams, None, rng)
+    bye.received_bye = True
+    bye.wins += 1
+    last_round = play_random(registry, pairs, rng)
+    losers = {m.loser_id for m in last_round.matches}
+    for _ in range(20):
+        chosen = choose_bye(list(registry), last_round, rng)
+        assert chosen.id in losers
+        assert not chosen.received_bye
+
+
+def test_optimal_falls_back_to_greedy_above_limit(monkeypatch):
+    monkeypatch.setattr(pairing, 'MAX_OPTIMAL_TEAMS', 8)
+    teams = list(registry_of(9))
+    assert optimal_pairing(teams, None, random.Random(0)) == greedy_pairing(teams, None, random.Random(0))
@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import random_scores
+from torneio.export import tournament_to_dict
+from torneio.replay import registration_state, replay_once, run_replays
+
+
+@pytest.fixture
+def finished(make_tournament, rng):
+    tournament = make_tournament(12, playoff_size=8, tiebreaks=('buchholz',))
+    tournament.teams.by_name("Time 0").rating = 1800.0
+    while tournament.phase == 'swiss':
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    while tournament.phase == 'playoff_gameplay':
+        tournament.submit_playoff_results(random_scores(tournament.playoff_schedule[-1].matches, rng))
+    return tournament
+
+
+def saved(t):
+    return tournament_to_dict(t.teams, t.rounds, t.playoff_schedule, t.phase, t.champion, t.vice, t.third,
+                              t.playoff_size, t.bracket, t.tiebreaks, t.name, t.pairing_mode)
+
+
+def first_round(tournament):
+    return {frozenset((m.home, m.away)) for m in tournament.rounds[0].matches}
+
+
+def test_registration_state_keeps_teams_and_settings(finished):
+    state = registration_state(saved(finished))
+    assert state['phase'] == 'registration' and state['rounds'] == [] and state['playoff_schedule'] == []
+    assert (state['playoff_size'], state['tiebreaks']) == (8, ('buchholz',))
+    teams = {t.id: t for t in state['teams']}
+    assert {tid: t.name for tid, t in teams.items()} == {t.id: t.name for t in finished.teams}
+    assert all(t.wins == t.losses == 0 and not t.history and t.status == 'Ativo' for t in teams.values())
+    assert state['teams'].by_name("Time 0").rating == 1800.0
+
+
+def test_finished_tournament_replays_only_from_start(finished):
+    data = saved(finished)
+    forward = {replay_once(data, seed)[0].champion for seed in range(5)}
+    assert forward == {finished.champion}
+
+    replays = [replay_once(data, seed, from_start=True) for seed in range(20)]
+    assert all(t.phase == 'champion' for t, _ in replays)
+    assert len({t.champion for t, _ in replays}) > 1
+    assert any(first_round(t) != first_round(finished) for t, _ in replays)
+    assert len({tuple(seeds) for _, seeds in replays}) > 1
+
+
+def test_from_start_aggregates_do_not_depend_on_workers(finished):
+    data = saved(finished)
+    one = run_replays(data, 12, workers=1, from_start=True)
+    two = run_replays(data, 12, workers=2, from_start=True)
+    assert one.replays == two.replays == 12
+    assert (one.champions, one.seeds, one.pairings) == (two.champions, two.seeds, two.pairings)
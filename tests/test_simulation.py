@@ -0,0 +1,89 @@
+import random
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import random_scores  # noqa: E402
+from torneio.export import tournament_to_dict  # noqa: E402
+from torneio.replay import replay_once  # noqa: E402
+from torneio.simulation import _Batch, _played_table, simulate  # noqa: E402
+from torneio.tiebreaks import TIEBREAKS  # noqa: E402
+from torneio.tournament import Tournament  # noqa: E402
+
+# Com 2000 replays pelo motor o ruído de amostragem fica abaixo de ~3 pontos por time;
+# sem evitar revanches nem usar os desempates, a simulação errava 7-10 pontos nestes casos.
+ENGINE_REPLAYS = 2000
+TOLERANCE = 0.04
+
+
+def started(n, seed, tiebreaks=()):
+    tournament = Tournament(rng=random.Random(seed))
+    tournament.add_teams([f"Time {i}" for i in range(n)])
+    tournament.start(tiebreaks=tiebreaks)
+    return tournament
+
+
+def mid_event(n, played, seed, tiebreaks=()):
+    rng = random.Random(seed)
+    tournament = started(n, seed, tiebreaks)
+    for _ in range(played):
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    assert tournament.phase == 'swiss'
+    return tournament
+
+
+def swiss_table(tournament):
+    """Times na ordem do registro e a tabela de adversários das rodadas suíças jogadas."""
+    teams = list(tournament.teams)
+    index = {t.id: i for i, t in enumerate(teams)}
+    return teams, _played_table(len(teams), [(index[m.home], index[m.away], m.winner_id == m.home)
+                                             for r in tournament.rounds for m in r.matches])
+
+
+def engine_odds(tournament, strengths, replays):
+    data = tournament_to_dict(tournament.teams, tournament.rounds, tournament.playoff_schedule, tournament.phase,
+                              playoff_size=tournament.playoff_size, tiebreaks=tournament.tiebreaks)
+    playoffs, champions = Counter(), Counter()
+    for i in range(replays):
+        replayed, seeds = replay_once(data, f"teste:{i}", strengths)
+        playoffs.update(seeds)
+        champions[replayed.champion] += 1
+    return {tid: (playoffs[tid] / replays, champions[tid] / replays) for tid in strengths}
+
+
+@pytest.mark.parametrize('n, played, seed, spread, tiebreaks', [
+    (8, 2, 0, 1.5, ()),
+    (10, 3, 4, 2.0, ('sonneborn_berger',)),
+])
+def test_simulated_odds_match_engine_replays(n, played, seed, spread, tiebreaks):
+    tournament = mid_event(n, played, seed, tiebreaks)
+    strengths = {t.id: spread * (i / (n - 1) - 0.5) for i, t in enumerate(tournament.teams)}
+    expected = engine_odds(tournament, strengths, ENGINE_REPLAYS)
+    odds = simulate(tournament, strengths, n_sims=20000, seed=1)
+    for tid, (playoffs, champion) in expected.items():
+        assert odds[tid].playoffs == pytest.approx(playoffs, abs=TOLERANCE)
+        assert odds[tid].champion == pytest.approx(champion, abs=TOLERANCE)
+
+
+def test_tiebreak_values_match_opponent_index(rng):
+    tournament = started(14, 3, tuple(TIEBREAKS))
+    while tournament.phase == 'swiss':
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    teams, played = swiss_table(tournament)
+    batch = _Batch(teams, 2, {}, 1.3, np.random.default_rng(0), played)
+    values = batch.tiebreak_values()
+    for name in TIEBREAKS:
+        assert values[name][1].tolist() == [tournament.opponents.value(t.id, name) for t in teams], name
+
+
+def test_seeds_follow_configured_tiebreaks(rng):
+    tournament = started(14, 3, ('buchholz', 'sonneborn_berger'))
+    while tournament.phase == 'swiss':
+        tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    teams, played = swiss_table(tournament)
+    batch = _Batch(teams, 1, {}, 1.3, np.random.default_rng(0), played)
+    seeds, count = batch.seeds(tournament.playoff_size, tournament.tiebreaks)
+    expected = [t.id for t in tournament.teams.standings.ranked() if t.status == 'Classificado'][:tournament.playoff_size]
+    assert [teams[i].id for i in seeds[0, :count[0]]] == expected
@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from conftest import random_scores, ranking, team_stats
+from torneio import storage
+from torneio.manager import TournamentManager
+from torneio.storage import CorruptTournamentError, TournamentStore
+from torneio.tournament import Tournament
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'torneio.db')
+
+
+@pytest.fixture
+def store(db_path):
+    store = TournamentStore(db_path)
+    yield store
+    store.close()
+
+
+def assert_same(saved, tournament):
+    loaded = Tournament.from_saved(tournament.id, saved)
+    assert team_stats(loaded) == team_stats(tournament)
+    assert ranking(loaded) == ranking(tournament)
+    assert {t.id: t.history for t in loaded.teams} == {t.id: t.history for t in tournament.teams}
+    assert [r.to_dict() for r in loaded.rounds] == [r.to_dict() for r in tournament.rounds]
+    assert [r.to_dict() for r in loaded.playoff_schedule] == [r.to_dict() for r in tournament.playoff_schedule]
+    for key in ('name', 'phase', 'pairing_mode', 'champion', 'vice', 'third', 'revision', 'playoff_size', 'tiebreaks'):
+        assert getattr(loaded, key) == getattr(tournament, key), key
+    assert (loaded.bracket and loaded.bracket.to_list()) == (tournament.bracket and tournament.bracket.to_list())
+    return loaded
+
+
+def play_action(manager, tournament_id, rng, step):
+    tournament = manager.get(tournament_id)
+    if step % 4 == 3:
+        manager.apply(tournament_id, Tournament.undo_last_round)
+    elif tournament.phase == 'swiss':
+        manager.apply(tournament_id, Tournament.submit_swiss_results, random_scores(tournament.rounds[-1].matches, rng))
+    else:
+        manager.apply(tournament_id, Tournament.submit_playoff_results, random_scores(tournament.playoff_schedule[-1].matches, rng))
+
+
+def test_registration_round_trip(store):
+    tournament = Tournament(name="Sub-15")
+    tournament.import_teams([["nome", "rating", "clube", "grupo"], ["A", "1500", "Clube A", "1"], ["B", "", "", ""]])
+    tournament.add_team("C")
+    store.save(tournament.id, tournament.state())
+    loaded = assert_same(store.load(tournament.id), tournament)
+    a = loaded.teams.by_name("A")
+    assert (a.rating, a.club, a.group) == (1500.0, "Clube A", "1")
+    assert store.load('não existe') is None
+
+
+def test_every_action_survives_reload(db_path, store, rng):
+    manager = TournamentManager(store)
+    tid = manager.create("Divisão").id
+    manager.apply(tid, Tournament.add_teams, [f"Time {i}" for i in range(40)])
+    manager.apply(tid, Tournament.remove_team, "Time 3")
+    manager.apply(tid, Tournament.start, None, 16, ('buchholz',))
+    step = 0
+    while manager.get(tid).phase != 'champion':
+        play_action(manager, tid, rng, step)
+        # Um processo novo lendo o mesmo banco vê exatamente o estado em memória.
+        other = TournamentStore(db_path)
+        assert_same(other.load(tid), manager.get(tid))
+        other.close()
+        step += 1
+
+
+def test_two_stores_writing_the_same_database(db_path, store, rng):
+    other = TournamentStore(db_path)
+    first, second = TournamentManager(store), TournamentManager(other)
+    tid = first.create().id
+    first.apply(tid, Tournament.add_teams, [f"Time {i}" for i in range(24)])
+    first.apply(tid, Tournament.start)
+    for step in range(8):
+        manager = second if step % 2 else first
+        # Força a conferência da revisão gravada pelo outro processo.
+        manager._checked.clear()
+        play_action(manager, tid, rng, step)
+    first._checked.clear()
+    fresh = TournamentStore(db_path)
+    assert_same(fresh.load(tid), first.get(tid))
+    fresh.close()
+    other.close()
+
+
+def test_load_starts_from_persisted_snapshot(store, make_tournament, rng):
+    tournament = make_tournament(32)
+    tournament.events.snapshot_every = 8
+    store.save(tournament.id, tournament.state())
+    for _ in range(2):
+        result = tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+        store.save(tournament.id, tournament.state(), result)
+    saved = store.load(tournament.id)
+    assert saved['events'].persisted is not None
+    assert saved['events'].persisted[0] == len(tournament.events.events)
+    assert_same(saved, tournament)
+
+
+def test_load_reads_only_log_rows_after_snapshot(store, make_tournament, rng, monkeypatch):
+    tournament = make_tournament(32)
+    tournament.events.snapshot_every = 40
+    store.save(tournament.id, tournament.state())
+    for _ in range(3):
+        result = tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+        store.save(tournament.id, tournament.state(), result)
+    replay_log = storage._replay_log
+    read = []
+    monkeypatch.setattr(storage, '_replay_log', lambda rows, events: read.append(len(rows)) or replay_log(rows, events))
+    # A fotografia (64 eventos) cobre as duas primeiras rodadas: só a terceira é lida.
+    saved = store.load(tournament.id)
+    assert saved['events'].persisted[0] == 64 and read == [1]
+    loaded = assert_same(saved, tournament)
+
+    # Desfazer até antes da fotografia lê as linhas puladas.
+    for _ in range(3):
+        loaded.undo_last_round()
+        tournament.undo_last_round()
+        assert team_stats(loaded) == team_stats(tournament)
+        assert ranking(loaded) == ranking(tournament)
+    assert read == [1, 2]
+    assert loaded.events.events == tournament.events.events == []
+
+
+def test_rounds_are_stored_without_escapes(db_path, store, make_tournament, rng):
+    tournament = make_tournament(6)
+    store.save(tournament.id, tournament.state())
+    while tournament.phase == 'swiss':
+        result = tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+        store.save(tournament.id, tournament.state(), result)
+    with sqlite3.connect(db_path) as conn:
+        rows = dict(((k, i), d) for k, i, d in conn.execute("SELECT kind, idx, data FROM rounds WHERE tournament_id = ?",
+                                                            (tournament.id,)))
+    assert rows and all('\\u' not in data for data in rows.values())
+    # Nomes das rodadas do mata-mata (ex.: "Semifinal Única") gravados como estão.
+    assert tournament.playoff_schedule[0].name in rows[('playoff', 0)]
+    assert_same(store.load(tournament.id), tournament)
+
+
+def test_inconsistent_log_raises_storage_error(db_path, store, make_tournament, rng):
+    tournament = make_tournament(16)
+    result = tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    store.save(tournament.id, tournament.state(), result)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE teams SET wins = wins + 1 WHERE tournament_id = ?", (tournament.id,))
+    with pytest.raises(CorruptTournamentError):
+        store.load(tournament.id)
+
+
+def test_bench_storage_runs():
+    out = subprocess.run([sys.executable, os.path.join(ROOT, 'benchmarks', 'bench_storage.py'),
+                          '--times', '64', '--rodadas', '2', '--repeticoes', '1'],
+                         capture_output=True, text=True, cwd=ROOT)
+    assert out.returncode == 0, out.stderr
@@ -0,0 +1,206 @@
+import random
+from collections import Counter
+
+import pytest
+
+from conftest import random_scores, ranking, team_stats
+from torneio.tiebreaks import TIEBREAK_FIELDS, OpponentIndex
+from torneio.tournament import Tournament, TournamentError
+
+
+def submit_current(tournament, rng):
+    if tournament.phase == 'swiss':
+        return tournament.submit_swiss_results(random_scores(tournament.rounds[-1].matches, rng))
+    return tournament.submit_playoff_results(random_scores(tournament.playoff_schedule[-1].matches, rng))
+
+
+def play_to_end(tournament, rng):
+    while tournament.phase in ('swiss', 'playoff_gameplay'):
+        submit_current(tournament, rng)
+
+
+# --- INSCRIÇÃO ---
+
+def test_start_needs_minimum_teams():
+    tournament = Tournament()
+    tournament.add_teams(["A", "B", "C"])
+    with pytest.raises(TournamentError):
+        tournament.start()
+
+
+def test_duplicate_team_is_refused():
+    tournament = Tournament()
+    tournament.add_team("A")
+    with pytest.raises(TournamentError):
+        tournament.add_team("A")
+
+
+def test_optimal_mode_refused_above_limit(monkeypatch):
+    from torneio import tournament as module
+
+    monkeypatch.setattr(module, 'MAX_OPTIMAL_TEAMS', 8)
+    tournament = Tournament()
+    tournament.add_teams([f"Time {i}" for i in range(9)])
+    with pytest.raises(TournamentError):
+        tournament.start('optimal')
+    assert tournament.phase == 'registration'
+
+
+# --- TORNEIO COMPLETO ---
+
+@pytest.mark.parametrize('n, playoff_size', [(6, None), (16, None), (37, None), (64, 16), (150, 32)])
+def test_plays_to_a_champion(make_tournament, rng, n, playoff_size):
+    tournament = make_tournament(n, playoff_size=playoff_size)
+    play_to_end(tournament, rng)
+    assert tournament.phase == 'champion'
+    assert tournament.champion in tournament.teams
+    assert len({tournament.champion, tournament.vice}) == 2
+
+
+def test_invalid_round_changes_nothing(make_tournament, rng):
+    tournament = make_tournament(16)
+    before = team_stats(tournament)
+    scores = random_scores(tournament.rounds[-1].matches, rng)
+    scores[-1] = (1, 1, None, None)
+    with pytest.raises(TournamentError):
+        tournament.submit_swiss_results(scores)
+    assert team_stats(tournament) == before
+    assert not tournament.rounds[-1].completed
+    assert all(m.winner_id is None for m in tournament.rounds[-1].matches)
+
+
+# --- DESFAZER / REFAZER ---
+
+def test_undo_restores_stats_and_ranking(make_tournament, rng):
+    tournament = make_tournament(33)
+    submit_current(tournament, rng)
+    before = team_stats(tournament), ranking(tournament)
+    rounds = len(tournament.rounds)
+    submit_current(tournament, rng)
+    assert tournament.undo_last_round() is not None
+    assert (team_stats(tournament), ranking(tournament)) == before
+    assert len(tournament.rounds) == rounds
+    assert not tournament.rounds[-1].completed
+
+
+def test_redo_after_undo_gives_the_same_result(make_tournament):
+    tournament = make_tournament(33)
+    scores = random_scores(tournament.rounds[-1].matches, random.Random(1))
+    tournament.submit_swiss_results(scores)
+    after = team_stats(tournament), ranking(tournament)
+    tournament.undo_last_round()
+    tournament.submit_swiss_results(scores)
+    assert (team_stats(tournament), ranking(tournament)) == after
+
+
+def test_undo_back_from_playoffs_and_champion(make_tournament, rng):
+    tournament = make_tournament(16)
+    while tournament.phase == 'swiss':
+        before_last_swiss = team_stats(tournament)
+        submit_current(tournament, rng)
+    play_to_end(tournament, rng)
+    assert tournament.phase == 'champion'
+    while tournament.phase != 'swiss':
+        tournament.undo_last_round()
+    # A última rodada suíça volta a ficar aberta, sem mata-mata nem campeão.
+    assert team_stats(tournament) == before_last_swiss
+    assert tournament.playoff_schedule == [] and tournament.bracket is None
+    assert tournament.champion is None
+    assert not tournament.rounds[-1].completed
+
+
+def test_undo_everything_returns_to_zero(make_tournament, rng):
+    tournament = make_tournament(20, tiebreaks=('buchholz', 'sonneborn_berger'))
+    for _ in range(3):
+        submit_current(tournament, rng)
+    while tournament.undo_last_round() is not None:
+        pass
+    assert all(stats[:4] == (0, 0, 0, 0) for stats in team_stats(tournament).values())
+    assert len(tournament.rounds) == 1 and not tournament.rounds[0].completed
+
+
+def played_pairs(tournament):
+    return Counter(frozenset((m.home, m.away)) for r in tournament.rounds for m in r.matches)
+
+
+def test_undo_keeps_history_of_repeated_pairs(make_tournament, rng):
+    # Com 6 times a última rodada suíça repete um confronto (semente 0).
+    tournament = make_tournament(6)
+    while tournament.phase == 'swiss':
+        submit_current(tournament, rng)
+    assert max(played_pairs(tournament).values()) > 1
+    while tournament.undo_last_round() is not None:
+        pairs = played_pairs(tournament)
+        assert {frozenset(p): n for p, n in tournament.meetings.items()} == pairs
+        assert {t.id: t.history for t in tournament.teams} == \
+            {t.id: {o for p in pairs if t.id in p for o in p if o != t.id} for t in tournament.teams}
+
+
+
+# --- DESEMPATES ---
+
+def brute_tiebreaks(tournament):
+    """(buchholz, median_buchholz, sonneborn_berger) recalculados do zero a partir das rodadas."""
+    games = {t.id: [] for t in tournament.teams}
+    for r in tournament.rounds:
+        if r.completed:
+            for m in r.matches:
+                games[m.home].append((m.away, m.winner_id == m.home))
+                games[m.away].append((m.home, m.winner_id == m.away))
+    values = {}
+    for tid, played in games.items():
+        scores = [tournament.teams.get(opponent).wins for opponent, _ in played]
+        buchholz = sum(scores)
+        median = buchholz - max(scores) - min(scores) if len(scores) >= 3 else buchholz
+        values[tid] = (buchholz, median, sum(s for s, (_, won) in zip(scores, played) if won))
+    return values
+
+
+def brute_ranking(tournament):
+    fields = [TIEBREAK_FIELDS.index(name) for name in tournament.tiebreaks]
+    values = brute_tiebreaks(tournament)
+    return [t.id for t in sorted(tournament.teams, key=lambda t: (
+        -t.wins, t.losses, t.received_bye, -t.goal_diff, -t.goals_for, *(-values[t.id][i] for i in fields), t.id))]
+
+
+def assert_tiebreaks(tournament):
+    expected = brute_tiebreaks(tournament)
+    assert {t.id: tournament.opponents.values(t.id) for t in tournament.teams} == expected
+    # Índice montado do zero (torneio carregado) dá o mesmo que o incremental.
+    fresh = OpponentIndex.from_rounds(tournament.teams, tournament.rounds)
+    assert {t.id: fresh.values(t.id) for t in tournament.teams} == expected
+    assert ranking(tournament) == brute_ranking(tournament)
+
+
+@pytest.mark.parametrize('tiebreaks', [
+    ('buchholz',),
+    ('median_buchholz', 'buchholz'),
+    ('sonneborn_berger', 'median_buchholz', 'buchholz'),
+])
+def test_tiebreaks_match_brute_force_through_rounds_undo_and_playoffs(make_tournament, rng, tiebreaks):
+    tournament = make_tournament(22, playoff_size=8, tiebreaks=tiebreaks)
+    while tournament.phase in ('swiss', 'playoff_gameplay'):
+        submit_current(tournament, rng)
+        assert_tiebreaks(tournament)
+        if rng.random() < 0.3:
+            tournament.undo_last_round()
+            assert_tiebreaks(tournament)
+    assert tournament.phase == 'champion'
+    while tournament.undo_last_round() is not None:
+        assert_tiebreaks(tournament)
+    assert all(v == (0, 0, 0) for v in brute_tiebreaks(tournament).values())
+
+
+def test_tiebreaks_break_ties_in_configured_order(make_tournament):
+    # Todos os jogos 1 a 0: saldo e gols pró empatam dentro de cada campanha e a ordem
+    # dos critérios decide. Mesmas rodadas nas duas ordens; só a posição dos empatados muda.
+    rankings = []
+    for tiebreaks in (('buchholz', 'sonneborn_berger'), ('sonneborn_berger', 'buchholz')):
+        tournament = make_tournament(16, tiebreaks=tiebreaks)
+        winners = random.Random(3)
+        for _ in range(3):
+            tournament.submit_swiss_results([(1, 0, None, None) if winners.random() < 0.5 else (0, 1, None, None)
+                                             for _ in tournament.rounds[-1].matches])
+        assert ranking(tournament) == brute_ranking(tournament)
+        rankings.append(ranking(tournament))
+    assert sorted(rankings[0]) == sorted(rankings[1]) and rankings[0] != rankings[1]
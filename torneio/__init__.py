@@ -0,0 +1,6 @@
+from torneio.models import Team, SwissMatch, PlayoffMatch, SwissRound, PlayoffRound
+from torneio.registry import TeamRegistry
+from torneio.standings import Standings
+from torneio.tournament import Tournament, TournamentError
+
+__all__ = ['Team', 'SwissMatch', 'PlayoffMatch', 'SwissRound', 'PlayoffRound', 'TeamRegistry', 'Standings', 'Tournament', 'TournamentError']
@@ -0,0 +1,243 @@
+# --- API HTTP (ASGI) ---
+# API JSON assíncrona sobre o mesmo motor e o mesmo banco do app, para
+# lançar placares do celular sem passar pelos formulários do Streamlit.
+# Não depende de framework: é um app ASGI puro. Para servir:
+#   pip install uvicorn
+#   TORNEIO_DB=torneio.db uvicorn --factory torneio.api:create_app
+#
+#   GET  /torneios                          divisões (id, nome, fase)
+#   GET  /torneios/{id}/rodada              confrontos da rodada em andamento
+#   GET  /torneios/{id}/classificacao       classificação
+#   POST /torneios/{id}/resultados          placares da rodada em andamento
+#   GET  /torneios/{id}/ao-vivo             classificação por SSE (torneio/live.py)
+#   GET  /torneios/{id}/painel              página do telão que consome o SSE
+#   GET  /metrics                           métricas no formato do Prometheus (torneio/metrics.py)
+#
+# Rodada e classificação levam ETag = revisão do torneio e são montadas uma
+# vez por revisão (TournamentManager.view): um cliente que faz polling com
+# If-None-Match recebe 304 sem que nada seja recalculado.
+#
+# Corpo do POST (um item por jogo, na ordem de /rodada):
+#   {"revisao": 12, "placares": [{"mandante": 2, "visitante": 2,
+#     "penaltis_mandante": 4, "penaltis_visitante": 3}, ...]}
+# "revisao" (a devolvida por /rodada) é obrigatória: sem ela o POST leva 400,
+# e se o torneio já mudou, 409 — placar nenhum cai na rodada errada.
+# Torneio que não pode ser reconstruído do banco (CorruptTournamentError): 500
+# com a mensagem em JSON, em qualquer rota.
+
+import asyncio
+import json
+import os
+
+from torneio.live import PANEL_HTML, LiveHub
+from torneio.manager import TournamentManager
+from torneio.metrics import metrics
+from torneio.storage import CorruptTournamentError, TournamentStore
+from torneio.tournament import StaleRevisionError, Tournament, TournamentError
+
+JSON_HEADERS = [(b'content-type', b'application/json; charset=utf-8'), (b'cache-control', b'no-cache')]
+SSE_HEADERS = [(b'content-type', b'text/event-stream; charset=utf-8'), (b'cache-control', b'no-cache'),
+               (b'x-accel-buffering', b'no')]
+HTML_HEADERS = [(b'content-type', b'text/html; charset=utf-8')]
+METRICS_HEADERS = [(b'content-type', b'text/plain; version=0.0.4; charset=utf-8')]
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _etag(tournament):
+    return f'"r{tournament.revision}"'.encode()
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+# --- VISÕES (uma vez por revisão) ---
+
+def standings_view(tournament):
+    rows = []
+    index = tournament.opponents
+    for pos, t in enumerate(tournament.teams.standings.ranked(), 1):
+        row = {
+            'posicao': pos, 'id': t.id, 'time': t.name,
+            'vitorias': t.wins, 'derrotas': t.losses, 'saldo': t.goal_diff, 'gols_pro': t.goals_for,
+            'status': t.status, 'bye': t.received_bye,
+        }
+        for name in tournament.tiebreaks:
+            row[name] = index.value(t.id, name)
+        rows.append(row)
+    return _etag(tournament), _dumps({'revisao': tournament.revision, 'fase': tournament.phase, 'classificacao': rows})
+
+
+def round_view(tournament):
+    name_of = tournament.teams.name_of
+    data = {'revisao': tournament.revision, 'fase': tournament.phase, 'jogos': []}
+    if tournament.phase == 'swiss':
+        current = tournament.rounds[-1]
+        data['rodada'] = len(tournament.rounds)
+        data['bye'] = {'id': current.bye, 'time': name_of(current.bye)} if current.bye else None
+        matches = current.matches
+    elif tournament.phase == 'playoff_gameplay':
+        current = tournament.playoff_schedule[-1]
+        data['rodada'] = current.name
+        data['aguardando'] = [{'id': t, 'time': name_of(t)} for t in current.waiting or []]
+        matches = current.matches
+    else:
+        matches = []
+    for i, m in enumerate(matches):
+        data['jogos'].append({
+            'indice': i,
+            'mandante': {'id': m.home, 'time': name_of(m.home)},
+            'visitante': {'id': m.away, 'time': name_of(m.away)},
+        })
+    return _etag(tournament), _dumps(data)
+
+
+def parse_scores(payload):
+    """Converte o corpo do POST em (revisão, [(gm, gv, pm, pv), ...]); a regra dos pênaltis fica no motor."""
+    if not isinstance(payload, dict) or not isinstance(payload.get('placares'), list):
+        raise HTTPError(400, "Esperado um objeto com a lista 'placares'.")
+    revision = payload.get('revisao')
+    if revision is None:
+        raise HTTPError(400, "Informe 'revisao' (a revisão devolvida por /rodada).")
+    if not isinstance(revision, int) or isinstance(revision, bool):
+        raise HTTPError(400, "'revisao' deve ser um inteiro.")
+    scores = []
+    for item in payload['placares']:
+        if not isinstance(item, dict):
+            raise HTTPError(400, "Cada placar deve ser um objeto.")
+        values = tuple(item.get(k) for k in ('mandante', 'visitante', 'penaltis_mandante', 'penaltis_visitante'))
+        for v in values:
+            if v is not None and (not isinstance(v, int) or isinstance(v, bool) or v < 0):
+                raise HTTPError(400, "Gols e pênaltis devem ser inteiros não negativos.")
+        scores.append(values)
+    return revision, scores
+
+
+# --- APP ASGI ---
+
+class TournamentAPI:
+    def __init__(self, manager):
+        self.manager = manager
+        self.live = LiveHub(manager)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+        parts = [p for p in scope['path'].split('/') if p]
+        if len(parts) == 3 and parts[0] == 'torneios' and parts[2] == 'ao-vivo' and scope['method'] == 'GET':
+            try:
+                return await self.live.stream(parts[1], receive, send, SSE_HEADERS)
+            except TournamentError:
+                status, body, headers = 404, _dumps({'erro': "Torneio não encontrado."}), JSON_HEADERS
+            except CorruptTournamentError as e:
+                status, body, headers = 500, _dumps({'erro': str(e)}), JSON_HEADERS
+        else:
+            try:
+                status, body, headers = await self.route(scope, receive)
+            except HTTPError as e:
+                status, body, headers = e.status, _dumps({'erro': str(e)}), []
+            except CorruptTournamentError as e:
+                status, body, headers = 500, _dumps({'erro': str(e)}), []
+            if not any(key == b'content-type' for key, _ in headers):
+                headers = JSON_HEADERS + headers
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': headers + [(b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def route(self, scope, receive):
+        parts = [p for p in scope['path'].split('/') if p]
+        method = scope['method']
+        if parts == ['torneios'] and method == 'GET':
+            divisions = await asyncio.to_thread(self.manager.list)
+            return 200, _dumps([{'id': tid, 'nome': name, 'fase': phase} for tid, name, phase in divisions]), []
+        if parts == ['metrics'] and method == 'GET':
+            return 200, metrics.prometheus().encode('utf-8'), METRICS_HEADERS
+        if len(parts) != 3 or parts[0] != 'torneios':
+            raise HTTPError(404, "Rota não encontrada.")
+
+        tournament_id, resource = parts[1], parts[2]
+        if resource in ('classificacao', 'rodada') and method == 'GET':
+            return await self.cached(scope, tournament_id, resource)
+        if resource == 'resultados' and method == 'POST':
+            return await self.submit(tournament_id, await _read_body(receive))
+        if resource == 'painel' and method == 'GET':
+            return 200, PANEL_HTML.encode('utf-8'), HTML_HEADERS
+        raise HTTPError(405 if resource in ('classificacao', 'rodada', 'resultados', 'painel') else 404,
+                        "Rota não encontrada.")
+
+    async def cached(self, scope, tournament_id, resource):
+        build = standings_view if resource == 'classificacao' else round_view
+        kind = ('api', resource)
+        # Caminho rápido do polling: visão já pronta para a revisão atual, sem thread nem lock.
+        view = self.manager.peek(tournament_id, kind)
+        if view is None:
+            tournament = await asyncio.to_thread(self.manager.get, tournament_id)
+            if tournament is None:
+                raise HTTPError(404, "Torneio não encontrado.")
+            view = await asyncio.to_thread(self.manager.view, tournament_id, kind, build)
+        etag, body = view
+        if _header(scope, b'if-none-match') == etag:
+            return 304, b'', [(b'etag', etag)]
+        return 200, body, [(b'etag', etag)]
+
+    async def submit(self, tournament_id, raw):
+        try:
+            payload = json.loads(raw or b'null')
+        except ValueError:
+            raise HTTPError(400, "JSON inválido.")
+        revision, scores = parse_scores(payload)
+        tournament = await asyncio.to_thread(self.manager.get, tournament_id)
+        if tournament is None:
+            raise HTTPError(404, "Torneio não encontrado.")
+        if tournament.phase == 'swiss':
+            action = Tournament.submit_swiss_results
+        elif tournament.phase == 'playoff_gameplay':
+            action = Tournament.submit_playoff_results
+        else:
+            raise HTTPError(409, "Não há rodada em andamento.")
+        try:
+            # Gravação (lock + SQLite) fora do loop de eventos.
+            await asyncio.to_thread(self.manager.apply, tournament_id, action, scores, revision=revision)
+        except StaleRevisionError as e:
+            raise HTTPError(409, str(e))
+        except TournamentError as e:
+            raise HTTPError(422, str(e))
+        self.live.notify(tournament_id)
+        tournament = await asyncio.to_thread(self.manager.get, tournament_id)
+        return 200, _dumps({'revisao': tournament.revision, 'fase': tournament.phase}), []
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+def _header(scope, name):
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value
+    return None
+
+
+def create_app(manager=None):
+    """Fábrica ASGI; sem gerenciador, abre o banco de TORNEIO_DB (o mesmo do app)."""
+    if manager is None:
+        manager = TournamentManager(TournamentStore(os.environ.get('TORNEIO_DB', 'torneio.db')))
+    return TournamentAPI(manager)
@@ -0,0 +1,90 @@
+# --- CHAVEAMENTO GENÉRICO DO MATA-MATA ---
+# Chave eliminatória para qualquer número de classificados (usada acima dos
+# formatos fixos de até 8). A árvore inteira é montada no início, num array
+# no formato de heap: a final é o nó 1, os filhos do nó i são 2i e 2i+1 e as
+# folhas ocupam [tamanho, 2·tamanho). Cada nó guarda o id de quem o ocupa:
+# nas folhas, a semente; nos jogos, o vencedor (None enquanto não decidido).
+#
+# As sementes entram na ordem clássica (1 x 16, 8 x 9, 5 x 12, ...): quando o
+# número de classificados não é potência de 2, as folgas ficam com os
+# primeiros colocados, e os favoritos só se cruzam nas rodadas finais.
+# Avançar um vencedor é gravar um id no nó do jogo (O(1)); nenhuma rodada
+# reordena times.
+
+# Folha vazia: quem cairia contra ela avança direto (folga).
+BYE = 0
+
+ROUND_NAMES = {1: "Finais", 2: "Semifinais", 4: "Quartas de Final", 8: "Oitavas de Final"}
+
+
+def seed_order(size):
+    """Sementes (1 = melhor) na ordem das folhas de uma chave com `size` posições."""
+    order = [1]
+    while len(order) < size:
+        total = 2 * len(order) + 1
+        order = [s for seed in order for s in (seed, total - seed)]
+    return order
+
+
+def level_name(level):
+    """Nome da rodada cujos jogos são os nós [level, 2·level)."""
+    return ROUND_NAMES.get(level, f"{level}-avos de Final")
+
+
+def node_level(node):
+    """Primeiro nó do nível ao qual `node` pertence (potência de 2)."""
+    return 1 << (node.bit_length() - 1)
+
+
+class Bracket:
+    __slots__ = ('size', 'slots')
+
+    def __init__(self, size, slots):
+        self.size = size
+        self.slots = slots
+
+    @classmethod
+    def seeded(cls, seeds):
+        """Chave para `seeds` em ordem de classificação; as folgas já sobem de nível."""
+        size = 1 << max(1, (len(seeds) - 1).bit_length())
+        slots = [None] * (2 * size)
+        for leaf, seed in enumerate(seed_order(size), size):
+            slots[leaf] = seeds[seed - 1] if seed <= len(seeds) else BYE
+        for node in range(size // 2, size):
+            home, away = slots[2 * node], slots[2 * node + 1]
+            if away == BYE:
+                slots[node] = home
+            elif home == BYE:
+                slots[node] = away
+        return cls(size, slots)
+
+    @property
+    def first_level(self):
+        return self.size // 2
+
+    def open_matches(self, level):
+        """Jogos ainda sem vencedor no nível: [(nó, mandante, visitante)]."""
+        s = self.slots
+        return [(node, s[2 * node], s[2 * node + 1]) for node in range(level, 2 * level) if s[node] is None]
+
+    def byes(self):
+        """Sementes que folgam na primeira rodada."""
+        s = self.slots
+        return [s[node] for node in range(self.first_level, self.size) if BYE in (s[2 * node], s[2 * node + 1])]
+
+    def advance(self, node, winner):
+        self.slots[node] = winner
+
+    def clear(self, node):
+        self.slots[node] = None
+
+    @property
+    def champion(self):
+        return self.slots[1]
+
+    def to_list(self):
+        return list(self.slots)
+
+    @classmethod
+    def from_list(cls, data):
+        return cls(len(data) // 2, list(data))
@@ -0,0 +1,216 @@
+# --- LOG DE EVENTOS (RESULTADOS) ---
+# Cada resultado confirmado vira um evento imutável por time; as estatísticas
+# dos times são a projeção desse log. Fotografias periódicas permitem
+# reconstruir o estado reaplicando só os eventos posteriores à última
+# fotografia, e desfazer a última rodada reverte apenas os eventos dela.
+
+from collections import Counter, namedtuple
+
+# Uma fotografia a cada N eventos (dois eventos por jogo).
+SNAPSHOT_EVERY = 2048
+
+# round_key = ('swiss', índice) ou ('playoff', índice)
+MatchEvent = namedtuple('MatchEvent', 'seq round_key team_id goals_for goals_against is_winner is_bye')
+
+ZERO_STATS = (0, 0, 0, 0, False, 'Ativo')
+
+# Lugar de um evento anterior à fotografia que ainda não foi lido do banco
+# (round_key None: nunca pertence à rodada sendo lida ou desfeita).
+PENDING = MatchEvent(-1, None, None, 0, 0, False, False)
+
+
+def swiss_status(team):
+    if team.wins >= 3:
+        return 'Classificado'
+    if team.losses >= 3:
+        return 'Eliminado'
+    return 'Ativo'
+
+
+def apply_event(team, ev):
+    team.goals_for += ev.goals_for
+    team.goal_diff += ev.goals_for - ev.goals_against
+    if ev.is_winner:
+        team.wins += 1
+    else:
+        team.losses += 1
+    if ev.is_bye:
+        team.received_bye = True
+    if ev.round_key[0] == 'swiss':
+        if team.wins >= 3:
+            team.status = 'Classificado'
+        elif team.losses >= 3:
+            team.status = 'Eliminado'
+
+
+def _stats(team):
+    return (team.wins, team.losses, team.goals_for, team.goal_diff, team.received_bye, team.status)
+
+
+def _restore(team, stats):
+    team.wins, team.losses, team.goals_for, team.goal_diff, team.received_bye, team.status = stats
+
+
+class EventLog:
+    def __init__(self, registry, snapshot_every=SNAPSHOT_EVERY, base=None):
+        self.events = []
+        self.snapshot_every = snapshot_every
+        # Fotografias: (nº de eventos aplicados, {id: estatísticas}, byes por time).
+        # A primeira é a base do torneio e nunca é descartada.
+        stats = base if base is not None else {t.id: _stats(t) for t in registry}
+        self._byes = Counter(tid for tid, s in stats.items() if s[4])
+        self._snapshots = [(0, stats, self._byes.copy())]
+        # Fotografia que está gravada no banco (TournamentStore.save compara por identidade).
+        self.persisted = None
+        # Lê os eventos PENDING do banco quando um desfazer chega neles.
+        self._load_prefix = None
+
+    @classmethod
+    def replayed(cls, registry, events, snapshot=None, snapshot_every=SNAPSHOT_EVERY, load_prefix=None):
+        """Reconstrói o log de um torneio salvo e confere com os times.
+
+        snapshot: fotografia gravada (nº de eventos, {id: estatísticas}, byes); só os eventos
+        posteriores a ela são reaplicados. Se não bater com os times, refaz a partir da base zerada.
+        events pode começar com PENDING (eventos anteriores à fotografia não lidos); load_prefix()
+        devolve esses eventos quando forem precisos.
+        """
+        expected = {t.id: _stats(t) for t in registry}
+        prefix = _pending_count(events)
+        if snapshot is not None and prefix <= snapshot[0] <= len(events) and snapshot[0] > 0:
+            log = cls._replay(registry, events, snapshot_every, snapshot)
+            if all(_stats(t) == expected[t.id] for t in registry):
+                log.persisted = snapshot
+                log._load_prefix = load_prefix if prefix else None
+                return log
+        if prefix:
+            events = _filled(events, load_prefix())
+        log = cls._replay(registry, events, snapshot_every)
+        for t in registry:
+            if _stats(t) != expected[t.id]:
+                raise ValueError(f"Log de resultados inconsistente com o time {t.name}.")
+        return log
+
+    @classmethod
+    def _replay(cls, registry, events, snapshot_every, snapshot=None):
+        log = cls(registry, snapshot_every, base={t.id: ZERO_STATS for t in registry})
+        if snapshot is not None:
+            log._snapshots.append(snapshot)
+        log.events = list(events)
+        log.rebuild(registry)
+        return log
+
+    def latest_snapshot(self):
+        """Fotografia mais recente: (nº de eventos, {id: estatísticas}, byes por time)."""
+        return self._snapshots[-1]
+
+    def record_round(self, registry, round_key, results):
+        """Rodada inteira de uma vez: results = [(time, gols pró, gols contra, venceu, bye)].
+
+        Estatísticas e status num só passo; a classificação é recalculada uma vez no fim e
+        a fotografia, se devida, é tirada uma vez por rodada. Retorna os eventos.
+        """
+        seq = len(self.events)
+        events = [MatchEvent(seq + i, round_key, *result) for i, result in enumerate(results)]
+        get = registry.get
+        teams = []
+        for ev in events:
+            team = get(ev.team_id)
+            self._apply_stats(team, ev)
+            teams.append(team)
+        self.events.extend(events)
+        registry.standings.update_many(teams)
+        self._maybe_snapshot(registry)
+        return events
+
+    def _apply_stats(self, team, ev):
+        apply_event(team, ev)
+        if ev.is_bye:
+            self._byes[ev.team_id] += 1
+
+    def _maybe_snapshot(self, registry):
+        if len(self.events) - self._snapshots[-1][0] >= self.snapshot_every:
+            self._snapshots.append((len(self.events), {t.id: _stats(t) for t in registry}, self._byes.copy()))
+
+    def last_round_key(self):
+        if self.events and self.events[-1] is PENDING:
+            self.events = _filled(self.events, self._load_prefix())
+            self._load_prefix = None
+        return self.events[-1].round_key if self.events else None
+
+    def round_events(self, round_key):
+        out = []
+        for ev in reversed(self.events):
+            if ev.round_key != round_key:
+                break
+            out.append(ev)
+        out.reverse()
+        return out
+
+    def undo_round(self, registry):
+        """Desfaz os eventos da última rodada em O(jogos da rodada). Retorna a round_key desfeita."""
+        key = self.last_round_key()
+        if key is None:
+            return None
+        teams = []
+        while self.events and self.events[-1].round_key == key:
+            ev = self.events.pop()
+            team = registry.get(ev.team_id)
+            team.goals_for -= ev.goals_for
+            team.goal_diff -= ev.goals_for - ev.goals_against
+            if ev.is_winner:
+                team.wins -= 1
+            else:
+                team.losses -= 1
+            if ev.is_bye:
+                self._byes[ev.team_id] -= 1
+                team.received_bye = self._byes[ev.team_id] > 0
+            if key[0] == 'swiss':
+                # Na fase suíça o status é sempre função de vitórias/derrotas.
+                team.status = swiss_status(team)
+            teams.append(team)
+        registry.standings.update_many(teams)
+        while len(self._snapshots) > 1 and self._snapshots[-1][0] > len(self.events):
+            self._snapshots.pop()
+        return key
+
+    def rebuild(self, registry):
+        """Restaura a última fotografia válida e reaplica só os eventos posteriores a ela."""
+        while len(self._snapshots) > 1 and self._snapshots[-1][0] > len(self.events):
+            self._snapshots.pop()
+        count, stats, byes = self._snapshots[-1]
+        for t in registry:
+            _restore(t, stats.get(t.id, ZERO_STATS))
+        self._byes = byes.copy()
+        pending = self.events[count:]
+        del self.events[count:]
+        for ev in pending:
+            # A classificação é remontada uma vez no fim.
+            self._apply_stats(registry.get(ev.team_id), ev)
+            self.events.append(ev)
+            self._maybe_snapshot(registry)
+        registry.standings.rebuild(registry)
+
+    @staticmethod
+    def events_to_list(events):
+        return [[ev.seq, list(ev.round_key), *ev[2:]] for ev in events]
+
+    @staticmethod
+    def events_from_list(data):
+        return [MatchEvent(seq, tuple(key), *rest) for seq, key, *rest in data]
+
+
+def _pending_count(events):
+    count = 0
+    for ev in events:
+        if ev is not PENDING:
+            break
+        count += 1
+    return count
+
+
+def _filled(events, prefix):
+    """events com os PENDING do começo trocados pelos eventos lidos."""
+    count = _pending_count(events)
+    if len(prefix) != count:
+        raise ValueError(f"Esperava {count} eventos antes da fotografia, o log tem {len(prefix)}.")
+    return list(prefix) + events[count:]
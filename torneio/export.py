@@ -0,0 +1,250 @@
+# --- EXPORTAÇÃO ---
+# Linhas de classificação e de histórico geradas sob demanda (rodada a rodada),
+# escritas de forma incremental em CSV, CSV compactado (gzip), Parquet ou XLSX.
+# O pico de memória não depende do tamanho do torneio. Só o CSV vem da
+# biblioteca padrão; pyarrow e openpyxl são importados quando o formato é pedido.
+#
+# Uso sem Streamlit:
+#   python -m torneio.export torneio.json --formato csv.gz --saida exportacao/
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+
+from torneio.bracket import Bracket
+from torneio.models import PlayoffRound, SwissRound
+from torneio.registry import TeamRegistry
+from torneio.tournament import Tournament
+
+RANKING_COLUMNS = ['Time', 'Vitorias', 'Derrotas', 'Saldo', 'Gols Pro', 'Status', 'Recebeu Bye']
+MATCH_COLUMNS = ['Fase', 'Rodada', 'Mandante', 'Placar M', 'Placar V', 'Visitante', 'Vencedor', 'Notas']
+
+FORMATS = ('csv', 'csv.gz', 'parquet', 'xlsx')
+
+# Linhas por row group no Parquet (e por lote em memória).
+PARQUET_BATCH_ROWS = 10000
+
+
+def ranking_rows(registry):
+    for t in registry.standings.ranked():
+        yield {
+            'Time': t.name,
+            'Vitorias': t.wins,
+            'Derrotas': t.losses,
+            'Saldo': t.goal_diff,
+            'Gols Pro': t.goals_for,
+            'Status': t.status,
+            'Recebeu Bye': 'Sim' if t.received_bye else 'Não'
+        }
+
+
+def match_rows(registry, rounds, playoff_schedule):
+    # Fase Suíça
+    for i, r in enumerate(rounds):
+        if not r.completed:
+            continue
+        if r.bye:
+            bye_name = registry.name_of(r.bye)
+            yield {
+                'Fase': 'Suíça', 'Rodada': i+1,
+                'Mandante': bye_name, 'Placar M': 1, 'Placar V': 0, 'Visitante': 'BYE (Folga)',
+                'Vencedor': bye_name, 'Notas': 'Vitória automática por Bye'
+            }
+        for m in r.matches:
+            h_name = registry.name_of(m.home, "Time A")
+            a_name = registry.name_of(m.away, "Time B")
+            winner_name = "Empate"
+            if m.winner_id is not None:
+                winner_name = h_name if m.winner_id == m.home else a_name
+            yield {
+                'Fase': 'Suíça', 'Rodada': i+1,
+                'Mandante': h_name, 'Placar M': m.home_score,
+                'Placar V': m.away_score, 'Visitante': a_name,
+                'Vencedor': winner_name, 'Notas': f"Pênaltis: {m.h_pen} x {m.a_pen}" if m.is_penalties else ""
+            }
+
+    # Fase Mata-Mata
+    for r in playoff_schedule:
+        if not r.completed:
+            continue
+        for m in r.matches:
+            h_name = registry.name_of(m.home)
+            a_name = registry.name_of(m.away)
+            label_fase = r.name
+            if label_fase == "Finais":
+                if m.id == 'FINAL': label_fase = "Grande Final"
+                if m.id == '3RD': label_fase = "Disputa 3º Lugar"
+            yield {
+                'Fase': 'Mata-Mata', 'Rodada': label_fase,
+                'Mandante': h_name, 'Placar M': m.h_goals,
+                'Placar V': m.a_goals, 'Visitante': a_name,
+                'Vencedor': h_name if m.winner_id == m.home else a_name,
+                'Notas': f"Pênaltis: {m.h_pen} x {m.a_pen}" if m.is_penalties else ""
+            }
+
+
+# --- ESCRITORES ---
+
+def write_csv(rows, columns, stream):
+    """Escreve linha a linha num stream de texto. Retorna o número de linhas."""
+    writer = csv.DictWriter(stream, fieldnames=columns, lineterminator='\n')
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_parquet(rows, columns, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # 'Rodada' mistura número (suíço) e nome (mata-mata): tudo vira texto.
+    schema = pa.schema([(c, pa.string()) for c in columns])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = {c: [] for c in columns}
+        for row in rows:
+            for c in columns:
+                batch[c].append(str(row[c]))
+            count += 1
+            if count % PARQUET_BATCH_ROWS == 0:
+                writer.write_table(pa.table(batch, schema=schema))
+                batch = {c: [] for c in columns}
+        if batch[columns[0]] or count == 0:
+            writer.write_table(pa.table(batch, schema=schema))
+    return count
+
+
+def write_xlsx(sheets, target):
+    """sheets: [(nome da aba, linhas, colunas)]; target: caminho ou stream binário. Retorna linhas por aba."""
+    from openpyxl import Workbook
+
+    # Modo somente escrita: as linhas vão para o arquivo sem montar a planilha em memória.
+    workbook = Workbook(write_only=True)
+    counts = []
+    for title, rows, columns in sheets:
+        sheet = workbook.create_sheet(title)
+        sheet.append(columns)
+        count = 0
+        for row in rows:
+            sheet.append([row[c] for c in columns])
+            count += 1
+        counts.append(count)
+    workbook.save(target)
+    return counts
+
+
+def xlsx_bytes(sheets):
+    buffer = io.BytesIO()
+    write_xlsx(sheets, buffer)
+    return buffer.getvalue()
+
+
+def export_file(rows, columns, path, fmt='csv'):
+    if fmt == 'parquet':
+        return write_parquet(rows, columns, path)
+    if fmt == 'xlsx':
+        return write_xlsx([(os.path.splitext(os.path.basename(path))[0][:31], rows, columns)], path)[0]
+    if fmt == 'csv.gz':
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+            return write_csv(rows, columns, f)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        return write_csv(rows, columns, f)
+
+
+def csv_bytes(rows, columns, none_if_empty=False):
+    """CSV inteiro em bytes; com none_if_empty, None se não houver linhas (botão de download some)."""
+    buffer = io.StringIO()
+    count = write_csv(rows, columns, buffer)
+    if none_if_empty and not count:
+        return None
+    return buffer.getvalue().encode('utf-8')
+
+
+# --- TORNEIO SALVO (JSON) ---
+
+def tournament_to_dict(registry, rounds, playoff_schedule, phase, champion=None, vice=None, third=None,
+                       playoff_size=None, bracket=None, tiebreaks=(), name='', pairing_mode=None):
+    data = {
+        'name': name,
+        'teams': registry.to_list(),
+        'rounds': [r.to_dict() for r in rounds],
+        'playoff_schedule': [r.to_dict() for r in playoff_schedule],
+        'phase': phase,
+        'champion': champion, 'vice': vice, 'third': third,
+    }
+    if playoff_size is not None:
+        data['playoff_size'] = playoff_size
+    if bracket is not None:
+        data['bracket'] = bracket.to_list()
+    if tiebreaks:
+        data['tiebreaks'] = list(tiebreaks)
+    if pairing_mode is not None:
+        data['pairing_mode'] = pairing_mode
+    return data
+
+
+def load_tournament(path):
+    with open(path, encoding='utf-8') as f:
+        return tournament_from_dict(json.load(f))
+
+
+def tournament_from_dict(data):
+    state = {
+        'name': data.get('name', ''),
+        'teams': TeamRegistry.from_list(data['teams']),
+        'rounds': [SwissRound.from_dict(r) for r in data['rounds']],
+        'playoff_schedule': [PlayoffRound.from_dict(r) for r in data['playoff_schedule']],
+        'phase': data['phase'],
+        'champion': data.get('champion'), 'vice': data.get('vice'), 'third': data.get('third'),
+    }
+    # Arquivos antigos não têm vagas nem chave: valem os padrões do motor.
+    if data.get('playoff_size') is not None:
+        state['playoff_size'] = data['playoff_size']
+    if data.get('bracket'):
+        state['bracket'] = Bracket.from_list(data['bracket'])
+    if data.get('tiebreaks'):
+        state['tiebreaks'] = tuple(data['tiebreaks'])
+    if data.get('pairing_mode'):
+        state['pairing_mode'] = data['pairing_mode']
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m torneio.export', description="Exporta classificação e histórico de um torneio salvo.")
+    parser.add_argument('torneio', help="arquivo JSON do torneio salvo")
+    parser.add_argument('--formato', choices=FORMATS, default='csv')
+    parser.add_argument('--saida', default='.', help="diretório de saída")
+    args = parser.parse_args(argv)
+    if args.formato == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("o formato parquet requer o pacote pyarrow (pip install pyarrow)")
+    if args.formato == 'xlsx':
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            parser.error("o formato xlsx requer o pacote openpyxl (pip install openpyxl)")
+
+    # Pelo motor: a classificação usa os mesmos desempates configurados que a tabela do app.
+    tournament = Tournament(**load_tournament(args.torneio))
+    os.makedirs(args.saida, exist_ok=True)
+    registry = tournament.teams
+    outputs = [
+        ('classificacao_torneio', ranking_rows(registry), RANKING_COLUMNS),
+        ('historico_partidas', match_rows(registry, tournament.rounds, tournament.playoff_schedule), MATCH_COLUMNS),
+    ]
+    for name, rows, columns in outputs:
+        path = os.path.join(args.saida, f"{name}.{args.formato}")
+        count = export_file(rows, columns, path, args.formato)
+        print(f"{path}: {count} linhas")
+
+
+if __name__ == '__main__':
+    main()
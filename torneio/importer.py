@@ -0,0 +1,356 @@
+# --- IMPORTAÇÃO DE TIMES E SÚMULAS ---
+# Inscrição em lote a partir de texto colado, CSV ou XLSX. As linhas são lidas
+# uma a uma (sem carregar a planilha inteira) e vão direto para o registro,
+# que deduplica por nome em O(1); no fim sai um relatório único com
+# importados, duplicados e linhas inválidas.
+#
+# Súmulas: placares de uma rodada inteira numa planilha, casados com os jogos
+# da rodada pelo nome (ou id) dos times e validados como no formulário
+# (empate exige pênaltis, pênaltis não empatam). Ver read_round_results.
+#
+# Colunas reconhecidas no cabeçalho (maiúsculas/acentos tanto faz):
+#   nome | time | equipe | name      obrigatória
+#   rating | seed | forca | força     opcional, número
+#   clube | club                      opcional
+#   grupo | group                     opcional
+# Sem cabeçalho reconhecível, vale a ordem: nome, rating, clube, grupo.
+#
+# Colunas da súmula (score_sheet_rows gera o modelo da rodada):
+#   mandante | visitante              nome ou id do time
+#   gols m | gols v                   obrigatórias
+#   pen m | pen v                     só nos empates
+# Sem cabeçalho: mandante, gols m, gols v, visitante, pen m, pen v (a ordem
+# do histórico exportado).
+#
+# Uso sem Streamlit:
+#   python -m torneio.importer inscricoes.csv
+#   python -m torneio.importer sumula.csv --torneio torneio.json
+
+import argparse
+import csv
+import io
+import itertools
+import sys
+import unicodedata
+from collections import namedtuple
+
+# Linha da planilha (1 = primeira linha do arquivo) e os dados do time.
+TeamEntry = namedtuple('TeamEntry', 'line name rating club group')
+
+MAX_NAME_LENGTH = 100
+# Jogos sem placar listados pela linha de comando.
+MAX_LISTED = 20
+
+COLUMN_ALIASES = {
+    'name': ('nome', 'time', 'equipe', 'name', 'team'),
+    'rating': ('rating', 'seed', 'forca', 'elo'),
+    'club': ('clube', 'club'),
+    'group': ('grupo', 'group'),
+}
+POSITIONAL_COLUMNS = ('name', 'rating', 'club', 'group')
+
+SCORE_ALIASES = {
+    'home': ('mandante', 'casa', 'home', 'time a'),
+    'away': ('visitante', 'fora', 'away', 'time b'),
+    'home_goals': ('gols m', 'gols mandante', 'placar m', 'gm'),
+    'away_goals': ('gols v', 'gols visitante', 'placar v', 'gv'),
+    'home_pen': ('pen m', 'penaltis m', 'penaltis mandante', 'pm'),
+    'away_pen': ('pen v', 'penaltis v', 'penaltis visitante', 'pv'),
+}
+SCORE_POSITIONAL_COLUMNS = ('home', 'home_goals', 'away_goals', 'away', 'home_pen', 'away_pen')
+SCORE_SHEET_COLUMNS = ['Jogo', 'Mandante', 'Gols M', 'Gols V', 'Visitante', 'Pen M', 'Pen V']
+
+
+class ImportReport:
+    """Resultado de uma importação: times criados, duplicados e linhas recusadas."""
+
+    def __init__(self):
+        self.added = []
+        self.duplicates = []
+        # (linha, motivo)
+        self.invalid = []
+
+    def summary(self):
+        return f"{len(self.added)} importados, {len(self.duplicates)} duplicados, {len(self.invalid)} inválidos"
+
+
+def _normalize(header):
+    text = unicodedata.normalize('NFKD', str(header or '')).encode('ascii', 'ignore').decode()
+    return text.strip().lower()
+
+
+def _column_map(header, aliases=COLUMN_ALIASES, required=('name',)):
+    """{campo: índice} se a linha for um cabeçalho reconhecível, senão None."""
+    names = [_normalize(h) for h in header]
+    mapping = {}
+    for field, options in aliases.items():
+        for i, name in enumerate(names):
+            if name in options:
+                mapping[field] = i
+                break
+    return mapping if all(field in mapping for field in required) else None
+
+
+def _cell(row, index):
+    if index is None or index >= len(row):
+        return None
+    value = row[index]
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def parse_rows(rows, invalid, detect_header=True):
+    """Converte linhas (listas de células) em TeamEntry; problemas vão para invalid."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    mapping = _column_map(first) if detect_header else None
+    if mapping is None:
+        mapping = dict(zip(POSITIONAL_COLUMNS, range(len(POSITIONAL_COLUMNS))))
+        rows = itertools.chain([first], rows)
+        start = 1
+    else:
+        start = 2
+    name_col, rating_col = mapping['name'], mapping.get('rating')
+    club_col, group_col = mapping.get('club'), mapping.get('group')
+
+    for line, row in enumerate(rows, start):
+        name = _cell(row, name_col)
+        if name is None:
+            if any(_cell(row, i) for i in range(len(row))):
+                invalid.append((line, "Nome vazio."))
+            continue  # linha em branco é ignorada
+        if len(name) > MAX_NAME_LENGTH:
+            invalid.append((line, f"Nome com mais de {MAX_NAME_LENGTH} caracteres."))
+            continue
+        rating = _cell(row, rating_col)
+        if rating is not None:
+            try:
+                # Aceita "1500", "1500.5", "1500,5" e "1.500,5".
+                rating = float(rating.replace('.', '').replace(',', '.') if ',' in rating else rating)
+            except ValueError:
+                invalid.append((line, f"Rating inválido: {rating!r}."))
+                continue
+        yield TeamEntry(line, name, rating, _cell(row, club_col), _cell(row, group_col))
+
+
+# --- SÚMULAS (RESULTADOS DA RODADA) ---
+
+class ScoreReport:
+    """Placares lidos de uma súmula, na ordem dos jogos da rodada, e as linhas recusadas."""
+
+    def __init__(self, size):
+        # (gols mandante, gols visitante, pên. mandante, pên. visitante) por jogo; None = sem linha válida.
+        self.scores = [None] * size
+        # Linha da planilha de onde veio cada placar.
+        self.lines = [None] * size
+        # (linha, motivo)
+        self.unmatched = []
+        self.invalid = []
+
+    @property
+    def missing(self):
+        """Índices dos jogos da rodada que ficaram sem placar."""
+        return [i for i, score in enumerate(self.scores) if score is None]
+
+    @property
+    def complete(self):
+        return not self.unmatched and not self.invalid and None not in self.scores
+
+    def summary(self):
+        read = len(self.scores) - len(self.missing)
+        return (f"{read} de {len(self.scores)} jogos lidos, {len(self.unmatched)} sem correspondência, "
+                f"{len(self.invalid)} inválidos")
+
+
+def _goals(value):
+    """Inteiro >= 0 (aceita '2', '2.0' e números do XLSX); None se vazio; ValueError se inválido."""
+    if value is None:
+        return None
+    try:
+        number = float(value.replace(',', '.'))
+    except ValueError:
+        raise ValueError(value) from None
+    if number < 0 or not number.is_integer():
+        raise ValueError(value)
+    return int(number)
+
+
+def _round_lookup(teams, matches):
+    """{nome, nome sem maiúsculas, id em texto: (índice do jogo, id)} só dos times da rodada."""
+    lookup = {}
+    for i, m in enumerate(matches):
+        for team_id in (m.home, m.away):
+            name = teams.name_of(team_id, '')
+            for key in ((name, name.casefold(), str(team_id)) if name else (str(team_id),)):
+                lookup.setdefault(key, (i, team_id))
+    return lookup
+
+
+def read_round_results(rows, teams, matches, detect_header=True):
+    """Casa as linhas de uma súmula com os jogos da rodada (matches). Retorna o ScoreReport.
+
+    Uma passada pelas linhas; a busca por time é O(1) num índice montado só com os
+    times da rodada. Mandante/visitante invertidos na planilha são desvirados.
+    """
+    report = ScoreReport(len(matches))
+    lookup = _round_lookup(teams, matches)
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return report
+    mapping = _column_map(first, SCORE_ALIASES, ('home', 'away', 'home_goals', 'away_goals')) if detect_header else None
+    if mapping is None:
+        mapping = dict(zip(SCORE_POSITIONAL_COLUMNS, range(len(SCORE_POSITIONAL_COLUMNS))))
+        rows = itertools.chain([first], rows)
+        start = 1
+    else:
+        start = 2
+    columns = [mapping.get(field) for field in SCORE_POSITIONAL_COLUMNS]
+
+    for line, row in enumerate(rows, start):
+        home, hg, ag, away, hp, ap = (_cell(row, i) for i in columns)
+        if home is None and away is None:
+            if any(_cell(row, i) for i in range(len(row))):
+                report.unmatched.append((line, "Linha sem times."))
+            continue  # linha em branco é ignorada
+        found = []
+        for name in (home, away):
+            entry = lookup.get(name) or lookup.get((name or '').casefold())
+            if entry is None:
+                report.unmatched.append((line, f"Time fora desta rodada: {name!r}."))
+                break
+            found.append(entry)
+        if len(found) < 2:
+            continue
+        (idx, home_id), (away_idx, away_id) = found
+        match = matches[idx]
+        if idx != away_idx or home_id == away_id:
+            report.unmatched.append((line, f"{home} e {away} não se enfrentam nesta rodada."))
+            continue
+        if report.scores[idx] is not None:
+            report.invalid.append((line, f"Jogo repetido (já lido na linha {report.lines[idx]})."))
+            continue
+        try:
+            hg, ag, hp, ap = _goals(hg), _goals(ag), _goals(hp), _goals(ap)
+        except ValueError as e:
+            report.invalid.append((line, f"Placar inválido: {e.args[0]!r}."))
+            continue
+        if hg is None or ag is None:
+            report.invalid.append((line, "Placar incompleto."))
+            continue
+        if hg == ag:
+            if hp is None or ap is None:
+                report.invalid.append((line, "Empate sem pênaltis."))
+                continue
+            if hp == ap:
+                report.invalid.append((line, "Pênaltis não podem empatar."))
+                continue
+        else:
+            hp = ap = None
+        if home_id != match.home:
+            hg, ag, hp, ap = ag, hg, ap, hp
+        report.scores[idx] = (hg, ag, hp, ap)
+        report.lines[idx] = line
+    return report
+
+
+def score_sheet_rows(teams, matches):
+    """Modelo de súmula da rodada (para csv_bytes/write_csv com SCORE_SHEET_COLUMNS)."""
+    for i, m in enumerate(matches, 1):
+        yield {'Jogo': i, 'Mandante': teams.name_of(m.home), 'Gols M': '', 'Gols V': '',
+               'Visitante': teams.name_of(m.away), 'Pen M': '', 'Pen V': ''}
+
+
+# --- LEITORES (linha a linha) ---
+
+def text_rows(text):
+    """Texto colado: um nome por linha (importar com detect_header=False)."""
+    for line in io.StringIO(text):
+        yield [line.strip()]
+
+
+def csv_rows(stream):
+    """CSV em bytes ou texto; detecta ';', ',' ou tabulação pela primeira linha."""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    first = stream.readline()
+    if not first:
+        return
+    delimiter = max(';,\t', key=first.count) if any(d in first for d in ';,\t') else ','
+    yield from csv.reader(itertools.chain([first], stream), delimiter=delimiter)
+
+
+def xlsx_rows(stream):
+    """Primeira aba de um XLSX, em modo somente leitura (openpyxl, opcional)."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def file_rows(stream, filename):
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        return xlsx_rows(stream)
+    return csv_rows(stream)
+
+
+def import_teams(registry, rows, detect_header=True):
+    """Uma passada: lê, valida e inscreve. Retorna o ImportReport."""
+    report = ImportReport()
+    report.added, report.duplicates = registry.add_entries(parse_rows(rows, report.invalid, detect_header))
+    return report
+
+
+def main(argv=None):
+    from torneio.registry import TeamRegistry
+
+    parser = argparse.ArgumentParser(description="Valida uma planilha de inscrição ou uma súmula de rodada (CSV/XLSX).")
+    parser.add_argument('arquivo')
+    parser.add_argument('--torneio', help="torneio salvo (JSON): valida o arquivo como súmula da rodada em andamento")
+    args = parser.parse_args(argv)
+    if args.torneio:
+        return check_score_sheet(args.arquivo, args.torneio)
+    with open(args.arquivo, 'rb') as f:
+        report = import_teams(TeamRegistry(), file_rows(f, args.arquivo))
+    print(report.summary())
+    for entry in report.duplicates:
+        print(f"  linha {entry.line}: duplicado: {entry.name}")
+    for line, reason in report.invalid:
+        print(f"  linha {line}: {reason}")
+    return 1 if report.invalid else 0
+
+
+def check_score_sheet(path, tournament_path):
+    from torneio.export import load_tournament
+
+    state = load_tournament(tournament_path)
+    if state['phase'] == 'swiss':
+        matches = state['rounds'][-1].matches if state['rounds'] else []
+    elif state['phase'] == 'playoff_gameplay':
+        matches = state['playoff_schedule'][-1].matches
+    else:
+        print("O torneio não tem rodada em andamento.")
+        return 1
+    with open(path, 'rb') as f:
+        report = read_round_results(file_rows(f, path), state['teams'], matches)
+    print(report.summary())
+    for line, reason in sorted(report.unmatched + report.invalid):
+        print(f"  linha {line}: {reason}")
+    missing = report.missing
+    for i in missing[:MAX_LISTED]:
+        m = matches[i]
+        print(f"  sem placar: {state['teams'].name_of(m.home)} x {state['teams'].name_of(m.away)}")
+    if len(missing) > MAX_LISTED:
+        print(f"  ... e mais {len(missing) - MAX_LISTED} jogos sem placar")
+    return 0 if report.complete else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# --- CLASSIFICAÇÃO AO VIVO (SSE) ---
+# Telões e celulares de espectadores recebem a classificação por
+# server-sent events em vez de recarregar a página inteira:
+#
+#   GET /torneios/{id}/ao-vivo   fluxo text/event-stream
+#   GET /torneios/{id}/painel    página pronta que consome o fluxo
+#
+# Ao conectar, o cliente recebe um evento "snapshot" com a tabela inteira;
+# depois, a cada rodada/jogo confirmado, um evento "diff" só com os times que
+# mudaram e, em "posicoes", os pares [id, nova posição] de quem mudou de
+# lugar; o cliente corrige a ordem que já tem (se mais da metade mudou, vai
+# a ordem inteira em "ordem", que é menor). Há um único vigia por torneio: ele
+# percebe a nova revisão, calcula o diff e o codifica UMA vez, e os mesmos
+# bytes são entregues a todas as conexões, sem recalcular nada por espectador.
+# Quem não der conta de consumir (fila cheia) recebe um snapshot novo.
+
+import asyncio
+import json
+
+# Segundos entre checagens de revisão nova (envios pela própria API avisam na hora).
+POLL_INTERVAL = 0.5
+# Comentário vazio periódico para proxies não derrubarem a conexão.
+KEEPALIVE_INTERVAL = 15.0
+# Eventos pendentes por conexão antes de desistir dos diffs e mandar snapshot.
+QUEUE_SIZE = 16
+
+# Campos de cada time, na ordem em que vão no JSON (listas, não objetos, para
+# o diff ficar curto).
+FIELDS = ('time', 'vitorias', 'derrotas', 'gols_pro', 'saldo', 'status', 'bye')
+
+
+def standings_snapshot(tournament):
+    """(revisão, fase, ordem dos ids, {id: linha}) da classificação atual."""
+    current_bye = None
+    if tournament.phase == 'swiss' and tournament.rounds and not tournament.rounds[-1].completed:
+        current_bye = tournament.rounds[-1].bye
+    order, rows = [], {}
+    for t in tournament.teams.standings.ranked():
+        order.append(t.id)
+        rows[t.id] = (t.name, t.wins, t.losses, t.goals_for, t.goal_diff, t.status,
+                      'atual' if t.id == current_bye else t.received_bye)
+    return tournament.revision, tournament.phase, order, rows
+
+
+def snapshot_data(snapshot):
+    revision, phase, order, rows = snapshot
+    return {'revisao': revision, 'fase': phase, 'campos': FIELDS, 'ordem': order,
+            'times': {tid: list(row) for tid, row in rows.items()}}
+
+
+def diff_data(old, new):
+    """Só o que mudou de old para new (qualquer distância de revisões)."""
+    _, _, old_order, old_rows = old
+    revision, phase, order, rows = new
+    data = {'revisao': revision, 'fase': phase,
+            'times': {tid: list(row) for tid, row in rows.items() if old_rows.get(tid) != row}}
+    if order != old_order:
+        # Só quem mudou de lugar (índice a partir de 0); os demais continuam onde estavam.
+        # Se mais da metade mudou, os pares ficam maiores que a ordem inteira: manda a ordem.
+        old_pos = {tid: i for i, tid in enumerate(old_order)}
+        moved = [[tid, i] for i, tid in enumerate(order) if old_pos.get(tid) != i]
+        if 2 * len(moved) <= len(order):
+            data['posicoes'] = moved
+        else:
+            data['ordem'] = order
+    removed = [tid for tid in old_rows if tid not in rows]
+    if removed:
+        data['removidos'] = removed
+    return data
+
+
+def sse_event(event, data, event_id):
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+
+class _Feed:
+    """Estado compartilhado de um torneio: último snapshot e filas das conexões."""
+
+    def __init__(self):
+        self.snapshot = None
+        self.snapshot_event = b''
+        self.queues = set()
+        self.wake = asyncio.Event()
+        self.task = None
+
+    def publish(self, snapshot):
+        old = self.snapshot
+        self.snapshot = snapshot
+        self.snapshot_event = sse_event('snapshot', snapshot_data(snapshot), snapshot[0])
+        if old is None:
+            return
+        chunk = sse_event('diff', diff_data(old, snapshot), snapshot[0])
+        for queue in self.queues:
+            try:
+                queue.put_nowait(chunk)
+            except asyncio.QueueFull:
+                # Conexão lenta: descarta os diffs acumulados e manda a tabela inteira.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+class LiveHub:
+    def __init__(self, manager, poll_interval=POLL_INTERVAL):
+        self.manager = manager
+        self.poll_interval = poll_interval
+        self._feeds = {}
+
+    def subscribers(self, tournament_id=None):
+        if tournament_id is not None:
+            feed = self._feeds.get(tournament_id)
+            return len(feed.queues) if feed else 0
+        return sum(len(feed.queues) for feed in self._feeds.values())
+
+    def notify(self, tournament_id):
+        """Avisa o vigia de que o torneio mudou (ex.: após um POST da API)."""
+        feed = self._feeds.get(tournament_id)
+        if feed is not None:
+            feed.wake.set()
+
+    async def _snapshot(self, tournament_id):
+        # manager.view: montado sob o lock do torneio, uma vez por revisão.
+        return await asyncio.to_thread(self.manager.view, tournament_id, ('live', 'snapshot'), standings_snapshot)
+
+    async def subscribe(self, tournament_id):
+        """Fila de eventos da conexão; levanta TournamentError se o torneio não existir."""
+        feed = self._feeds.get(tournament_id)
+        if feed is None:
+            snapshot = await self._snapshot(tournament_id)
+            feed = self._feeds.get(tournament_id)
+            if feed is None:
+                feed = self._feeds[tournament_id] = _Feed()
+                feed.publish(snapshot)
+        queue = asyncio.Queue(QUEUE_SIZE)
+        queue.put_nowait(None)  # primeiro evento: snapshot
+        feed.queues.add(queue)
+        if feed.task is None:
+            feed.task = asyncio.ensure_future(self._watch(tournament_id, feed))
+        return feed, queue
+
+    def unsubscribe(self, tournament_id, queue):
+        feed = self._feeds.get(tournament_id)
+        if feed is None:
+            return
+        feed.queues.discard(queue)
+        if not feed.queues:
+            if feed.task is not None:
+                feed.task.cancel()
+            del self._feeds[tournament_id]
+
+    async def _watch(self, tournament_id, feed):
+        while True:
+            try:
+                await asyncio.wait_for(feed.wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            feed.wake.clear()
+            tournament = await asyncio.to_thread(self.manager.get, tournament_id)
+            if tournament is None or tournament.revision == feed.snapshot[0]:
+                continue
+            feed.publish(await self._snapshot(tournament_id))
+
+    async def stream(self, tournament_id, receive, send, headers):
+        feed, queue = await self.subscribe(tournament_id)
+        disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+            while True:
+                get = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({get, disconnected}, timeout=KEEPALIVE_INTERVAL,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if get not in done:
+                    get.cancel()
+                    if disconnected in done:
+                        return
+                    chunk = b': ping\n\n'
+                else:
+                    chunk = get.result()
+                    if chunk is None:
+                        chunk = feed.snapshot_event
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            disconnected.cancel()
+            self.unsubscribe(tournament_id, queue)
+
+
+async def _wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+# --- PAINEL (página do telão) ---
+
+PANEL_HTML = """<!doctype html>
+<html lang="pt-br"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Classificação ao vivo</title>
+<style>
+  body { font-family: sans-serif; background: #0e1117; color: #fafafa; margin: 1em; }
+  table { width: 100%; border-collapse: collapse; font-size: 14px; }
+  th, td { padding: 4px; text-align: center; border-bottom: 1px solid #444; }
+  th { background: #262730; } td.time { text-align: left; }
+  #estado { font-size: 12px; color: #999; }
+</style></head>
+<body>
+<h2>📊 Classificação Geral</h2>
+<div id="estado">conectando…</div>
+<table><thead><tr><th>#</th><th>St</th><th>Time</th><th>V-D</th><th>Bye</th><th>GP</th><th>GC</th><th>SG</th></tr></thead>
+<tbody id="linhas"></tbody></table>
+<script>
+  const ICONES = {'Classificado': '🟢', 'Eliminado': '🔴'};
+  let ordem = [], times = {};
+  const esc = s => String(s).replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+  function linha(pos, r) {
+    const [nome, v, d, gp, sg, st, bye] = r;
+    const atual = bye === 'atual';
+    return `<tr><td>${pos}</td><td>${ICONES[st] || '⚪'}</td>` +
+      `<td class="time">${atual ? '<b>' + esc(nome) + ' (F)</b>' : esc(nome)}</td>` +
+      `<td>${v}-${d}</td><td>${bye ? 'Sim' : '-'}</td><td>${gp}</td><td>${gp - sg}</td><td>${sg}</td></tr>`;
+  }
+  function desenhar(msg) {
+    document.getElementById('linhas').innerHTML = ordem.map((id, i) => linha(i + 1, times[id])).join('');
+    document.getElementById('estado').textContent = `revisão ${msg.revisao} · fase ${msg.fase}`;
+  }
+  const fonte = new EventSource('ao-vivo');
+  fonte.addEventListener('snapshot', e => { const m = JSON.parse(e.data); ordem = m.ordem; times = m.times; desenhar(m); });
+  fonte.addEventListener('diff', e => {
+    const m = JSON.parse(e.data);
+    Object.assign(times, m.times);
+    (m.removidos || []).forEach(id => delete times[id]);
+    if (m.ordem) ordem = m.ordem;
+    if (m.posicoes) {
+      const movidos = new Set(m.posicoes.map(([id]) => String(id))), nova = [];
+      ordem.forEach((id, i) => { if (!movidos.has(String(id)) && id in times) nova[i] = id; });
+      m.posicoes.forEach(([id, i]) => { nova[i] = id; });
+      ordem = nova;
+    }
+    desenhar(m);
+  });
+  fonte.onerror = () => { document.getElementById('estado').textContent = 'reconectando…'; };
+</script>
+</body></html>
+"""
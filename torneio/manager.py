@@ -0,0 +1,198 @@
+# --- GERENCIADOR DE TORNEIOS ---
+# Vários torneios (divisões por categoria, sede...) vivos no mesmo processo,
+# compartilhados por todas as sessões e indexados por id.
+#
+# - Cada torneio tem seu próprio lock: operadores de divisões diferentes não
+#   esperam uns pelos outros; no mesmo torneio as gravações são serializadas.
+# - apply() confere a revisão que o operador estava vendo: se outro operador
+#   já mudou o torneio, a ação é recusada em vez de cair na rodada errada.
+# - Se uma ação falhar no meio, a cópia em memória é descartada e o torneio
+#   é recarregado do banco na próxima leitura.
+# - Outro processo (ex.: a API HTTP) pode gravar no mesmo banco: get() compara
+#   a revisão gravada com a da memória (no máximo a cada REFRESH_INTERVAL) e
+#   recarrega se ficou para trás; a gravação confere a revisão esperada
+#   dentro da transação, então nada é perdido mesmo entre duas checagens.
+# - view() calcula classificação/exportações uma vez por revisão e entrega o
+#   mesmo resultado a todos que estão assistindo; só as visões da revisão
+#   atual ficam guardadas.
+# - Com banco, no máximo MAX_LOADED torneios ficam em memória: os usados há
+#   mais tempo voltam a ser só linhas no banco e são recarregados se pedidos.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from torneio.metrics import metrics
+from torneio.tournament import StaleRevisionError, Tournament, TournamentError
+
+# Segundos entre checagens da revisão gravada por outros processos.
+REFRESH_INTERVAL = 1.0
+
+# Torneios mantidos em memória ao mesmo tempo (com banco). Abaixo do número
+# de divisões jogando ao mesmo tempo, cada leitura vira recarga do banco.
+MAX_LOADED = int(os.environ.get('TORNEIO_MAX_LOADED', 64))
+
+# Ações cujo retorno é a entrada do log de resultados (tipo, índice, payload).
+LOGGED_ACTIONS = {Tournament.submit_swiss_results, Tournament.submit_playoff_results, Tournament.undo_last_round}
+
+
+class TournamentManager:
+    def __init__(self, store=None, max_loaded=MAX_LOADED):
+        self.store = store
+        self.max_loaded = max_loaded
+        # Do usado há mais tempo para o mais recente.
+        self._tournaments = OrderedDict()
+        self._locks = {}
+        # Visões por torneio: (revisão, {tipo: valor}), só da revisão atual.
+        self._views = {}
+        self._checked = {}
+        self._registry_lock = threading.Lock()
+
+    def lock(self, tournament_id):
+        with self._registry_lock:
+            lock = self._locks.get(tournament_id)
+            if lock is None:
+                lock = self._locks[tournament_id] = threading.RLock()
+            return lock
+
+    def create(self, name=''):
+        tournament = Tournament(name=name)
+        with self.lock(tournament.id):
+            self._save(tournament)
+            self._remember(tournament)
+        return tournament
+
+    def get(self, tournament_id):
+        """Torneio em memória; (re)carrega do banco se faltar ou estiver atrás. None se não existir."""
+        tournament = self._tournaments.get(tournament_id)
+        if self.store is None:
+            return tournament
+        if tournament is not None:
+            self._touch(tournament_id)
+        now = time.monotonic()
+        if tournament is not None and now - self._checked.get(tournament_id, 0) < REFRESH_INTERVAL:
+            return tournament
+        self._checked[tournament_id] = now
+        if tournament is not None and self.store.revision(tournament_id) == tournament.revision:
+            return tournament
+        with self.lock(tournament_id):
+            # Confere de novo: quem segurava o lock pode ter acabado de gravar.
+            tournament = self._tournaments.get(tournament_id)
+            stored = self.store.revision(tournament_id)
+            if stored is None:
+                return tournament
+            if tournament is None or tournament.revision != stored:
+                saved = self.store.load(tournament_id)
+                tournament = Tournament.from_saved(tournament_id, saved)
+                self._views.pop(tournament_id, None)
+                self._remember(tournament)
+        return tournament
+
+    def list(self):
+        """(id, nome, fase) de todos os torneios conhecidos."""
+        if self.store is not None:
+            return self.store.list_tournaments()
+        return [(t.id, t.name, t.phase) for t in self._tournaments.values()]
+
+    def __len__(self):
+        return len(self._tournaments)
+
+    def apply(self, tournament_id, action, *args, revision=None):
+        """Executa action(torneio, *args) sob o lock do torneio e persiste o resultado.
+
+        revision: revisão vista pelo operador; se o torneio já mudou, levanta TournamentError.
+        """
+        with self.lock(tournament_id):
+            self._checked.pop(tournament_id, None)
+            tournament = self.get(tournament_id)
+            if tournament is None:
+                raise TournamentError("Torneio não encontrado.")
+            if revision is not None and tournament.revision != revision:
+                metrics.count('stale_revision')
+                raise StaleRevisionError()
+            before = tournament.revision
+            try:
+                out = action(tournament, *args)
+                self._save(tournament, out if action in LOGGED_ACTIONS else None, before)
+            except BaseException:
+                if self.store is not None:
+                    self._forget(tournament_id)
+                raise
+            return out
+
+    def view(self, tournament_id, kind, build):
+        """build(torneio) calculado uma vez por revisão e compartilhado entre sessões."""
+        with self.lock(tournament_id):
+            tournament = self.get(tournament_id)
+            if tournament is None:
+                raise TournamentError("Torneio não encontrado.")
+            revision, views = self._views.get(tournament_id, (None, None))
+            if revision != tournament.revision:
+                # Revisão nova: as visões da anterior não servem mais para ninguém.
+                views = {}
+                self._views[tournament_id] = (tournament.revision, views)
+            if kind in views:
+                metrics.count('view_hit')
+                return views[kind]
+            metrics.count('view_build')
+            with metrics.timer(f"view:{kind[0] if isinstance(kind, tuple) else kind}"):
+                value = build(tournament)
+            views[kind] = value
+            return value
+
+    def peek(self, tournament_id, kind):
+        """Visão já calculada para a revisão atual, sem lock nem banco; None se não houver
+        (ou se já passou da hora de conferir a revisão gravada por outro processo)."""
+        if time.monotonic() - self._checked.get(tournament_id, 0) >= REFRESH_INTERVAL:
+            return None
+        tournament = self._tournaments.get(tournament_id)
+        revision, views = self._views.get(tournament_id, (None, None))
+        if tournament is not None and views is not None and revision == tournament.revision:
+            return views.get(kind)
+        return None
+
+    def evict(self, tournament_id):
+        """Tira o torneio da memória (continua no banco)."""
+        with self.lock(tournament_id):
+            self._forget(tournament_id)
+
+    # --- MEMÓRIA (LRU) ---
+
+    def _touch(self, tournament_id):
+        with self._registry_lock:
+            if tournament_id in self._tournaments:
+                self._tournaments.move_to_end(tournament_id)
+        if len(self._tournaments) > self.max_loaded:
+            self._trim()
+
+    def _remember(self, tournament):
+        with self._registry_lock:
+            self._tournaments[tournament.id] = tournament
+            self._tournaments.move_to_end(tournament.id)
+        self._trim()
+
+    def _trim(self):
+        """Descarrega os torneios usados há mais tempo além de max_loaded."""
+        with self._registry_lock:
+            excess = len(self._tournaments) - self.max_loaded
+            oldest = list(self._tournaments)[:excess] if self.store is not None and excess > 0 else []
+        for tournament_id in oldest:
+            lock = self.lock(tournament_id)
+            # Torneio ocupado (ação ou visão em andamento) fica para a próxima vez.
+            if lock.acquire(blocking=False):
+                try:
+                    self._forget(tournament_id)
+                finally:
+                    lock.release()
+
+    def _forget(self, tournament_id):
+        with self._registry_lock:
+            self._tournaments.pop(tournament_id, None)
+        self._views.pop(tournament_id, None)
+        self._checked.pop(tournament_id, None)
+
+    def _save(self, tournament, result=None, expected_revision=None):
+        if self.store is not None:
+            with metrics.timer('store.save'):
+                self.store.save(tournament.id, tournament.state(), result, expected_revision)
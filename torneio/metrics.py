@@ -0,0 +1,172 @@
+# --- MÉTRICAS ---
+# Cronômetros e contadores leves em volta dos caminhos quentes (sorteio,
+# classificação, exportação, barra lateral, formulários). Desligado, cada
+# ponto instrumentado custa uma checagem de atributo; ligado, cada medição
+# entra num histograma por operação e, se a thread estiver dentro de um
+# rerun do Streamlit, também na lista daquele rerun (painel de admin).
+#
+# Liga com TORNEIO_METRICS=1 (ou pelo painel ?admin=1 do app). Saída no
+# formato texto do Prometheus: GET /metrics na API, ou um servidor próprio
+# com TORNEIO_METRICS_PORT=9108 no app.
+
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Limites (segundos) dos baldes do histograma.
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_DISABLED = nullcontext()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class Metrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        # nome -> [contagem, soma, máximo, contagem por balde]
+        self._timings = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # --- COLETA ---
+
+    def observe(self, name, seconds):
+        with self._lock:
+            stat = self._timings.get(name)
+            if stat is None:
+                stat = self._timings[name] = [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)]
+            stat[0] += 1
+            stat[1] += seconds
+            if seconds > stat[2]:
+                stat[2] = seconds
+            for i, limit in enumerate(BUCKETS):
+                if seconds <= limit:
+                    break
+            else:
+                i = len(BUCKETS)
+            stat[3][i] += 1
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.append((name, seconds))
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def timer(self, name):
+        """Context manager: `with metrics.timer('op'):`."""
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self, name)
+
+    def timed(self, name=None):
+        """Decorador; sem nome, usa o nome da função."""
+        def decorate(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(label, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    # --- POR RERUN ---
+
+    def start_trace(self):
+        """Passa a guardar as medições desta thread (um rerun do Streamlit)."""
+        self._local.trace = []
+
+    def end_trace(self):
+        """[(operação, segundos), ...] desde start_trace, na ordem em que terminaram."""
+        trace = getattr(self._local, 'trace', None)
+        self._local.trace = None
+        return trace or []
+
+    # --- LEITURA ---
+
+    def snapshot(self):
+        """({operação: (chamadas, soma, máximo)}, {contador: valor})."""
+        with self._lock:
+            timings = {name: (s[0], s[1], s[2]) for name, s in self._timings.items()}
+            return timings, dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    def prometheus(self, prefix='torneio'):
+        with self._lock:
+            timings = {name: (s[0], s[1], list(s[3])) for name, s in self._timings.items()}
+            counters = dict(self._counters)
+        lines = [
+            f"# HELP {prefix}_operation_seconds Tempo gasto por operação instrumentada.",
+            f"# TYPE {prefix}_operation_seconds histogram",
+        ]
+        for name in sorted(timings):
+            count, total, buckets = timings[name]
+            cumulative = 0
+            for limit, n in zip(BUCKETS, buckets):
+                cumulative += n
+                lines.append(f'{prefix}_operation_seconds_bucket{{op="{name}",le="{limit}"}} {cumulative}')
+            lines.append(f'{prefix}_operation_seconds_bucket{{op="{name}",le="+Inf"}} {count}')
+            lines.append(f'{prefix}_operation_seconds_sum{{op="{name}"}} {total:.6f}')
+            lines.append(f'{prefix}_operation_seconds_count{{op="{name}"}} {count}')
+        lines.append(f"# HELP {prefix}_events_total Contadores de eventos (cache, conflitos...).")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name in sorted(counters):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {counters[name]}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host='0.0.0.0'):
+        """Servidor HTTP em thread daemon só com /metrics (para quem não usa a API)."""
+        # Importado só aqui: http.server pesa mais na subida do que todo o pacote torneio.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Instância do processo, compartilhada por motor, app e API.
+metrics = Metrics(enabled=os.environ.get('TORNEIO_METRICS') == '1')
+timed = metrics.timed
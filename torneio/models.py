@@ -0,0 +1,177 @@
+# --- MODELO DE DADOS ---
+# Registros compactos (__slots__) para times, partidas e rodadas. As partidas
+# guardam apenas o id dos times; os nomes são resolvidos pelo TeamRegistry.
+
+
+class Team:
+    __slots__ = ('id', 'name', 'wins', 'losses', 'goals_for', 'goal_diff', 'received_bye', 'history', 'status',
+                 'rating', 'club', 'group')
+
+    # Dados opcionais da inscrição (importação de planilha).
+    OPTIONAL_FIELDS = ('rating', 'club', 'group')
+
+    def __init__(self, id, name, wins=0, losses=0, goals_for=0, goal_diff=0, received_bye=False, history=None, status='Ativo',
+                 rating=None, club=None, group=None):
+        self.id = id
+        self.name = name
+        self.wins = wins
+        self.losses = losses
+        self.goals_for = goals_for
+        self.goal_diff = goal_diff
+        self.received_bye = received_bye
+        self.history = set(history) if history else set()
+        self.status = status
+        self.rating = rating
+        self.club = club
+        self.group = group
+
+    @property
+    def goals_against(self):
+        return self.goals_for - self.goal_diff
+
+    def to_dict(self):
+        data = {
+            'id': self.id, 'name': self.name, 'wins': self.wins, 'losses': self.losses,
+            'goals_for': self.goals_for, 'goal_diff': self.goal_diff,
+            'received_bye': self.received_bye, 'history': sorted(self.history), 'status': self.status
+        }
+        for field in self.OPTIONAL_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return f"Team({self.id}, {self.name!r}, {self.wins}-{self.losses})"
+
+
+class SwissMatch:
+    __slots__ = ('home', 'away', 'home_score', 'away_score', 'h_pen', 'a_pen', 'winner_id')
+
+    def __init__(self, home, away, home_score=0, away_score=0, h_pen=None, a_pen=None, winner_id=None):
+        self.home = home
+        self.away = away
+        self.home_score = home_score
+        self.away_score = away_score
+        self.h_pen = h_pen
+        self.a_pen = a_pen
+        self.winner_id = winner_id
+
+    @property
+    def is_penalties(self):
+        return self.home_score == self.away_score and self.h_pen is not None
+
+    def set_result(self, hg, ag, hp, ap):
+        """Grava o placar (pênaltis só no empate). Retorna True se o mandante venceu."""
+        w_home = hg > ag if hg != ag else hp > ap
+        self.winner_id = self.home if w_home else self.away
+        self.home_score = hg
+        self.away_score = ag
+        if hg == ag:
+            self.h_pen = hp
+            self.a_pen = ap
+        return w_home
+
+    def clear_result(self):
+        self.home_score = self.away_score = 0
+        self.h_pen = self.a_pen = self.winner_id = None
+
+    @property
+    def loser_id(self):
+        if self.winner_id is None:
+            return None
+        return self.away if self.winner_id == self.home else self.home
+
+    def to_dict(self):
+        return {s: getattr(self, s) for s in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class PlayoffMatch:
+    __slots__ = ('id', 'label', 'home', 'away', 'h_goals', 'a_goals', 'h_pen', 'a_pen', 'is_penalties', 'winner_id')
+
+    def __init__(self, id, label, home, away, h_goals=0, a_goals=0, h_pen=0, a_pen=0, is_penalties=False, winner_id=None):
+        self.id = id
+        self.label = label
+        self.home = home
+        self.away = away
+        self.h_goals = h_goals
+        self.a_goals = a_goals
+        self.h_pen = h_pen
+        self.a_pen = a_pen
+        self.is_penalties = is_penalties
+        self.winner_id = winner_id
+
+    def set_result(self, hg, ag, hp, ap):
+        """Grava o placar; empate no tempo normal vai aos pênaltis. Retorna True se o mandante venceu."""
+        self.h_goals = hg
+        self.a_goals = ag
+        if hg != ag:
+            self.is_penalties = False
+            self.h_pen = self.a_pen = 0
+            w_home = hg > ag
+        else:
+            self.is_penalties = True
+            self.h_pen = hp
+            self.a_pen = ap
+            w_home = hp > ap
+        self.winner_id = self.home if w_home else self.away
+        return w_home
+
+    def clear_result(self):
+        self.h_goals = self.a_goals = self.h_pen = self.a_pen = 0
+        self.is_penalties = False
+        self.winner_id = None
+
+    @property
+    def loser_id(self):
+        if self.winner_id is None:
+            return None
+        return self.away if self.winner_id == self.home else self.home
+
+    def to_dict(self):
+        return {s: getattr(self, s) for s in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class SwissRound:
+    __slots__ = ('matches', 'bye', 'completed')
+
+    def __init__(self, matches, bye=None, completed=False):
+        self.matches = matches
+        self.bye = bye
+        self.completed = completed
+
+    def to_dict(self):
+        return {'matches': [m.to_dict() for m in self.matches], 'bye': self.bye, 'completed': self.completed}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([SwissMatch.from_dict(m) for m in data['matches']], data['bye'], data['completed'])
+
+
+class PlayoffRound:
+    __slots__ = ('name', 'matches', 'waiting', 'completed')
+
+    def __init__(self, name, matches, waiting=None, completed=False):
+        self.name = name
+        self.matches = matches
+        self.waiting = waiting or []
+        self.completed = completed
+
+    def to_dict(self):
+        return {'name': self.name, 'matches': [m.to_dict() for m in self.matches], 'waiting': list(self.waiting), 'completed': self.completed}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], [PlayoffMatch.from_dict(m) for m in data['matches']], data['waiting'], data['completed'])
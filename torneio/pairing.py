@@ -0,0 +1,250 @@
+# --- EMPARCEIRAMENTO SUÍÇO ---
+# Motor de emparceiramento independente do Streamlit. Os times são ordenados
+# pelo ranking, divididos em grupos de campanha (vitórias, derrotas) e cada
+# grupo é emparceirado por busca com retrocesso sobre o histórico (set) de
+# adversários. Quem sobra num grupo "flutua" para o grupo seguinte; se o último
+# grupo não fecha sem revanche, os grupos de cima são reabertos.
+
+import random
+
+from torneio.matching import max_weight_matching
+
+# Limite de passos da busca por time do grupo; evita explosão em casos patológicos.
+SEARCH_BUDGET_PER_TEAM = 50
+
+PAIRING_MODES = {'greedy': 'Rápido (grupos de campanha)', 'optimal': 'Ótimo (emparelhamento ponderado)'}
+
+# Pesos do modo ótimo, em unidades de "diferença de campanha ao quadrado".
+# Uma revanche só é aceita se evitar mais do que isso em flutuações.
+REMATCH_PENALTY = 64
+
+# Teto do modo ótimo: O(n²) arestas e blossom O(n³) passam de ~0,6 s por rodada
+# com 512 times num núcleo (e ~3 s com 768). Acima disso o torneio não inicia
+# nesse modo e optimal_pairing cai no modo rápido.
+MAX_OPTIMAL_TEAMS = 512
+
+
+def ranking_key(team):
+    return (team.wins, -team.losses, not team.received_bye, team.goal_diff, team.goals_for)
+
+
+def score_group(team):
+    return (team.wins, team.losses)
+
+
+def choose_bye(active_teams, last_round=None, rng=None):
+    """Sorteia o bye entre os perdedores da última rodada que ainda não folgaram."""
+    rng = rng or random
+    eligible = [t for t in active_teams if not t.received_bye]
+    if last_round is not None:
+        loser_ids = {m.loser_id for m in last_round.matches if m.winner_id}
+        losers = [t for t in eligible if t.id in loser_ids]
+        if losers:
+            eligible = losers
+    return rng.choice(eligible) if eligible else None
+
+
+def _search(pool, max_floaters, budget):
+    # Busca em profundidade iterativa: o primeiro time livre é emparelhado com o
+    # próximo candidato inédito; se não houver, pode flutuar (se ainda couber).
+    # cand_start == n + 1 marca que a opção de flutuar já foi tentada.
+    n = len(pool)
+    used = [False] * n
+    stack = []
+    floats_left = max_floaters
+    steps = 0
+
+    def next_free(k):
+        while k < n and used[k]:
+            k += 1
+        return k
+
+    i = next_free(0)
+    cand_start = i + 1
+    while i < n:
+        steps += 1
+        if steps > budget:
+            return None
+
+        history = pool[i].history
+        j = cand_start
+        while j < n and (used[j] or pool[j].id in history):
+            j += 1
+
+        if j < n:
+            used[i] = used[j] = True
+            stack.append((i, j))
+        elif cand_start <= n and floats_left > 0:
+            used[i] = True
+            floats_left -= 1
+            stack.append((i, -1))
+        else:
+            while True:
+                if not stack:
+                    return None
+                pi, pj = stack.pop()
+                used[pi] = False
+                if pj == -1:
+                    floats_left += 1
+                    continue
+                used[pj] = False
+                i, cand_start = pi, pj + 1
+                break
+            continue
+
+        i = next_free(i + 1)
+        cand_start = i + 1
+
+    pairs = [(pool[a], pool[b]) for a, b in stack if b != -1]
+    floaters = [pool[a] for a, b in stack if b == -1]
+    return pairs, floaters
+
+
+def _pair_group(pool, last):
+    budget = SEARCH_BUDGET_PER_TEAM * max(len(pool), 1)
+    if last:
+        return _search(pool, len(pool) % 2, budget)
+    floaters = len(pool) % 2
+    while floaters <= len(pool):
+        result = _search(pool, floaters, budget)
+        if result is not None:
+            return result
+        floaters += 2
+    return [], list(pool)
+
+
+def _pair_with_rematches(pool):
+    # Último recurso (campo pequeno demais para evitar revanches): mantém o
+    # comportamento guloso original, preferindo sempre um adversário inédito.
+    pool = list(pool)
+    pairs = []
+    while len(pool) >= 2:
+        home = pool.pop(0)
+        idx = next((k for k, c in enumerate(pool) if c.id not in home.history), 0)
+        pairs.append((home, pool.pop(idx)))
+    return pairs
+
+
+def pair_round(teams, rng=None):
+    """Emparceira os times (já sem o bye). Retorna uma lista de (mandante, visitante).
+
+    Não altera os times: registrar o histórico fica a cargo de quem chama.
+    """
+    rng = rng or random
+    ranked = list(teams)
+    rng.shuffle(ranked)
+    ranked.sort(key=ranking_key, reverse=True)
+
+    groups = []
+    for team in ranked:
+        if groups and score_group(groups[-1][0]) == score_group(team):
+            groups[-1].append(team)
+        else:
+            groups.append([team])
+
+    # stages guarda (pool, pares) de cada grupo para poder reabrir grupos acima.
+    stages = []
+    carry = []
+    g = 0
+    while g < len(groups):
+        pool = carry + groups[g]
+        last = g == len(groups) - 1
+        result = _pair_group(pool, last)
+        if result is None:
+            # Último grupo sem solução: devolve o grupo de cima para o pool e tenta de novo.
+            if not stages:
+                return [(h.id, a.id) for h, a in _pair_with_rematches(pool)]
+            prev_pool, _ = stages.pop()
+            groups[g] = prev_pool + groups[g]
+            groups.pop(g - 1)
+            g -= 1
+            carry = []
+            continue
+        pairs, carry = result
+        stages.append((pool, pairs))
+        g += 1
+
+    if carry:
+        stages.append((carry, _pair_with_rematches(carry)))
+    return [(h.id, a.id) for _, pairs in stages for h, a in pairs]
+
+
+def greedy_pairing(teams, last_round=None, rng=None):
+    """Modo rápido com a regra do bye. Retorna (pares, time_do_bye)."""
+    pool = list(teams)
+    bye = None
+    if len(pool) % 2:
+        bye = choose_bye(pool, last_round, rng)
+        if bye:
+            pool.remove(bye)
+    return pair_round(pool, rng), bye
+
+
+# --- MODO ÓTIMO ---
+# Cada rodada vira um emparelhamento perfeito de custo mínimo (blossom de
+# Edmonds). Custo de um jogo: revanche >> diferença de campanha² >> distância
+# no ranking. Com número ímpar, um vértice "BYE" entra no grafo e o custo de
+# ligá-lo a um time reflete a regra do bye (já folgou >> não perdeu na última).
+
+def _record_distance(a, b):
+    return abs(a.wins - b.wins) + abs(a.losses - b.losses)
+
+
+def optimal_pairing(teams, last_round=None, rng=None):
+    """Emparceira todos os times ativos (bye incluso). Retorna (pares, time_do_bye).
+
+    Acima de MAX_OPTIMAL_TEAMS usa o modo rápido (greedy_pairing).
+    """
+    if len(teams) > MAX_OPTIMAL_TEAMS:
+        return greedy_pairing(teams, last_round, rng)
+    rng = rng or random
+    ranked = list(teams)
+    rng.shuffle(ranked)
+    ranked.sort(key=ranking_key, reverse=True)
+    n = len(ranked)
+    if n < 2:
+        return [], (ranked[0] if ranked else None)
+
+    unit = n + 1
+    rematch = unit * REMATCH_PENALTY
+    costs = []
+    for i in range(n):
+        a = ranked[i]
+        for j in range(i + 1, n):
+            b = ranked[j]
+            d = _record_distance(a, b)
+            costs.append((i, j, (rematch if b.id in a.history else 0) + unit * d * d + (j - i)))
+
+    if n % 2:
+        loser_ids = {m.loser_id for m in last_round.matches if m.winner_id} if last_round else set()
+        for i, t in enumerate(ranked):
+            cost = rematch if t.received_bye else 0
+            if loser_ids and t.id not in loser_ids:
+                cost += unit
+            costs.append((i, n, cost + rng.randrange(unit)))
+
+    top = max(c for _, _, c in costs) + 1
+    mate = max_weight_matching([(i, j, top - c) for i, j, c in costs], maxcardinality=True)
+
+    pairs = []
+    bye = None
+    for i in range(n):
+        j = mate[i]
+        if j == n:
+            bye = ranked[i]
+        elif j > i:
+            pairs.append((ranked[i].id, ranked[j].id))
+    return pairs, bye
+
+
+def pairing_stats(teams, pairs):
+    """Conta revanches e flutuações (jogos entre campanhas diferentes) de uma rodada."""
+    by_id = {t.id: t for t in teams}
+    rematches = floats = 0
+    for h, a in pairs:
+        home, away = by_id[h], by_id[a]
+        if a in home.history:
+            rematches += 1
+        if score_group(home) != score_group(away):
+            floats += 1
+    return {'rematches': rematches, 'floats': floats}
@@ -0,0 +1,92 @@
+# --- REGISTRO DE TIMES ---
+# Índices id -> time e nome -> time mantidos em sincronia, para que as
+# buscas feitas a cada rerun do Streamlit custem O(1) em vez de percorrer a lista.
+
+from torneio.models import Team
+from torneio.standings import Standings
+
+
+class TeamRegistry:
+    def __init__(self, teams=None):
+        self._by_id = {}
+        self._by_name = {}
+        self._next_id = 1
+        self.standings = Standings()
+        for team in teams or []:
+            self._insert(team)
+
+    def _insert(self, team):
+        self._by_id[team.id] = team
+        self._by_name[team.name] = team
+        if team.id >= self._next_id:
+            self._next_id = team.id + 1
+        self.standings.add(team)
+
+    def _new_team(self, name, **extra):
+        team = Team(self._next_id, name, **extra)
+        self._insert(team)
+        return team
+
+    def add(self, name):
+        """Cria um time novo. Retorna None se o nome já estiver inscrito."""
+        if name in self._by_name:
+            return None
+        return self._new_team(name)
+
+    def add_many(self, names):
+        """Importação em lote: retorna (adicionados, duplicados)."""
+        added = []
+        duplicates = []
+        for name in names:
+            if name in self._by_name:
+                duplicates.append(name)
+            else:
+                added.append(self._new_team(name))
+        return added, duplicates
+
+    def add_entries(self, entries):
+        """Como add_many, para TeamEntry (importação de planilha): retorna (adicionados, entradas duplicadas)."""
+        added = []
+        duplicates = []
+        for entry in entries:
+            if entry.name in self._by_name:
+                duplicates.append(entry)
+            else:
+                added.append(self._new_team(entry.name, rating=entry.rating, club=entry.club, group=entry.group))
+        return added, duplicates
+
+    def remove(self, name):
+        team = self._by_name.pop(name, None)
+        if team is not None:
+            del self._by_id[team.id]
+            self.standings.remove(team.id)
+        return team
+
+    def get(self, team_id):
+        return self._by_id.get(team_id)
+
+    def by_name(self, name):
+        return self._by_name.get(name)
+
+    def name_of(self, team_id, default=None):
+        team = self._by_id.get(team_id)
+        return team.name if team is not None else default
+
+    def names(self):
+        return list(self._by_name)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, team_id):
+        return team_id in self._by_id
+
+    def to_list(self):
+        return [t.to_dict() for t in self._by_id.values()]
+
+    @classmethod
+    def from_list(cls, data):
+        return cls(Team.from_dict(d) for d in data)
@@ -0,0 +1,218 @@
+# --- REPLAYS EM PARALELO ---
+# Rejoga um torneio muitas vezes ("e se?"): outra semente de emparceiramento
+# e resultados hipotéticos sorteados por força. Cada replay é CPU puro e
+# independente, então os replays são divididos em lotes entre processos.
+#
+# - Por padrão o replay continua da fase salva: as rodadas já jogadas ficam
+#   como estão. Com from_start (--do-inicio) o torneio é refeito a partir dos
+#   times inscritos e rejogado desde a rodada 1, com a mesma configuração:
+#   é o que mostra como emparceiramentos e sementes poderiam ter mudado.
+# - O estado inicial vai para cada processo uma única vez (initializer).
+# - A semente de cada replay depende só de (semente base, índice do replay):
+#   o resultado agregado é o mesmo com 1 ou N processos.
+# - Cada lote devolve só contadores agregados, nunca o estado do torneio.
+#
+# Uso sem Streamlit:
+#   python -m torneio.replay torneio.json --replays 2000 --processos 4
+#   python -m torneio.replay torneio.json --replays 2000 --do-inicio
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from torneio.events import EventLog
+from torneio.export import tournament_from_dict
+from torneio.models import Team
+from torneio.registry import TeamRegistry
+from torneio.tournament import Tournament, TournamentError
+
+GOAL_RATE = 1.3
+# Lotes por processo: mais de um por processo equilibra a carga no fim.
+SHARDS_PER_WORKER = 4
+
+
+class ReplayStats:
+    """Contadores agregados de um conjunto de replays; somáveis entre processos."""
+
+    def __init__(self):
+        self.replays = 0
+        self.errors = 0
+        self.champions = Counter()
+        self.qualified = Counter()
+        self.seeds = Counter()        # (id do time, posição de semente)
+        self.pairings = Counter()     # (menor id, maior id) -> jogos na fase suíça
+        self.swiss_rounds = Counter()
+
+    def merge(self, other):
+        self.replays += other.replays
+        self.errors += other.errors
+        self.champions.update(other.champions)
+        self.qualified.update(other.qualified)
+        self.seeds.update(other.seeds)
+        self.pairings.update(other.pairings)
+        self.swiss_rounds.update(other.swiss_rounds)
+        return self
+
+    def add(self, tournament, seeds):
+        self.replays += 1
+        self.champions[tournament.champion] += 1
+        self.swiss_rounds[len(tournament.rounds)] += 1
+        for pos, team_id in enumerate(seeds):
+            self.seeds[(team_id, pos + 1)] += 1
+        for t in tournament.teams:
+            if t.status == 'Classificado':
+                self.qualified[t.id] += 1
+        for r in tournament.rounds:
+            for m in r.matches:
+                self.pairings[(min(m.home, m.away), max(m.home, m.away))] += 1
+
+
+def _poisson(rng, lam):
+    limit = math.exp(-lam)
+    k, p = 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def hypothetical_scores(matches, strengths, rng, goal_rate=GOAL_RATE):
+    """Placares sorteados pelo mesmo modelo de força da simulação Monte Carlo."""
+    scores = []
+    for m in matches:
+        diff = (strengths.get(m.home, 0.0) - strengths.get(m.away, 0.0)) / 2
+        hg = _poisson(rng, goal_rate * math.exp(diff))
+        ag = _poisson(rng, goal_rate * math.exp(-diff))
+        hp = ap = None
+        if hg == ag:
+            hp, ap = (5, 4) if rng.random() < 0.5 else (4, 5)
+        scores.append((hg, ag, hp, ap))
+    return scores
+
+
+def replay_seed(base_seed, index):
+    return f"{base_seed}:{index}"
+
+
+def registration_state(data):
+    """Torneio salvo de volta à inscrição: mesmos times (ids, rating, clube, grupo) e configuração, sem jogos."""
+    kept = ('id', 'name', *Team.OPTIONAL_FIELDS)
+    state = tournament_from_dict(data)
+    state.update(
+        teams=TeamRegistry.from_list([{k: v for k, v in team.items() if k in kept} for team in data['teams']]),
+        rounds=[], playoff_schedule=[], phase='registration', champion=None, vice=None, third=None,
+    )
+    state.pop('bracket', None)
+    return state
+
+
+def replay_once(data, seed, strengths=None, pairing_mode='greedy', from_start=False):
+    """Joga o torneio salvo (dict de tournament_to_dict) até o fim. Retorna (torneio, sementes do mata-mata).
+
+    from_start: refaz o torneio a partir dos times inscritos e joga desde a rodada 1.
+    """
+    strengths = strengths or {}
+    rng = random.Random(seed)
+    state = registration_state(data) if from_start else tournament_from_dict(data)
+    state['pairing_mode'] = pairing_mode
+    tournament = Tournament(rng=random.Random(rng.random()), **state)
+    if tournament.phase == 'registration':
+        tournament.start()
+    elif tournament.events is None:
+        tournament.events = EventLog(tournament.teams)
+
+    while tournament.phase == 'swiss':
+        tournament.submit_swiss_results(hypothetical_scores(tournament.rounds[-1].matches, strengths, rng))
+    # Logo após a fase suíça a classificação ainda é a usada por init_playoffs.
+    seeds = [t.id for t in tournament.teams.standings.ranked() if t.status == 'Classificado'][:tournament.playoff_size]
+    while tournament.phase == 'playoff_gameplay':
+        tournament.submit_playoff_results(hypothetical_scores(tournament.playoff_schedule[-1].matches, strengths, rng))
+    return tournament, seeds
+
+
+# --- PROCESSOS ---
+
+_WORKER = {}
+
+
+def _init_worker(data, strengths, pairing_mode, base_seed, from_start=False):
+    _WORKER.update(data=data, strengths=strengths, pairing_mode=pairing_mode, base_seed=base_seed, from_start=from_start)
+
+
+def _run_shard(first, count):
+    stats = ReplayStats()
+    for i in range(first, first + count):
+        try:
+            tournament, seeds = replay_once(_WORKER['data'], replay_seed(_WORKER['base_seed'], i),
+                                            _WORKER['strengths'], _WORKER['pairing_mode'], _WORKER['from_start'])
+        except TournamentError:
+            stats.errors += 1
+            continue
+        stats.add(tournament, seeds)
+    return stats
+
+
+def _shards(n_replays, n_shards):
+    size, extra = divmod(n_replays, n_shards)
+    first = 0
+    for k in range(n_shards):
+        count = size + (k < extra)
+        if count:
+            yield first, count
+        first += count
+
+
+def run_replays(data, n_replays, workers=None, seed=0, strengths=None, pairing_mode='greedy', from_start=False):
+    """Roda n_replays replays em `workers` processos (padrão: todos os núcleos). Retorna ReplayStats."""
+    workers = workers or os.cpu_count() or 1
+    args = (data, strengths or {}, pairing_mode, seed, from_start)
+    if workers == 1:
+        _init_worker(*args)
+        return _run_shard(0, n_replays)
+
+    total = ReplayStats()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=args) as pool:
+        futures = [pool.submit(_run_shard, first, count) for first, count in _shards(n_replays, workers * SHARDS_PER_WORKER)]
+        for future in as_completed(futures):
+            total.merge(future.result())
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m torneio.replay', description="Replays hipotéticos de um torneio salvo, em paralelo.")
+    parser.add_argument('torneio', help="arquivo JSON do torneio salvo")
+    parser.add_argument('--replays', type=int, default=1000)
+    parser.add_argument('--processos', type=int, default=None, help="padrão: todos os núcleos")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--modo', choices=('greedy', 'optimal'), default='greedy')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--do-inicio', action='store_true',
+                        help="refaz o torneio com os times inscritos e rejoga desde a rodada 1")
+    args = parser.parse_args(argv)
+
+    with open(args.torneio, encoding='utf-8') as f:
+        data = json.load(f)
+    if data['phase'] == 'champion' and not args.do_inicio:
+        parser.error("o torneio já terminou: sem --do-inicio todos os replays seriam iguais")
+    registry = tournament_from_dict(data)['teams']
+
+    start = time.perf_counter()
+    stats = run_replays(data, args.replays, args.processos, args.semente, pairing_mode=args.modo, from_start=args.do_inicio)
+    elapsed = time.perf_counter() - start
+
+    print(f"{stats.replays} replays em {elapsed:.2f} s ({stats.replays / elapsed:,.0f}/s), {stats.errors} sem mata-mata válido")
+    print(f"{'Time':<30} {'Classif.':>9} {'Título':>8} {'Semente mais comum':>20}")
+    for team_id, titles in stats.champions.most_common(args.top):
+        positions = [(n, pos) for (tid, pos), n in stats.seeds.items() if tid == team_id]
+        common = max(positions)[1] if positions else '-'
+        print(f"{registry.name_of(team_id):<30} {stats.qualified[team_id] / stats.replays:>9.1%} "
+              f"{titles / stats.replays:>8.1%} {common:>20}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,462 @@
+# --- SIMULAÇÃO MONTE CARLO ---
+# Estima, para cada time, a chance de chegar às 3 vitórias (Classificado), de
+# entrar no mata-mata e de ser campeão. Milhares de torneios andam juntos como
+# matrizes NumPy (simulações x times): cada rodada é um punhado de operações
+# vetorizadas, sem laços sobre dicionários.
+#
+# Regras reaproveitadas do motor: bye sorteado entre os perdedores da última
+# rodada que ainda não folgaram, emparceiramento dentro dos grupos de campanha
+# (vitórias, derrotas) na ordem do ranking, com o último de um grupo ímpar
+# flutuando para o grupo de baixo, sementes do mata-mata na ordem da
+# classificação (com os desempates configurados no torneio) e os formatos de
+# chave de init_playoffs/advance_playoff_round para 3 a 8 classificados (acima
+# disso, a mesma chave de torneio.bracket, jogada nível a nível).
+#
+# Revanches: cada simulação guarda os adversários de cada time (tabela
+# simulações x times x jogos; um time joga no máximo MAX_SWISS_GAMES jogos
+# suíços). Um par repetido é trocado com o par vizinho, como a busca do motor
+# faz ao pular para o próximo candidato do grupo; fica a revanche só se
+# nenhuma troca com os vizinhos a evitar. A diferença para os replays pelo
+# motor (torneio.replay, mesmo modelo de força) fica em até ~2 pontos
+# percentuais por time (tests/test_simulation.py).
+#
+# Modelo de força: gols ~ Poisson(GOAL_RATE * exp(±(força_m - força_v) / 2));
+# empate vai aos pênaltis, 50% para cada lado. rating_strengths converte o
+# rating importado (maior = mais forte) em força.
+#
+# Uso sem Streamlit:
+#   python -m torneio.simulation torneio.json --simulacoes 100000
+
+import argparse
+from collections import namedtuple
+
+import numpy as np
+
+from torneio.bracket import BYE, Bracket
+from torneio.tournament import MAX_PLAYOFF_TEAMS, Tournament
+
+GOAL_RATE = 1.3
+# Simulações por lote: limita a memória a BATCH_SIZE x times por matriz.
+BATCH_SIZE = 20000
+# Limite de células (simulações x times) por matriz: com muitos times o lote encolhe.
+MAX_BATCH_CELLS = 4000000
+# Força de um desvio-padrão de rating acima da média.
+RATING_SPREAD = 0.5
+# Jogos suíços de um time: no máximo 2 derrotas e 2 vitórias antes do 5º jogo.
+MAX_SWISS_GAMES = 5
+# Custo de uma revanche na troca de pares, em unidades de distância de campanha.
+REMATCH_COST = 100
+# Passadas de trocas entre pares vizinhos por rodada.
+REPAIR_SWEEPS = 3
+
+Odds = namedtuple('Odds', 'classified playoffs champion')
+
+
+class _Batch:
+    """Estatísticas de um lote de simulações: matrizes (simulações, times)."""
+
+    def __init__(self, teams, size, strengths, goal_rate, rng, played=None):
+        self.size = size
+        self.ids = np.array([t.id for t in teams])
+        self.strength = np.array([strengths.get(t.id, 0.0) for t in teams], dtype=float)
+        self.goal_rate = goal_rate
+        self.rng = rng
+        shape = (size, len(teams))
+        self.wins = np.broadcast_to(np.array([t.wins for t in teams]), shape).copy()
+        self.losses = np.broadcast_to(np.array([t.losses for t in teams]), shape).copy()
+        self.goals_for = np.broadcast_to(np.array([t.goals_for for t in teams]), shape).copy()
+        self.goal_diff = np.broadcast_to(np.array([t.goal_diff for t in teams]), shape).copy()
+        self.bye = np.broadcast_to(np.array([t.received_bye for t in teams]), shape).copy()
+        self.lost_last = np.zeros(shape, dtype=bool)
+        self.rows = np.arange(size)[:, None]
+        # Adversários suíços por simulação: índice do adversário (-1 = vazio) e se o time venceu.
+        opponents, won, games = played if played is not None else _played_table(len(teams), [])
+        self.opponents = np.broadcast_to(opponents, (size, *opponents.shape)).copy()
+        self.won = np.broadcast_to(won, (size, *won.shape)).copy()
+        self.games = np.broadcast_to(games, shape).copy()
+
+    def play(self, rows, home, away, valid=None):
+        """Joga os confrontos (home[r, j] x away[r, j]) das linhas rows. Retorna (vencedores, perdedores)."""
+        diff = (self.strength[home] - self.strength[away]) / 2
+        h_goals = self.rng.poisson(self.goal_rate * np.exp(diff))
+        a_goals = self.rng.poisson(self.goal_rate * np.exp(-diff))
+        home_win = (h_goals > a_goals) | ((h_goals == a_goals) & (self.rng.random(home.shape) < 0.5))
+        if valid is None:
+            valid = np.ones(home.shape, dtype=bool)
+        # Em cada linha um time aparece no máximo uma vez, então += indexado é seguro.
+        self.wins[rows, home] += home_win & valid
+        self.losses[rows, home] += ~home_win & valid
+        self.wins[rows, away] += ~home_win & valid
+        self.losses[rows, away] += home_win & valid
+        self.goals_for[rows, home] += np.where(valid, h_goals, 0)
+        self.goals_for[rows, away] += np.where(valid, a_goals, 0)
+        self.goal_diff[rows, home] += np.where(valid, h_goals - a_goals, 0)
+        self.goal_diff[rows, away] += np.where(valid, a_goals - h_goals, 0)
+        winners = np.where(home_win, home, away)
+        losers = np.where(home_win, away, home)
+        return winners, losers
+
+    def record(self, rows, home, away, home_win, valid=None):
+        """Anota os confrontos suíços na tabela de adversários de cada simulação."""
+        if valid is None:
+            valid = np.ones(home.shape, dtype=bool)
+        r = np.broadcast_to(rows, home.shape)[valid]
+        h, a, w = home[valid], away[valid], home_win[valid]
+        kh, ka = self.games[r, h], self.games[r, a]
+        self.opponents[r, h, kh] = a
+        self.won[r, h, kh] = w
+        self.opponents[r, a, ka] = h
+        self.won[r, a, ka] = ~w
+        self.games[r, h] += 1
+        self.games[r, a] += 1
+
+    def played(self, rows, home, away):
+        """Se home[i, j] já enfrentou away[i, j] na simulação rows[i]."""
+        return (self.opponents[rows, home] == away[..., None]).any(axis=-1)
+
+    def pair_cost(self, rows, home, away, played=None):
+        if played is None:
+            played = self.played(rows, home, away)
+        distance = np.abs(self.wins[rows, home] - self.wins[rows, away])
+        distance += np.abs(self.losses[rows, home] - self.losses[rows, away])
+        return REMATCH_COST * played + distance
+
+    def avoid_rematches(self, home, away, valid):
+        """Troca adversários entre pares vizinhos (p, p+1) quando isso evita revanche.
+
+        Opções, na ordem da busca do motor: manter, (h1 x h2, a1 x a2) e (h1 x a2, a1 x h2);
+        vence a de menor custo (revanches, depois distância de campanha), e no empate a primeira.
+        Só as simulações com alguma revanche são olhadas.
+        """
+        home, away = home.copy(), away.copy()
+        rematch = self.played(self.rows, home, away) & valid
+        pairs = home.shape[1]
+        for _ in range(REPAIR_SWEEPS):
+            changed = False
+            for offset in (0, 1):
+                rows = np.flatnonzero(rematch.any(axis=1))[:, None]
+                p = np.arange(offset, pairs - 1, 2)
+                if not len(rows) or not len(p):
+                    continue
+                h1, a1, h2, a2 = home[rows, p], away[rows, p], home[rows, p + 1], away[rows, p + 1]
+                r1, r2 = rematch[rows, p], rematch[rows, p + 1]
+                options = ((h1, a1, h2, a2), (h1, h2, a1, a2), (h1, a2, a1, h2))
+                costs = np.stack(
+                    [self.pair_cost(rows, h1, a1, r1) + self.pair_cost(rows, h2, a2, r2)]
+                    + [self.pair_cost(rows, x1, y1) + self.pair_cost(rows, x2, y2) for x1, y1, x2, y2 in options[1:]]
+                )
+                swap = (r1 | r2) & valid[rows, p] & valid[rows, p + 1]
+                best = np.where(swap, costs.argmin(axis=0), 0)
+                if not best.any():
+                    continue
+                changed = True
+                for k, target in enumerate((home, away)):
+                    target[rows, p] = np.choose(best, [o[k] for o in options])
+                    target[rows, p + 1] = np.choose(best, [o[2 + k] for o in options])
+                moved = best > 0
+                rematch[rows, p] = np.where(moved, self.played(rows, home[rows, p], away[rows, p]), r1)
+                rematch[rows, p + 1] = np.where(moved, self.played(rows, home[rows, p + 1], away[rows, p + 1]), r2)
+            if not changed:
+                break
+        return home, away
+
+    def give_bye(self, rows, team):
+        self.wins[rows, team] += 1
+        self.goals_for[rows, team] += 1
+        self.goal_diff[rows, team] += 1
+        self.bye[rows, team] = True
+
+    def active(self):
+        return (self.wins < 3) & (self.losses < 3)
+
+    def ranked(self, rows, pool, tiebreak):
+        """Reordena pool (linhas x times) pela campanha, do melhor para o pior."""
+        keys = (
+            -tiebreak, self.goals_for[rows, pool], self.goal_diff[rows, pool],
+            ~self.bye[rows, pool], -self.losses[rows, pool], self.wins[rows, pool],
+        )
+        order = np.lexsort(keys, axis=1)[:, ::-1]
+        return np.take_along_axis(pool, order, axis=1)
+
+    # --- FASE SUÍÇA ---
+
+    def swiss_round(self):
+        active = self.active()
+        count = active.sum(axis=1)
+        running = count > 1
+        if not running.any():
+            return False
+        n = active.shape[1]
+
+        # Bye: quem perdeu a última rodada e ainda não folgou; senão qualquer um sem bye.
+        eligible = active & ~self.bye & running[:, None]
+        priority = eligible * (1.0 + self.lost_last) + self.rng.random(active.shape) * 0.5
+        bye_team = priority.argmax(axis=1)
+        has_bye = (count % 2 == 1) & eligible[np.arange(self.size), bye_team]
+        bye_rows = np.flatnonzero(has_bye)
+        self.give_bye(bye_rows, bye_team[bye_rows])
+        pairing = active & running[:, None]
+        pairing[bye_rows, bye_team[bye_rows]] = False
+
+        # Ordem de campanha com desempate aleatório (o motor embaralha antes de ordenar).
+        everyone = np.broadcast_to(np.arange(n), active.shape)
+        keys = (
+            self.rng.random(active.shape), self.goals_for, self.goal_diff,
+            ~self.bye, -self.losses, self.wins, pairing,
+        )
+        order = np.lexsort(keys, axis=1)[:, ::-1]
+        order = np.take_along_axis(everyone, order, axis=1)
+        half = n // 2
+        home, away = order[:, 0:2 * half:2], order[:, 1:2 * half:2]
+        valid = (2 * np.arange(half) + 1) < pairing.sum(axis=1)[:, None]
+        home, away = self.avoid_rematches(home, away, valid)
+
+        winners, losers = self.play(self.rows, home, away, valid)
+        self.record(self.rows, home, away, winners == home, valid)
+        self.lost_last[:] = False
+        self.lost_last[self.rows, losers] |= valid
+        return True
+
+    def play_fixed_round(self, pairs, bye_index):
+        """Rodada suíça já sorteada (em andamento): mesmos confrontos em todas as simulações."""
+        if bye_index is not None:
+            self.give_bye(self.rows[:, 0], np.full(self.size, bye_index))
+        if not pairs:
+            return
+        home = np.broadcast_to(np.array([h for h, _ in pairs]), (self.size, len(pairs)))
+        away = np.broadcast_to(np.array([a for _, a in pairs]), (self.size, len(pairs)))
+        winners, losers = self.play(self.rows, home, away)
+        self.record(self.rows, home, away, winners == home)
+        self.lost_last[:] = False
+        self.lost_last[self.rows, losers] = True
+
+    # --- MATA-MATA ---
+
+    def tiebreak_values(self):
+        """{critério: matriz (simulações, times)} como em torneio.tiebreaks, pelos jogos suíços simulados."""
+        has = self.opponents >= 0
+        scores = np.where(has, self.wins[self.rows[:, :, None], np.maximum(self.opponents, 0)], 0)
+        buchholz = scores.sum(axis=-1)
+        best = np.where(has, scores, np.iinfo(scores.dtype).min).max(axis=-1)
+        worst = np.where(has, scores, np.iinfo(scores.dtype).max).min(axis=-1)
+        median = np.where(has.sum(axis=-1) >= 3, buchholz - best - worst, buchholz)
+        return {
+            'buchholz': buchholz,
+            'median_buchholz': median,
+            'sonneborn_berger': (scores * self.won).sum(axis=-1),
+        }
+
+    def seeds(self, limit=MAX_PLAYOFF_TEAMS, tiebreaks=()):
+        """Classificados em ordem de classificação geral (até `limit`) e quantos são.
+
+        tiebreaks: desempates do torneio depois de gols pró, na ordem de prioridade.
+        """
+        qualified = self.wins >= 3
+        ids = np.broadcast_to(self.ids, qualified.shape)
+        values = self.tiebreak_values() if tiebreaks else {}
+        extra = tuple(values[name] for name in reversed(tiebreaks))
+        keys = (-ids, *extra, self.goals_for, self.goal_diff, ~self.bye, -self.losses, self.wins, qualified)
+        order = np.lexsort(keys, axis=1)[:, ::-1]
+        count = np.minimum(qualified.sum(axis=1), limit)
+        return order[:, :limit], count
+
+    def knockout(self, rows, slots):
+        """Joga os nós em aberto (-1) de uma chave em array de heap (linhas x 2·tamanho). Retorna os campeões.
+
+        Todas as linhas têm os mesmos nós em aberto; a disputa de 3º não muda o campeão e é pulada.
+        """
+        rows = rows[:, None]
+        level = slots.shape[1] // 4
+        while level:
+            nodes = np.arange(level, 2 * level)
+            nodes = nodes[slots[0, nodes] < 0]
+            if len(nodes):
+                slots[:, nodes], _ = self.play(rows, slots[:, 2 * nodes], slots[:, 2 * nodes + 1])
+            level //= 2
+        return slots[:, 1]
+
+    def bracket(self, rows, name, home, away, waiting):
+        """Segue advance_playoff_round a partir de uma rodada; todas as linhas têm a mesma chave."""
+        rows = rows[:, None]
+        while True:
+            winners, losers = self.play(rows, home, away)
+            if name == "Finais":
+                return winners[:, 0]
+            pool = np.concatenate([waiting, winners], axis=1)
+            count = pool.shape[1]
+            tiebreak = np.broadcast_to(np.arange(count), pool.shape)
+            if name == "Semifinais" and losers.shape[1] == 2:
+                name = "Finais"
+                pool = self.ranked(rows, pool, tiebreak)
+                losers = self.ranked(rows, losers, tiebreak[:, :2])
+                home = np.stack([pool[:, 0], losers[:, 0]], axis=1)
+                away = np.stack([pool[:, 1], losers[:, 1]], axis=1)
+            elif count == 2:
+                name = "Grande Final"
+                home, away = pool[:, :1], pool[:, 1:]
+            elif count == 4:
+                name = "Semifinais"
+                pool = self.ranked(rows, pool, tiebreak)
+                home, away = pool[:, [0, 1]], pool[:, [3, 2]]
+            elif count == 1:
+                return pool[:, 0]
+            else:
+                name = "Rodada Eliminatória"
+                pool = self.ranked(rows, pool, tiebreak)
+                home, away = pool[:, :count // 2], pool[:, ::-1][:, :count // 2]
+            waiting = pool[:, :0]
+
+
+# Primeira rodada do mata-mata por número de classificados, como em init_playoffs:
+# (nome, confrontos por posição de semente, sementes que aguardam).
+FIRST_ROUNDS = {
+    3: ("Semifinal Única", [(1, 2)], [0]),
+    4: ("Semifinais", [(0, 3), (1, 2)], []),
+    5: ("Wildcard (Repescagem)", [(3, 4)], [0, 1, 2]),
+    6: ("Quartas de Final", [(3, 4), (2, 5)], [0, 1]),
+    7: ("Quartas de Final", [(3, 4), (2, 5), (1, 6)], [0]),
+    8: ("Quartas de Final", [(0, 7), (1, 6), (2, 5), (3, 4)], []),
+}
+
+
+def bracket_template(q):
+    """Chave de torneio.bracket para q classificados, com posições de semente (0 = melhor) e -1 nos nós em aberto."""
+    slots = Bracket.seeded(list(range(1, q + 1))).slots
+    return np.array([-1 if v is None or v == BYE else v - 1 for v in slots])
+
+
+def _played_table(n, matches):
+    """Tabela inicial de adversários a partir de [(mandante, visitante, mandante venceu)] em índices."""
+    games = np.zeros(n, dtype=int)
+    for h, a, _ in matches:
+        games[h] += 1
+        games[a] += 1
+    width = max(MAX_SWISS_GAMES, int(games.max(initial=0)))
+    opponents = np.full((n, width), -1, dtype=int)
+    won = np.zeros((n, width), dtype=bool)
+    games[:] = 0
+    for h, a, home_win in matches:
+        opponents[h, games[h]], won[h, games[h]] = a, home_win
+        opponents[a, games[a]], won[a, games[a]] = h, not home_win
+        games[h] += 1
+        games[a] += 1
+    return opponents, won, games
+
+
+def rating_strengths(teams, spread=RATING_SPREAD):
+    """{id: força} a partir de Team.rating padronizado; times sem rating ficam na média. Vazio sem ratings."""
+    rated = [(t.id, t.rating) for t in teams if t.rating is not None]
+    values = np.array([r for _, r in rated], dtype=float)
+    if len(values) < 2 or not values.std():
+        return {}
+    mean, std = values.mean(), values.std()
+    return {tid: float(spread * (r - mean) / std) for tid, r in rated}
+
+
+def simulate(tournament, strengths=None, n_sims=100000, seed=None, goal_rate=GOAL_RATE, batch_size=BATCH_SIZE):
+    """Simula o restante do torneio n_sims vezes. Retorna {id do time: Odds}."""
+    teams = list(tournament.teams)
+    index = {t.id: i for i, t in enumerate(teams)}
+    strengths = strengths or {}
+    rng = np.random.default_rng(seed)
+    totals = np.zeros((3, len(teams)))
+
+    phase = tournament.phase
+    pending = None
+    if phase == 'swiss' and tournament.rounds and not tournament.rounds[-1].completed:
+        pending = tournament.rounds[-1]
+    playoff_round = None
+    if phase == 'playoff_gameplay':
+        playoff_round = tournament.playoff_schedule[-1]
+    played = _played_table(len(teams), [
+        (index[m.home], index[m.away], m.winner_id == m.home)
+        for r in tournament.rounds if r.completed for m in r.matches
+    ])
+    batch_size = min(batch_size, max(1, MAX_BATCH_CELLS // max(len(teams), 1)))
+
+    done = 0
+    while done < n_sims:
+        size = min(batch_size, n_sims - done)
+        batch = _Batch(teams, size, strengths, goal_rate, rng, played)
+        if phase == 'champion':
+            totals[0] += size * (batch.wins[0] >= 3)
+            totals[1] += size * np.isin(batch.ids, _playoff_ids(tournament))
+            totals[2][index[tournament.champion]] += size
+        elif playoff_round is not None:
+            totals[0] += size * (batch.wins[0] >= 3)
+            totals[1] += size * np.isin(batch.ids, _playoff_ids(tournament))
+            home = np.broadcast_to([index[m.home] for m in playoff_round.matches], (size, len(playoff_round.matches)))
+            away = np.broadcast_to([index[m.away] for m in playoff_round.matches], (size, len(playoff_round.matches)))
+            waiting = np.broadcast_to([index[t] for t in playoff_round.waiting or []], (size, len(playoff_round.waiting or [])))
+            if tournament.bracket is not None:
+                slots = [-1 if v is None or v == BYE else index[v] for v in tournament.bracket.slots]
+                champions = batch.knockout(np.arange(size), np.tile(slots, (size, 1)))
+            else:
+                champions = batch.bracket(np.arange(size), playoff_round.name, home, away, waiting.astype(int))
+            totals[2] += np.bincount(champions, minlength=len(teams))
+        else:
+            if pending is not None:
+                pairs = [(index[m.home], index[m.away]) for m in pending.matches]
+                batch.play_fixed_round(pairs, index[pending.bye] if pending.bye else None)
+            elif tournament.rounds:
+                last = tournament.rounds[-1]
+                batch.lost_last[:, [index[m.loser_id] for m in last.matches if m.winner_id]] = True
+            while batch.swiss_round():
+                pass
+            totals[0] += (batch.wins >= 3).sum(axis=0)
+            seeds, count = batch.seeds(tournament.playoff_size, tournament.tiebreaks)
+            for q in range(MAX_PLAYOFF_TEAMS + 1, tournament.playoff_size + 1):
+                rows = np.flatnonzero(count == q)
+                if not len(rows):
+                    continue
+                s = seeds[rows]
+                totals[1] += np.bincount(s[:, :q].ravel(), minlength=len(teams))
+                template = bracket_template(q)
+                slots = np.where(template >= 0, s[:, np.maximum(template, 0)], -1)
+                champions = batch.knockout(rows, slots)
+                totals[2] += np.bincount(champions, minlength=len(teams))
+            for q, (name, pairs, waiting) in FIRST_ROUNDS.items():
+                rows = np.flatnonzero(count == q)
+                if not len(rows):
+                    continue
+                s = seeds[rows]
+                totals[1] += np.bincount(s[:, :q].ravel(), minlength=len(teams))
+                home = s[:, [h for h, _ in pairs]]
+                away = s[:, [a for _, a in pairs]]
+                champions = batch.bracket(rows, name, home, away, s[:, waiting])
+                totals[2] += np.bincount(champions, minlength=len(teams))
+        done += size
+
+    probs = totals / n_sims
+    return {t.id: Odds(*map(float, probs[:, i])) for i, t in enumerate(teams)}
+
+
+def _playoff_ids(tournament):
+    first = tournament.playoff_schedule[0] if tournament.playoff_schedule else None
+    if first is None:
+        return []
+    return [m.home for m in first.matches] + [m.away for m in first.matches] + list(first.waiting or [])
+
+
+def main(argv=None):
+    from torneio.export import load_tournament
+
+    parser = argparse.ArgumentParser(prog='python -m torneio.simulation', description="Probabilidades de classificação e título por simulação.")
+    parser.add_argument('torneio', help="arquivo JSON do torneio salvo")
+    parser.add_argument('--simulacoes', type=int, default=100000)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20, help="quantos times listar")
+    args = parser.parse_args(argv)
+
+    state = load_tournament(args.torneio)
+    tournament = Tournament(**state)
+    odds = simulate(tournament, rating_strengths(tournament.teams), n_sims=args.simulacoes, seed=args.semente)
+    rows = sorted(odds.items(), key=lambda kv: (kv[1].champion, kv[1].classified), reverse=True)
+    print(f"{'Time':<30} {'Classif.':>9} {'Mata-mata':>10} {'Campeão':>9}")
+    for team_id, o in rows[:args.top]:
+        name = tournament.teams.name_of(team_id)
+        print(f"{name:<30} {o.classified:>9.1%} {o.playoffs:>10.1%} {o.champion:>9.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+# --- CLASSIFICAÇÃO INCREMENTAL ---
+# Times agrupados em baldes por campanha (vitórias, derrotas); dentro de cada
+# balde, uma lista ordenada pelos critérios restantes. Aplicar um resultado
+# move só o time afetado; uma rodada inteira (update_many) é reposicionada de
+# uma vez. A tabela completa é montada uma vez e reaproveitada até o próximo
+# resultado.
+#
+# Desempates por força dos adversários (torneio.tiebreaks) entram depois de
+# gols pró quando configurados com use_tiebreaks; quem atualiza o índice
+# reposiciona com update_many() os times cujos valores mudaram.
+
+from bisect import bisect_left, insort
+
+from torneio.metrics import metrics
+from torneio.tiebreaks import TIEBREAK_FIELDS
+
+# update_many remonta a tabela inteira quando mais de 1/REBUILD_FRACTION dos times mudou.
+REBUILD_FRACTION = 8
+
+
+def _bucket_key(team):
+    return (-team.wins, team.losses)
+
+
+def _entry(team):
+    # Empate total mantém a ordem de inscrição (id crescente), como o sort estável fazia.
+    return (team.received_bye, -team.goal_diff, -team.goals_for, team.id)
+
+
+class Standings:
+    def __init__(self, teams=(), tiebreaks=None, criteria=()):
+        # tiebreaks: OpponentIndex; criteria: nomes de TIEBREAKS, em ordem de prioridade.
+        self.tiebreaks = tiebreaks
+        self.criteria = tuple(criteria)
+        self._fields = [TIEBREAK_FIELDS.index(name) for name in self.criteria] if tiebreaks is not None else []
+        self._teams = {team.id: team for team in teams}
+        self.revision = 0
+        self._build()
+
+    def _build(self):
+        """Monta todos os baldes de uma vez (ordenação por balde, sem inserções uma a uma)."""
+        buckets = {}
+        placement = {}
+        for team in self._teams.values():
+            bucket, entry = _bucket_key(team), self._entry(team)
+            rows = buckets.get(bucket)
+            if rows is None:
+                rows = buckets[bucket] = []
+            rows.append(entry)
+            placement[team.id] = (bucket, entry)
+        for rows in buckets.values():
+            rows.sort()
+        self._buckets = buckets
+        self._placement = placement
+        self._bucket_order = sorted(buckets)
+        self._ordered = None
+        self.revision += 1
+
+    def _entry(self, team):
+        if not self._fields:
+            return _entry(team)
+        values = self.tiebreaks.values(team.id)
+        return (team.received_bye, -team.goal_diff, -team.goals_for, *(-values[i] for i in self._fields), team.id)
+
+    def _place(self, team):
+        bucket, entry = _bucket_key(team), self._entry(team)
+        rows = self._buckets.get(bucket)
+        if rows is None:
+            rows = self._buckets[bucket] = []
+            insort(self._bucket_order, bucket)
+        insort(rows, entry)
+        self._teams[team.id] = team
+        self._placement[team.id] = (bucket, entry)
+        self._ordered = None
+        self.revision += 1
+
+    def _unplace(self, team_id):
+        bucket, entry = self._placement.pop(team_id)
+        rows = self._buckets[bucket]
+        del rows[bisect_left(rows, entry)]
+        if not rows:
+            del self._buckets[bucket]
+            del self._bucket_order[bisect_left(self._bucket_order, bucket)]
+        self._ordered = None
+        self.revision += 1
+
+    def rebuild(self, teams):
+        self.__init__(teams, self.tiebreaks, self.criteria)
+
+    def use_tiebreaks(self, tiebreaks, criteria):
+        """Liga (ou troca) os desempates por força dos adversários e reordena a tabela."""
+        self.__init__(list(self._teams.values()), tiebreaks, criteria)
+
+    def add(self, team):
+        self._place(team)
+
+    def remove(self, team_id):
+        if team_id in self._placement:
+            self._unplace(team_id)
+            del self._teams[team_id]
+
+    def update(self, team):
+        """Reposiciona um time depois que suas estatísticas mudaram."""
+        if self._placement.get(team.id) == (_bucket_key(team), self._entry(team)):
+            return
+        self._unplace(team.id)
+        self._place(team)
+
+    def update_many(self, teams):
+        """Reposiciona de uma vez os times de uma rodada: um só recálculo da tabela."""
+        moved = [t for t in teams if self._placement.get(t.id) != (_bucket_key(t), self._entry(t))]
+        if len(moved) * REBUILD_FRACTION > len(self._teams):
+            # Boa parte da tabela mudou: remontar ordenando sai mais barato que mover time a time.
+            self._build()
+            return
+        for team in moved:
+            if self._placement.get(team.id) != (_bucket_key(team), self._entry(team)):
+                self._unplace(team.id)
+                self._place(team)
+
+    def ranked(self):
+        """Tabela completa (tupla), do primeiro ao último; reaproveitada entre leituras."""
+        if self._ordered is None:
+            with metrics.timer('ranking'):
+                teams = self._teams
+                self._ordered = tuple(teams[entry[-1]] for bucket in self._bucket_order for entry in self._buckets[bucket])
+        return self._ordered
+
+    def __len__(self):
+        return len(self._teams)
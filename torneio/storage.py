@@ -0,0 +1,372 @@
+# --- ARMAZENAMENTO (SQLite) ---
+# Estado do torneio persistido em SQLite (modo WAL), para sobreviver a um
+# restart do servidor ou à expiração da sessão do navegador.
+#
+# - tournaments / teams / rounds: fotografia do estado atual. Cada gravação
+#   reescreve só as linhas de times e rodadas que mudaram desde a última
+#   gravação (ou leitura) deste processo: inscrever um time grava um time,
+#   confirmar uma rodada grava os times dela e as rodadas tocadas. Se o banco
+#   foi alterado por outro processo desde então, reescreve tudo. Só as duas
+#   últimas rodadas de cada fase são serializadas de novo: confirmar fecha a
+#   aberta e sorteia a próxima, desfazer reabre a última e descarta a
+#   sorteada; as anteriores não mudam numa ação.
+# - results_log: log somente de acréscimo, uma linha por rodada confirmada
+#   (com os eventos de resultado dela) ou desfeita ('undo'), com o nº de
+#   eventos do EventLog depois dela.
+# - snapshots: a fotografia mais recente do EventLog (estatísticas de todos os
+#   times após N eventos); ao carregar, só os eventos posteriores a ela são
+#   reaplicados e só as linhas do log que os contêm são lidas: os eventos
+#   anteriores ficam pendentes até um desfazer chegar neles. Regravada só
+#   quando o EventLog tira (ou descarta) uma.
+#
+# Cada gravação roda numa única transação com executemany.
+
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from torneio.bracket import Bracket
+from torneio.events import PENDING, EventLog
+from torneio.models import PlayoffRound, SwissRound, Team
+from torneio.registry import TeamRegistry
+from torneio.tournament import StaleRevisionError
+
+
+class CorruptTournamentError(Exception):
+    """O torneio gravado não pode ser reconstruído (log de resultados inconsistente com os times)."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    phase TEXT NOT NULL,
+    pairing_mode TEXT NOT NULL DEFAULT 'greedy',
+    champion INTEGER, vice INTEGER, third INTEGER,
+    revision INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    playoff_size INTEGER NOT NULL DEFAULT 8,
+    bracket TEXT,
+    tiebreaks TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS teams (
+    tournament_id TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    wins INTEGER NOT NULL, losses INTEGER NOT NULL,
+    goals_for INTEGER NOT NULL, goal_diff INTEGER NOT NULL,
+    received_bye INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    history TEXT NOT NULL,
+    rating REAL, club TEXT, grp TEXT,
+    PRIMARY KEY (tournament_id, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, kind, idx)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tournament_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    round_idx INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    events_after INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_log_tournament ON results_log (tournament_id, seq);
+CREATE TABLE IF NOT EXISTS snapshots (
+    tournament_id TEXT PRIMARY KEY,
+    event_count INTEGER NOT NULL,
+    stats TEXT NOT NULL,
+    byes TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _team_key(t):
+    # O que vai para a linha do time; comparado com o gravado para achar quem mudou.
+    return (t.name, t.wins, t.losses, t.goals_for, t.goal_diff, bool(t.received_bye), t.status,
+            frozenset(t.history), t.rating, t.club, t.group)
+
+
+def _team_row(tournament_id, team_id, key):
+    name, wins, losses, gf, gd, bye, status, history, rating, club, group = key
+    return (tournament_id, team_id, name, wins, losses, gf, gd, int(bye), status, json.dumps(sorted(history)), rating, club, group)
+
+
+def _round_rows(state, previous=None):
+    """{(tipo, índice): json}; com previous (o que está gravado), reaproveita o json das rodadas que não mudam."""
+    rounds = {}
+    for kind, schedule in (('swiss', state['rounds']), ('playoff', state['playoff_schedule'])):
+        stable = max(0, sum(1 for k, _ in previous if k == kind) - 2) if previous else 0
+        for i, r in enumerate(schedule):
+            if i < stable:
+                rounds[(kind, i)] = previous[(kind, i)]
+            else:
+                rounds[(kind, i)] = json.dumps(r.to_dict(), ensure_ascii=False)
+    return rounds
+
+
+def _replay_log(log_rows, events):
+    """Aplica as linhas (tipo, payload) do results_log a events, respeitando os 'undo'."""
+    for kind, payload in log_rows:
+        payload = json.loads(payload)
+        if kind == 'undo':
+            key = tuple(payload['round_key'])
+            while events and events[-1].round_key == key:
+                events.pop()
+        else:
+            events.extend(EventLog.events_from_list(payload.get('events', [])))
+    return events
+
+
+def _log_start(counts, snapshot_count):
+    """Última linha do log a partir da qual dá para reaplicar sem ler as anteriores.
+
+    counts: [(seq, nº de eventos depois da linha)]. Serve a linha cujo nº de eventos não passa da
+    fotografia e que nenhuma linha posterior desfaz (nenhuma fica abaixo dele).
+    Retorna (seq, nº de eventos); (0, 0) lê o log inteiro.
+    """
+    lowest = None
+    for seq, count in reversed(counts):
+        if count is None:
+            # Linha gravada antes de events_after: não dá para pular nada até ela.
+            break
+        if count <= snapshot_count and (lowest is None or count <= lowest):
+            return seq, count
+        lowest = count if lowest is None else min(lowest, count)
+    return 0, 0
+
+
+class TournamentStore:
+    def __init__(self, path):
+        # Uma conexão compartilhada entre sessões do Streamlit, serializada pelo lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tournaments)")}
+        if 'name' not in columns:
+            # Bancos criados antes das divisões.
+            self._conn.execute("ALTER TABLE tournaments ADD COLUMN name TEXT NOT NULL DEFAULT ''")
+        if 'playoff_size' not in columns:
+            # Bancos criados antes da chave genérica do mata-mata.
+            for column in ('playoff_size INTEGER NOT NULL DEFAULT 8', 'bracket TEXT'):
+                self._conn.execute(f"ALTER TABLE tournaments ADD COLUMN {column}")
+        if 'tiebreaks' not in columns:
+            # Bancos criados antes dos desempates por força dos adversários.
+            self._conn.execute("ALTER TABLE tournaments ADD COLUMN tiebreaks TEXT NOT NULL DEFAULT ''")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results_log)")}
+        if 'events_after' not in columns:
+            # Bancos criados antes da leitura do log a partir da fotografia.
+            self._conn.execute("ALTER TABLE results_log ADD COLUMN events_after INTEGER")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(teams)")}
+        if 'rating' not in columns:
+            # Bancos criados antes da importação com rating/clube/grupo.
+            for column in ('rating REAL', 'club TEXT', 'grp TEXT'):
+                self._conn.execute(f"ALTER TABLE teams ADD COLUMN {column}")
+        # Conexão só de leitura para a checagem de revisão feita a cada acesso:
+        # no modo WAL ela não espera as gravações da conexão principal.
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._read_lock = threading.Lock()
+        # O que está no banco, por torneio: (revisão, {id: _team_key}, {(tipo, índice): json da rodada}).
+        self._written = {}
+
+    def close(self):
+        self._reader.close()
+        self._conn.close()
+
+    def save(self, tournament_id, state, result=None, expected_revision=None):
+        """Grava o estado (só as linhas que mudaram); se result=(tipo, índice, payload), acrescenta ao log
+        na mesma transação.
+
+        expected_revision: revisão que deve estar no banco (outro processo pode ter gravado antes).
+        """
+        teams = {t.id: _team_key(t) for t in state['teams']}
+        written = self._written.get(tournament_id)
+        rounds = _round_rows(state, written[2] if written else None)
+        revision = state.get('revision', 0)
+        bracket = state.get('bracket')
+        bracket = json.dumps(bracket.to_list()) if bracket is not None else None
+        # Fotografia nova (ou descartada por um desfazer) desde a última gravação.
+        log = state.get('events')
+        snapshot = log.latest_snapshot() if log is not None else None
+        snapshot_row = None
+        if snapshot is not None and snapshot is not log.persisted and snapshot[0] > 0:
+            count, stats, byes = snapshot
+            snapshot_row = (tournament_id, count, json.dumps([[tid, *s] for tid, s in stats.items()]),
+                            json.dumps([[tid, n] for tid, n in byes.items() if n]))
+        now = time.time()
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT revision FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+                if expected_revision is not None and row is not None and row[0] != expected_revision:
+                    raise StaleRevisionError()
+                if written is None or row is None or written[0] != row[0]:
+                    # Nada gravado (ou lido) por este processo nesta revisão: reescreve tudo.
+                    conn.execute("DELETE FROM teams WHERE tournament_id = ?", (tournament_id,))
+                    conn.execute("DELETE FROM rounds WHERE tournament_id = ?", (tournament_id,))
+                    if written is not None:
+                        rounds = _round_rows(state)
+                    written = (None, {}, {})
+                _, old_teams, old_rounds = written
+                conn.execute(
+                    "INSERT OR REPLACE INTO tournaments (id, name, phase, pairing_mode, champion, vice, third, revision, updated_at, "
+                    "playoff_size, bracket, tiebreaks) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (tournament_id, state.get('name', ''), state['phase'], state.get('pairing_mode', 'greedy'), state.get('champion'),
+                     state.get('vice'), state.get('third'), revision, now, state.get('playoff_size', 8), bracket,
+                     ','.join(state.get('tiebreaks', ())))
+                )
+                conn.executemany("DELETE FROM teams WHERE tournament_id = ? AND id = ?",
+                                 [(tournament_id, team_id) for team_id in old_teams if team_id not in teams])
+                conn.executemany("INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [_team_row(tournament_id, team_id, key) for team_id, key in teams.items()
+                                  if old_teams.get(team_id) != key])
+                conn.executemany("DELETE FROM rounds WHERE tournament_id = ? AND kind = ? AND idx = ?",
+                                 [(tournament_id, *round_key) for round_key in old_rounds if round_key not in rounds])
+                conn.executemany("INSERT OR REPLACE INTO rounds VALUES (?, ?, ?, ?)",
+                                 [(tournament_id, *round_key, data) for round_key, data in rounds.items()
+                                  if old_rounds.get(round_key) != data])
+                if result is not None:
+                    kind, round_idx, payload = result
+                    conn.execute(
+                        "INSERT INTO results_log (tournament_id, kind, round_idx, payload, created_at, events_after) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (tournament_id, kind, round_idx, json.dumps(payload, ensure_ascii=False), now,
+                         len(log.events) if log is not None else None)
+                    )
+                if snapshot is not None and snapshot is not log.persisted:
+                    conn.execute("DELETE FROM snapshots WHERE tournament_id = ?", (tournament_id,))
+                    if snapshot_row is not None:
+                        conn.execute("INSERT INTO snapshots VALUES (?, ?, ?, ?)", snapshot_row)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._written[tournament_id] = (revision, teams, rounds)
+        if snapshot is not None:
+            log.persisted = snapshot
+
+    def load(self, tournament_id):
+        """Estado salvo (None se o torneio não existir). Log inconsistente: CorruptTournamentError."""
+        with self._lock:
+            conn = self._conn
+            # Uma transação de leitura: todas as tabelas na mesma revisão.
+            conn.execute("BEGIN")
+            try:
+                tables = self._read_tables(conn, tournament_id)
+            finally:
+                conn.execute("COMMIT")
+        if tables is None:
+            return None
+        row, team_rows, round_rows, log_rows, snapshot_row, (start_seq, pending) = tables
+
+        registry = TeamRegistry(
+            Team(tid, name, wins, losses, gf, gd, bool(bye), json.loads(history), status, rating, club, group)
+            for tid, name, wins, losses, gf, gd, bye, status, history, rating, club, group in team_rows
+        )
+        name, phase, pairing_mode, champion, vice, third, revision, playoff_size, bracket, tiebreaks = row
+        written = (revision, {t.id: _team_key(t) for t in registry}, {(k, i): d for k, i, d in round_rows})
+
+        # Reaplica o log depois da fotografia; os eventos anteriores só são lidos se preciso.
+        events = _replay_log(log_rows, [PENDING] * pending)
+        snapshot = None
+        if snapshot_row is not None:
+            count, stats, byes = snapshot_row
+            snapshot = (count, {tid: (w, l, gf, gd, bool(bye), status) for tid, w, l, gf, gd, bye, status in json.loads(stats)},
+                        Counter(dict(json.loads(byes))))
+        try:
+            event_log = EventLog.replayed(registry, events, snapshot, load_prefix=lambda: self._log_until(tournament_id, start_seq)) \
+                if phase != 'registration' else None
+        except ValueError as e:
+            raise CorruptTournamentError(f"Torneio {tournament_id} corrompido no banco: {e}") from e
+        # A próxima gravação deste torneio só reescreve o que mudar a partir daqui.
+        self._written[tournament_id] = written
+
+        return {
+            'name': name,
+            'teams': registry,
+            'rounds': [SwissRound.from_dict(json.loads(d)) for k, _, d in round_rows if k == 'swiss'],
+            'playoff_schedule': [PlayoffRound.from_dict(json.loads(d)) for k, _, d in round_rows if k == 'playoff'],
+            'phase': phase, 'pairing_mode': pairing_mode,
+            'champion': champion, 'vice': vice, 'third': third,
+            'revision': revision,
+            'playoff_size': playoff_size,
+            'bracket': Bracket.from_list(json.loads(bracket)) if bracket else None,
+            'tiebreaks': tuple(tiebreaks.split(',')) if tiebreaks else (),
+            'events': event_log,
+        }
+
+    @staticmethod
+    def _read_tables(conn, tournament_id):
+        row = conn.execute(
+            "SELECT name, phase, pairing_mode, champion, vice, third, revision, playoff_size, bracket, tiebreaks "
+            "FROM tournaments WHERE id = ?",
+            (tournament_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        team_rows = conn.execute(
+            "SELECT id, name, wins, losses, goals_for, goal_diff, received_bye, status, history, rating, club, grp "
+            "FROM teams WHERE tournament_id = ? ORDER BY id",
+            (tournament_id,)
+        ).fetchall()
+        round_rows = conn.execute(
+            "SELECT kind, idx, data FROM rounds WHERE tournament_id = ? ORDER BY kind, idx", (tournament_id,)
+        ).fetchall()
+        snapshot_row = conn.execute(
+            "SELECT event_count, stats, byes FROM snapshots WHERE tournament_id = ?", (tournament_id,)
+        ).fetchone()
+        start = (0, 0)
+        if snapshot_row is not None:
+            counts = conn.execute(
+                "SELECT seq, events_after FROM results_log WHERE tournament_id = ? ORDER BY seq", (tournament_id,)
+            ).fetchall()
+            start = _log_start(counts, snapshot_row[0])
+        log_rows = conn.execute(
+            "SELECT kind, payload FROM results_log WHERE tournament_id = ? AND seq > ? ORDER BY seq", (tournament_id, start[0])
+        ).fetchall()
+        return row, team_rows, round_rows, log_rows, snapshot_row, start
+
+    def _log_until(self, tournament_id, last_seq):
+        """Eventos das linhas do log até last_seq (as que o load pulou por causa da fotografia)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, payload FROM results_log WHERE tournament_id = ? AND seq <= ? ORDER BY seq", (tournament_id, last_seq)
+            ).fetchall()
+        return _replay_log(rows, [])
+
+    def revision(self, tournament_id):
+        with self._read_lock:
+            row = self._reader.execute("SELECT revision FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+        return row[0] if row else None
+
+    def latest_active(self):
+        """Id do torneio em andamento mais recente (para retomar após um restart)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM tournaments WHERE phase != 'champion' ORDER BY updated_at DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_tournaments(self):
+        """(id, nome, fase) de todos os torneios, do mais recente para o mais antigo."""
+        with self._lock:
+            return self._conn.execute("SELECT id, name, phase FROM tournaments ORDER BY updated_at DESC").fetchall()
+
+    def results(self, tournament_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, kind, round_idx, payload, created_at FROM results_log WHERE tournament_id = ? ORDER BY seq",
+                (tournament_id,)
+            ).fetchall()
+        return [{'seq': s, 'kind': k, 'round_idx': i, 'round': json.loads(p), 'created_at': c} for s, k, i, p, c in rows]
@@ -0,0 +1,84 @@
+# --- DESEMPATE POR FORÇA DOS ADVERSÁRIOS ---
+# Critérios opcionais aplicados depois de gols pró, na ordem escolhida:
+#   buchholz          soma das vitórias dos adversários enfrentados
+#   median_buchholz   o mesmo, sem o melhor e o pior adversário (3+ jogos)
+#   sonneborn_berger  soma das vitórias dos adversários que o time venceu
+#
+# Os adversários ficam num índice de adjacência (id -> [(adversário, venceu)])
+# alimentado jogo a jogo pela fase suíça; o bye não conta. Depois de uma
+# rodada, só os times dela e os adversários deles são recalculados, cada um em
+# O(jogos do time): o custo é proporcional aos jogos da rodada, não ao torneio.
+
+TIEBREAKS = {
+    'buchholz': 'Buchholz',
+    'median_buchholz': 'Buchholz mediano',
+    'sonneborn_berger': 'Sonneborn-Berger',
+}
+TIEBREAK_FIELDS = tuple(TIEBREAKS)
+
+_EMPTY = (0, 0, 0)
+
+
+class OpponentIndex:
+    def __init__(self, registry):
+        self.registry = registry
+        self._opponents = {}
+        # id -> (buchholz, median_buchholz, sonneborn_berger)
+        self._values = {}
+
+    @classmethod
+    def from_rounds(cls, registry, rounds):
+        """Índice montado a partir das rodadas suíças já concluídas (torneio carregado)."""
+        index = cls(registry)
+        for r in rounds:
+            if r.completed:
+                for m in r.matches:
+                    index.add_match(m.home, m.away, m.winner_id)
+        index.refresh(index._opponents)
+        return index
+
+    def add_match(self, home, away, winner_id):
+        self._opponents.setdefault(home, []).append((away, winner_id == home))
+        self._opponents.setdefault(away, []).append((home, winner_id == away))
+
+    def remove_match(self, home, away):
+        """Retira o jogo mais recente entre os dois (desfazer rodada)."""
+        for team_id, opponent in ((home, away), (away, home)):
+            games = self._opponents[team_id]
+            for i in range(len(games) - 1, -1, -1):
+                if games[i][0] == opponent:
+                    del games[i]
+                    break
+
+    def opponents(self, team_id):
+        return [opponent for opponent, _ in self._opponents.get(team_id, ())]
+
+    def refresh(self, team_ids):
+        """Recalcula os times cuja campanha mudou e os adversários deles. Retorna os ids com valores novos."""
+        dirty = set(team_ids)
+        for team_id in team_ids:
+            dirty.update(self.opponents(team_id))
+        changed = []
+        for team_id in dirty:
+            values = self._compute(team_id)
+            if self._values.get(team_id, _EMPTY) != values:
+                self._values[team_id] = values
+                changed.append(team_id)
+        return changed
+
+    def _compute(self, team_id):
+        games = self._opponents.get(team_id)
+        if not games:
+            return _EMPTY
+        get = self.registry.get
+        scores = [get(opponent).wins for opponent, _ in games]
+        buchholz = sum(scores)
+        median = buchholz - max(scores) - min(scores) if len(scores) >= 3 else buchholz
+        sonneborn_berger = sum(score for score, (_, won) in zip(scores, games) if won)
+        return (buchholz, median, sonneborn_berger)
+
+    def values(self, team_id):
+        return self._values.get(team_id, _EMPTY)
+
+    def value(self, team_id, name):
+        return self._values.get(team_id, _EMPTY)[TIEBREAK_FIELDS.index(name)]
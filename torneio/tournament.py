@@ -0,0 +1,462 @@
+# --- MOTOR DO TORNEIO ---
+# Estado e regras do torneio sem dependência do Streamlit: inscrição, fase
+# suíça, mata-mata e desfazer. A interface (app.py) só lê o estado, monta os
+# formulários e repassa os placares; erros de regra viram TournamentError.
+
+import random
+import uuid
+from collections import Counter
+
+from torneio.bracket import Bracket, level_name, node_level
+from torneio.events import EventLog
+from torneio.metrics import timed
+from torneio.models import PlayoffMatch, PlayoffRound, SwissMatch, SwissRound
+from torneio.pairing import MAX_OPTIMAL_TEAMS, greedy_pairing, optimal_pairing, ranking_key
+from torneio.registry import TeamRegistry
+from torneio.tiebreaks import TIEBREAKS, OpponentIndex
+
+MIN_TEAMS = 6
+MIN_PLAYOFF_TEAMS = 3
+MAX_PLAYOFF_TEAMS = 8
+# Vagas no mata-mata oferecidas na inscrição; acima de MAX_PLAYOFF_TEAMS vale a chave genérica (torneio.bracket).
+PLAYOFF_SIZES = (8, 16, 32, 64, 128)
+
+STATE_KEYS = ('name', 'teams', 'rounds', 'playoff_schedule', 'phase', 'pairing_mode', 'champion', 'vice', 'third', 'revision',
+              'playoff_size', 'bracket', 'tiebreaks', 'events')
+
+
+class TournamentError(Exception):
+    """Violação de regra do torneio; a mensagem é exibida ao usuário."""
+
+
+class StaleRevisionError(TournamentError):
+    """O torneio mudou desde a revisão que o operador estava vendo."""
+
+    def __init__(self, message="O torneio foi atualizado por outro operador. Confira a tela e tente de novo."):
+        super().__init__(message)
+
+
+class Tournament:
+    def __init__(self, tournament_id=None, teams=None, rounds=None, playoff_schedule=None, phase='registration',
+                 pairing_mode='greedy', champion=None, vice=None, third=None, revision=0, events=None, rng=None, name='',
+                 playoff_size=MAX_PLAYOFF_TEAMS, bracket=None, tiebreaks=()):
+        self.id = tournament_id or uuid.uuid4().hex
+        # Rótulo da divisão (categoria, sede...) quando vários torneios rodam juntos.
+        self.name = name
+        self.teams = teams if teams is not None else TeamRegistry()
+        self.rounds = rounds if rounds is not None else []
+        # Jogos suíços sorteados por par de times: desfazer uma rodada só apaga do
+        # histórico os confrontos que não aconteceram em outra rodada.
+        self.meetings = Counter(_pair(m.home, m.away) for r in self.rounds for m in r.matches)
+        self.playoff_schedule = playoff_schedule if playoff_schedule is not None else []
+        self.phase = phase
+        self.pairing_mode = pairing_mode
+        self.champion = champion
+        self.vice = vice
+        self.third = third
+        self.revision = revision
+        # Máximo de classificados no mata-mata; a chave (Bracket) só existe acima de MAX_PLAYOFF_TEAMS.
+        self.playoff_size = playoff_size
+        self.bracket = bracket
+        # Desempates opcionais depois de gols pró (nomes de torneio.tiebreaks.TIEBREAKS).
+        self.tiebreaks = tuple(tiebreaks)
+        self.opponents = None
+        if self.tiebreaks:
+            self._attach_tiebreaks()
+        self.events = events
+        self.rng = rng or random.Random()
+        # Avisos não bloqueantes para a interface (ex.: excesso de classificados).
+        self.notices = []
+
+    @classmethod
+    def from_saved(cls, tournament_id, saved, rng=None):
+        """Reconstrói a partir do dicionário devolvido por TournamentStore.load."""
+        return cls(tournament_id, rng=rng, **saved)
+
+    def _attach_tiebreaks(self):
+        self.opponents = OpponentIndex.from_rounds(self.teams, self.rounds)
+        self.teams.standings.use_tiebreaks(self.opponents, self.tiebreaks)
+
+    def _refresh_tiebreaks(self, team_ids):
+        """Recalcula os desempates dos times de uma rodada (e adversários) e reposiciona quem mudou."""
+        get = self.teams.get
+        self.teams.standings.update_many([get(team_id) for team_id in self.opponents.refresh(team_ids)])
+
+    def state(self):
+        return {k: getattr(self, k) for k in STATE_KEYS}
+
+    def bump_revision(self):
+        # Toda mudança que altera a classificação ou o histórico invalida as exportações.
+        self.revision += 1
+
+    def rank_ids(self, team_ids):
+        teams = [self.teams.get(i) for i in team_ids]
+        return [t.id for t in sorted(teams, key=ranking_key, reverse=True)]
+
+    # --- INSCRIÇÃO ---
+
+    def add_team(self, name):
+        if not name:
+            raise TournamentError("Digite um nome.")
+        team = self.teams.add(name)
+        if team is None:
+            raise TournamentError("Time já existe.")
+        self.bump_revision()
+        return team
+
+    def add_teams(self, names):
+        added, duplicates = self.teams.add_many(names)
+        self.bump_revision()
+        return added, duplicates
+
+    def import_teams(self, rows, detect_header=True):
+        """Inscrição a partir de linhas de planilha/texto (torneio.importer). Retorna o ImportReport."""
+        # Importado aqui para `python -m torneio.importer` não carregar o módulo duas vezes.
+        from torneio.importer import import_teams
+
+        report = import_teams(self.teams, rows, detect_header)
+        self.bump_revision()
+        return report
+
+    def remove_team(self, name):
+        team = self.teams.remove(name)
+        self.bump_revision()
+        return team
+
+    def start(self, pairing_mode=None, playoff_size=None, tiebreaks=None):
+        if len(self.teams) < MIN_TEAMS:
+            raise TournamentError(f"É necessário no mínimo {MIN_TEAMS} times. Atual: {len(self.teams)}")
+        if playoff_size is not None and playoff_size < MIN_PLAYOFF_TEAMS:
+            raise TournamentError(f"O mata-mata precisa de no mínimo {MIN_PLAYOFF_TEAMS} vagas.")
+        unknown = [name for name in tiebreaks or () if name not in TIEBREAKS]
+        if unknown:
+            raise TournamentError(f"Critério de desempate desconhecido: {', '.join(unknown)}.")
+        if (pairing_mode or self.pairing_mode) == 'optimal' and len(self.teams) > MAX_OPTIMAL_TEAMS:
+            raise TournamentError(f"O emparceiramento ótimo aceita até {MAX_OPTIMAL_TEAMS} times "
+                                  f"({len(self.teams)} inscritos). Use o modo rápido.")
+        if pairing_mode is not None:
+            self.pairing_mode = pairing_mode
+        if playoff_size is not None:
+            self.playoff_size = playoff_size
+        if tiebreaks is not None:
+            self.tiebreaks = tuple(tiebreaks)
+        if self.tiebreaks:
+            self._attach_tiebreaks()
+        self.phase = 'swiss'
+        self.events = EventLog(self.teams)
+        self.generate_swiss_round()
+
+    # --- FASE SUÍÇA ---
+
+    @timed()
+    def apply_round_results(self, round_data, scores, round_key, bye=None):
+        """Valida a rodada inteira e aplica todos os placares num passo: uma entrada por time no log
+        de eventos e um único recálculo da classificação. Nada muda se algum placar for inválido.
+
+        Único caminho de escrita de resultados: as estatísticas são a projeção do log de eventos.
+        """
+        _validate_scores(scores, len(round_data.matches))
+        team_ids = [m_id for m in round_data.matches for m_id in (m.home, m.away)]
+        if bye:
+            team_ids.append(bye)
+        for team_id in team_ids:
+            if team_id not in self.teams:
+                raise TournamentError(f"Erro Crítico: ID {team_id} não encontrado.")
+        results = [(bye, 1, 0, True, True)] if bye else []
+        for match, (hg, ag, hp, ap) in zip(round_data.matches, scores):
+            w_home = match.set_result(hg, ag, hp, ap)
+            results.append((match.home, hg, ag, w_home, False))
+            results.append((match.away, ag, hg, not w_home, False))
+        return self.events.record_round(self.teams, round_key, results)
+
+    @timed()
+    def generate_swiss_round(self):
+        active_teams = [t for t in self.teams if t.status == 'Ativo' and t.losses < 3]
+        last_round = self.rounds[-1] if self.rounds else None
+
+        if self.pairing_mode == 'optimal':
+            pairs, bye_team = optimal_pairing(active_teams, last_round, self.rng)
+        else:
+            pairs, bye_team = greedy_pairing(active_teams, last_round, self.rng)
+
+        matches = []
+        for home_id, away_id in pairs:
+            matches.append(SwissMatch(home_id, away_id))
+            self.teams.get(home_id).history.add(away_id)
+            self.teams.get(away_id).history.add(home_id)
+            self.meetings[_pair(home_id, away_id)] += 1
+
+        self.rounds.append(SwissRound(matches, bye_team.id if bye_team else None))
+
+    @timed()
+    def submit_swiss_results(self, scores):
+        """scores: (gols mandante, gols visitante, pên. mandante, pên. visitante) por jogo, na ordem da rodada.
+
+        Retorna a entrada do log de resultados: (tipo, índice, payload).
+        """
+        round_idx = len(self.rounds) - 1
+        current_round = self.rounds[round_idx]
+        if current_round.completed:
+            raise TournamentError("Rodada já concluída.")
+        round_key = ('swiss', round_idx)
+        self.apply_round_results(current_round, scores, round_key, bye=current_round.bye)
+        if self.opponents is not None:
+            for match in current_round.matches:
+                self.opponents.add_match(match.home, match.away, match.winner_id)
+
+        current_round.completed = True
+        if self.opponents is not None:
+            self._refresh_tiebreaks(_round_team_ids(current_round))
+        self.bump_revision()
+        if len([t for t in self.teams if t.status == 'Ativo']) <= 1:
+            self.init_playoffs()
+        else:
+            self.generate_swiss_round()
+        return ('swiss', round_idx, self.round_payload(current_round, round_key))
+
+    def round_payload(self, round_data, round_key):
+        events = self.events.round_events(round_key)
+        return {'round': round_data.to_dict(), 'events': EventLog.events_to_list(events)}
+
+    # --- MATA-MATA ---
+
+    @timed()
+    def init_playoffs(self):
+        seeds = [t.id for t in self.teams.standings.ranked() if t.status == 'Classificado']
+
+        if len(seeds) > self.playoff_size:
+            self.notices.append(f"⚠️ Atenção: {len(seeds)} times classificados. Apenas os {self.playoff_size} melhores avançam.")
+            seeds = seeds[:self.playoff_size]
+
+        num_q = len(seeds)
+        if num_q < MIN_PLAYOFF_TEAMS:
+            raise TournamentError(f"Erro Crítico: Apenas {num_q} classificados. O sistema precisa de no mínimo {MIN_PLAYOFF_TEAMS}.")
+
+        if num_q > MAX_PLAYOFF_TEAMS:
+            # Chave completa montada de uma vez; as folgas vão para os primeiros colocados.
+            self.bracket = Bracket.seeded(seeds)
+            first_level = self.bracket.first_level
+            self.playoff_schedule = [PlayoffRound(level_name(first_level), self.bracket_matches(first_level), self.bracket.byes())]
+            self.phase = 'playoff_gameplay'
+            return
+
+        current_matches = []
+        waiting_teams = []
+        round_name = ""
+
+        if num_q == 3:
+            round_name = "Semifinal Única"
+            waiting_teams = [seeds[0]]
+            current_matches = [PlayoffMatch('S1', 'Semifinal', seeds[1], seeds[2])]
+        elif num_q == 4:
+            round_name = "Semifinais"
+            current_matches = [
+                PlayoffMatch('S1', 'Semi 1', seeds[0], seeds[3]),
+                PlayoffMatch('S2', 'Semi 2', seeds[1], seeds[2])
+            ]
+        elif num_q == 5:
+            round_name = "Wildcard (Repescagem)"
+            waiting_teams = [seeds[0], seeds[1], seeds[2]]
+            current_matches = [PlayoffMatch('WC', 'Repescagem', seeds[3], seeds[4])]
+        elif num_q == 6:
+            round_name = "Quartas de Final"
+            waiting_teams = [seeds[0], seeds[1]]
+            current_matches = [
+                PlayoffMatch('QFA', 'Quartas A', seeds[3], seeds[4]),
+                PlayoffMatch('QFB', 'Quartas B', seeds[2], seeds[5])
+            ]
+        elif num_q == 7:
+            round_name = "Quartas de Final"
+            waiting_teams = [seeds[0]]
+            current_matches = [
+                PlayoffMatch('QFA', 'Quartas A', seeds[3], seeds[4]),
+                PlayoffMatch('QFB', 'Quartas B', seeds[2], seeds[5]),
+                PlayoffMatch('QFC', 'Quartas C', seeds[1], seeds[6])
+            ]
+        else:
+            round_name = "Quartas de Final"
+            current_matches = [
+                PlayoffMatch('Q1', 'Quartas 1', seeds[0], seeds[7]),
+                PlayoffMatch('Q2', 'Quartas 2', seeds[1], seeds[6]),
+                PlayoffMatch('Q3', 'Quartas 3', seeds[2], seeds[5]),
+                PlayoffMatch('Q4', 'Quartas 4', seeds[3], seeds[4])
+            ]
+
+        self.playoff_schedule = [PlayoffRound(round_name, current_matches, waiting_teams)]
+        self.phase = 'playoff_gameplay'
+
+    @timed()
+    def submit_playoff_results(self, scores):
+        """Mesmo formato de submit_swiss_results; empate no tempo normal exige pênaltis."""
+        round_idx = len(self.playoff_schedule) - 1
+        current_round = self.playoff_schedule[round_idx]
+        if current_round.completed:
+            raise TournamentError("Rodada já concluída.")
+        round_key = ('playoff', round_idx)
+        self.apply_round_results(current_round, scores, round_key)
+        winners = [m.winner_id for m in current_round.matches]
+        losers = [m.loser_id for m in current_round.matches]
+
+        current_round.completed = True
+        if self.opponents is not None:
+            # Vitórias no mata-mata também mudam o Buchholz dos adversários da fase suíça.
+            self._refresh_tiebreaks(_round_team_ids(current_round))
+        self.bump_revision()
+        self.advance_playoff_round(winners, current_round.waiting, losers=losers)
+        return ('playoff', round_idx, self.round_payload(current_round, round_key))
+
+    def bracket_matches(self, level, losers=None):
+        """Jogos do nível `level` da chave; no nível 1, final e disputa de 3º (losers = perdedores das semis)."""
+        if level == 1:
+            slots = self.bracket.slots
+            return [
+                PlayoffMatch('FINAL', '🏆 Grande Final', slots[2], slots[3]),
+                PlayoffMatch('3RD', '🥉 Disputa de 3º Lugar', losers[0], losers[1]),
+            ]
+        return [PlayoffMatch(f"B{node}", f"Jogo {node - level + 1}", home, away)
+                for node, home, away in self.bracket.open_matches(level)]
+
+    def advance_playoff_round(self, results, waiting_teams, losers=None):
+        last_round = self.playoff_schedule[-1]
+        last_round_name = last_round.name
+
+        if self.bracket is not None:
+            for m in last_round.matches:
+                if m.id != '3RD':
+                    self.bracket.advance(_bracket_node(m.id), m.winner_id)
+
+        pool = list(waiting_teams or []) + results
+        count = len(pool)
+
+        next_matches = []
+        next_round_name = ""
+
+        if last_round_name == "Finais":
+            champion = None
+            vice = None
+            third = None
+            for m in last_round.matches:
+                if m.id == 'FINAL':
+                    champion = m.winner_id
+                    vice = m.loser_id
+                elif m.id == '3RD':
+                    third = m.winner_id
+
+            if champion:
+                self.champion = champion
+                self.vice = vice
+                self.third = third
+                self.phase = 'champion'
+                return
+
+        if self.bracket is not None:
+            # Sem reordenar: os vencedores já estão nos nós da chave.
+            level = node_level(_bracket_node(last_round.matches[0].id)) // 2
+            self.playoff_schedule.append(PlayoffRound(level_name(level), self.bracket_matches(level, losers)))
+            return
+
+        if last_round_name == "Semifinais" and losers and len(losers) == 2:
+            next_round_name = "Finais"
+            pool = self.rank_ids(pool)
+            next_matches.append(PlayoffMatch('FINAL', '🏆 Grande Final', pool[0], pool[1]))
+            losers = self.rank_ids(losers)
+            next_matches.append(PlayoffMatch('3RD', '🥉 Disputa de 3º Lugar', losers[0], losers[1]))
+
+        elif count == 2:
+            next_round_name = "Grande Final"
+            next_matches = [PlayoffMatch('F', 'Final', pool[0], pool[1])]
+        elif count == 4:
+            next_round_name = "Semifinais"
+            pool = self.rank_ids(pool)
+            next_matches = [
+                PlayoffMatch('S1', 'Semi 1', pool[0], pool[3]),
+                PlayoffMatch('S2', 'Semi 2', pool[1], pool[2])
+            ]
+        else:
+            next_round_name = "Rodada Eliminatória"
+            pool = self.rank_ids(pool)
+            while len(pool) >= 2:
+                home = pool.pop(0)
+                away = pool.pop(-1)
+                next_matches.append(PlayoffMatch('GEN', 'Jogo', home, away))
+
+        if not next_matches and count == 1:
+            self.champion = pool[0]
+            self.phase = 'champion'
+            return
+
+        self.playoff_schedule.append(PlayoffRound(next_round_name, next_matches))
+
+    # --- DESFAZER ---
+
+    def undo_last_round(self):
+        """Reverte a última rodada confirmada e a reabre. Retorna a entrada do log ou None."""
+        key = self.events.undo_round(self.teams) if self.events else None
+        if key is None:
+            return None
+        kind, idx = key
+
+        if kind == 'swiss':
+            if self.phase == 'playoff_gameplay':
+                self.playoff_schedule = []
+                self.bracket = None
+                self.phase = 'swiss'
+            elif len(self.rounds) > idx + 1:
+                # Descarta a rodada já sorteada e os confrontos dela no histórico dos times (O(jogos da rodada)).
+                discarded = self.rounds.pop()
+                for m in discarded.matches:
+                    pair = _pair(m.home, m.away)
+                    self.meetings[pair] -= 1
+                    if self.meetings[pair] <= 0:
+                        del self.meetings[pair]
+                        self.teams.get(m.home).history.discard(m.away)
+                        self.teams.get(m.away).history.discard(m.home)
+            reopened = self.rounds[idx]
+        else:
+            if self.phase == 'champion':
+                self.phase = 'playoff_gameplay'
+                self.champion = self.vice = self.third = None
+            elif len(self.playoff_schedule) > idx + 1:
+                self.playoff_schedule.pop()
+            reopened = self.playoff_schedule[idx]
+
+        reopened.completed = False
+        for m in reopened.matches:
+            m.clear_result()
+            if kind == 'playoff' and self.bracket is not None and m.id != '3RD':
+                self.bracket.clear(_bracket_node(m.id))
+            elif kind == 'swiss' and self.opponents is not None:
+                self.opponents.remove_match(m.home, m.away)
+        if self.opponents is not None:
+            self._refresh_tiebreaks(_round_team_ids(reopened))
+        self.bump_revision()
+        return ('undo', idx, {'round_key': list(key)})
+
+
+def _pair(a, b):
+    return (a, b) if a < b else (b, a)
+
+
+def _round_team_ids(round_data):
+    ids = [team_id for m in round_data.matches for team_id in (m.home, m.away)]
+    if getattr(round_data, 'bye', None):
+        ids.append(round_data.bye)
+    return ids
+
+
+def _bracket_node(match_id):
+    """Nó da chave de um jogo do mata-mata genérico ('B5' -> 5; a final é a raiz)."""
+    return 1 if match_id == 'FINAL' else int(match_id[1:])
+
+
+def _validate_scores(scores, expected):
+    if len(scores) != expected:
+        raise TournamentError(f"Esperados {expected} placares, recebidos {len(scores)}.")
+    for hg, ag, hp, ap in scores:
+        if hg is None or ag is None:
+            raise TournamentError("Preencha todos os placares.")
+        if hg == ag:
+            if hp is None or ap is None:
+                raise TournamentError("Preencha os pênaltis.")
+            if hp == ap:
+                raise TournamentError("Pênaltis não podem empatar.")